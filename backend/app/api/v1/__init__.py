@@ -9,10 +9,20 @@ from app.api.v1.search import router as search_router
 from app.api.v1.dashboard import router as dashboard_router
 from app.api.v1.subscriptions import router as subscriptions_router
 from app.api.v1.discussions import router as discussions_router
+from app.api.v1.attempts import router as attempts_router
+from app.api.v1.practice import router as practice_router
+from app.api.v1.papers import router as papers_router
+from app.api.v1.flashcards import router as flashcards_router
+from app.api.v1.leaderboards import router as leaderboards_router
 
 router.include_router(questions_router)
 router.include_router(search_router)
 router.include_router(dashboard_router)
 router.include_router(subscriptions_router)
 router.include_router(discussions_router, tags=["Discussions"])
+router.include_router(attempts_router)
+router.include_router(practice_router)
+router.include_router(papers_router)
+router.include_router(flashcards_router)
+router.include_router(leaderboards_router)
 
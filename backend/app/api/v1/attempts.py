@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_session
+from app.domains.questions.service import QuestionService
+from app.domains.questions.schemas import BatchAttemptRequest, BatchAttemptResponse
+from app.domains.auth.deps import get_current_user
+from app.domains.auth.models import User
+
+router = APIRouter(prefix="/attempts", tags=["attempts"])
+
+@router.post("/batch", response_model=BatchAttemptResponse)
+async def record_attempts_batch(
+    batch: BatchAttemptRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Record many attempts in one request, e.g. all answers of a finished mock paper.
+    The batch is all-or-nothing: unknown question IDs reject the whole request.
+    """
+    service = QuestionService(session)
+    try:
+        attempts = await service.record_attempts(
+            user_id=current_user.id,
+            items=[(a.question_id, a.is_correct, a.time_taken_seconds) for a in batch.attempts],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return BatchAttemptResponse(recorded=len(attempts))
@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import uuid
 
-from app.core.database import get_session
+from app.core.database import get_read_session, get_session
 from app.domains.auth.deps import get_current_user
 from app.domains.auth.models import User
 from app.domains.discussions.service import DiscussionService
@@ -14,7 +14,7 @@ router = APIRouter()
 @router.get("/questions/{question_id}/discussions", response_model=List[DiscussionResponse])
 async def get_discussions(
     question_id: uuid.UUID,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     service = DiscussionService(session)
     return await service.get_discussions(question_id)
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_session
+from app.domains.flashcards.schemas import (
+    DueFlashcards,
+    FlashcardEnrollRequest,
+    FlashcardEnrollResponse,
+    FlashcardReviewRequest,
+    FlashcardReviewResponse,
+)
+from app.domains.flashcards.service import FlashcardService
+from app.domains.auth.models import User
+from app.domains.subscriptions.deps import require_premium
+
+router = APIRouter(prefix="/flashcards", tags=["flashcards"])
+
+
+@router.get("/due", response_model=DueFlashcards)
+async def get_due_flashcards(
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(require_premium),
+    session: AsyncSession = Depends(get_session)
+):
+    """Flashcards due for review now, most overdue first (premium only: cards come from tier 2)."""
+    return await FlashcardService(session).due(current_user.id, limit)
+
+
+@router.post("/enroll", response_model=FlashcardEnrollResponse)
+async def enroll_flashcards(
+    request: FlashcardEnrollRequest,
+    current_user: User = Depends(require_premium),
+    session: AsyncSession = Depends(get_session)
+):
+    """Add the flashcards of some questions to the user's deck; they are due immediately."""
+    try:
+        enrolled = await FlashcardService(session).enroll(current_user.id, request.question_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return FlashcardEnrollResponse(enrolled=enrolled)
+
+
+@router.post("/review", response_model=FlashcardReviewResponse)
+async def review_flashcards(
+    request: FlashcardReviewRequest,
+    current_user: User = Depends(require_premium),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Submit a batch of reviews (SM-2 quality 0-5 per card).
+    Returns when each card is next due. Cards not in the deck are a 404.
+    """
+    try:
+        scheduled = await FlashcardService(session).review(current_user.id, request.reviews)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return FlashcardReviewResponse(scheduled=scheduled)
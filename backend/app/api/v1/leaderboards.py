@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_read_session, get_session
+from app.domains.leaderboards.schemas import LeaderboardResponse, MyRank
+from app.domains.leaderboards.service import LeaderboardService, resolve_period
+from app.domains.auth.deps import get_current_user
+from app.domains.auth.models import User
+
+router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
+
+METRIC = Path(..., description="solved, accuracy or streak (longest all-time, best reached in a week)")
+PERIOD = Query("all", description='"all", "week" (current ISO week) or a week like 2026-W42')
+
+
+@router.get("/{metric}", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    metric: str = METRIC,
+    period: str = PERIOD,
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """Top users for a metric, served from the in-memory board."""
+    try:
+        return await LeaderboardService(session).top(metric, resolve_period(period), limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{metric}/me", response_model=MyRank)
+async def get_my_rank(
+    metric: str = METRIC,
+    period: str = PERIOD,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """The current user's score and rank on a leaderboard."""
+    try:
+        return await LeaderboardService(session).my_rank(current_user.id, metric, resolve_period(period))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,71 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_read_session, get_session
+from app.domains.papers.schemas import MockPaperRequest, MockPaperResponse, PaperGradeResponse, PaperSubmissionRequest, ScorePercentile
+from app.domains.papers.service import PaperService
+from app.domains.auth.deps import get_current_user
+from app.domains.auth.models import User
+
+router = APIRouter(prefix="/papers", tags=["papers"])
+
+
+@router.post("/mock", response_model=MockPaperResponse)
+async def generate_mock_paper(
+    request: MockPaperRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Generate a mock paper stratified by section, topic, difficulty and year range.
+    Questions the user has already attempted are left out unless exclude_attempted is false.
+    """
+    try:
+        return await PaperService(session).generate(current_user.id, request)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/mock/{paper_id}", response_model=MockPaperResponse)
+async def get_mock_paper(
+    paper_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """Get a previously generated mock paper."""
+    paper = await PaperService(session).get_paper(current_user.id, paper_id)
+    if paper is None:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    return paper
+
+
+@router.post("/{paper_id}/submit", response_model=PaperGradeResponse)
+async def submit_paper(
+    paper_id: str,
+    request: PaperSubmissionRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Grade a paper submission on the server.
+    paper_id is an official paper (e.g. GATE_AE_2019) or a generated mock paper ID.
+    Every answered question is recorded as an attempt with the graded correctness.
+    """
+    result = await PaperService(session).submit(current_user.id, paper_id, request)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    return result
+
+
+@router.get("/{paper_id}/percentile", response_model=ScorePercentile)
+async def get_score_percentile(
+    paper_id: str,
+    score: float = Query(..., description="Score to place in the paper's distribution"),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Predict percentile and rank for a score on a paper.
+    Served from the paper's score histogram, which every graded submission updates.
+    """
+    return await PaperService(session).score_percentile(paper_id, score)
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import async_session_maker, get_session
+from app.domains.practice.schemas import PracticeRecommendation
+from app.domains.practice.service import PracticeService, rebuild_in_background
+from app.domains.questions.service import QuestionService
+from app.domains.auth.deps import get_current_user
+from app.domains.auth.models import User
+
+router = APIRouter(prefix="/practice", tags=["practice"])
+
+
+def _practice(session: AsyncSession, background_tasks: BackgroundTasks) -> PracticeService:
+    """Practice service whose stale queues are re-ranked after the response is sent."""
+    return PracticeService(
+        session,
+        schedule_rebuild=lambda user_id: background_tasks.add_task(rebuild_in_background, async_session_maker, user_id),
+    )
+
+
+async def _recommendation(session: AsyncSession, user_id: int, head, remaining: int) -> PracticeRecommendation:
+    service = QuestionService(session)
+    item = await service.get_list_item(head) if head is not None else None
+    if item is None:
+        raise HTTPException(status_code=404, detail="No unattempted questions left to practice")
+
+    _, topics = await service.progress.get_progress(user_id)
+    correct, total = topics.get(item.topic or "General", (0, 0))
+    return PracticeRecommendation(
+        question=item,
+        topic_accuracy=round(correct / total * 100, 1) if total else None,
+        remaining=remaining,
+    )
+
+
+@router.get("/next", response_model=PracticeRecommendation)
+async def get_next_question(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Recommend the next question to practice.
+    Served from the user's precomputed queue; answering it (via the attempt endpoints) advances the queue.
+    """
+    head, remaining = await _practice(session, background_tasks).next_question(current_user.id)
+    return await _recommendation(session, current_user.id, head, remaining)
+
+
+@router.post("/skip", response_model=PracticeRecommendation)
+async def skip_question(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """Move the current recommendation to the back of the queue and return the next one."""
+    head, remaining = await _practice(session, background_tasks).skip(current_user.id)
+    return await _recommendation(session, current_user.id, head, remaining)
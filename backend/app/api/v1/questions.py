@@ -2,17 +2,20 @@
 Question API endpoints for CRUD operations.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import json
 import uuid
 
-from app.core.database import get_session
-from app.domains.questions.service import QuestionService
+from app.core.database import get_read_session, get_session
+from app.domains.questions.service import QuestionService, invalidate_question_caches
 from app.domains.questions.schemas import QuestionResponse, SearchFilters, AttemptRequest
+from app.domains.questions.validation import validate_questions_json
+from app.domains.questions.buffer import get_attempt_buffer
 from app.domains.auth.deps import get_current_user
 from app.domains.auth.models import User
+from app.domains.subscriptions.deps import has_premium
 
 
 
@@ -26,29 +29,23 @@ async def list_questions(
     year: Optional[int] = None,
     subject: Optional[str] = None,
     question_type: Optional[str] = None,
-    session: AsyncSession = Depends(get_session),
+    premium: bool = Depends(has_premium),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     List questions with optional filters.
-    Returns paginated results.
+    Returns paginated results. Premium tiers (2 and 3) are null unless the caller is subscribed.
     """
     service = QuestionService(session)
     filters = SearchFilters(year=year, subject=subject, question_type=question_type)
-    result = await service.search_questions("", filters, page, page_size)
-    
-    # Return full question data for list endpoint
-    full_questions = []
-    for item in result.questions:
-        q = await service.get_question(item.id)
-        if q:
-            full_questions.append(q)
-    
-    return full_questions
+    # Spliced from cached per-tier fragments; stats come live from the same query
+    content = await service.list_questions_json(filters, page, page_size, premium=premium)
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/syllabus", response_model=dict)
 async def get_syllabus(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get the full syllabus tree (Subject -> Topics).
@@ -61,26 +58,28 @@ async def get_syllabus(
 @router.get("/{question_id}", response_model=QuestionResponse)
 async def get_question(
     question_id: str,
-    session: AsyncSession = Depends(get_session),
+    premium: bool = Depends(has_premium),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get a single question by ID.
     Accepts both UUID and string ID (e.g., GATE_AE_2008_Q01).
+    Premium tiers (2 and 3) are null unless the caller is subscribed.
     """
     service = QuestionService(session)
     
     # Try as UUID first
     try:
         uuid_id = uuid.UUID(question_id)
-        question = await service.get_question(uuid_id)
+        content = await service.get_question_json(question_id=uuid_id, premium=premium)
     except ValueError:
         # Not a UUID, try as string ID
-        question = await service.get_question_by_string_id(question_id)
+        content = await service.get_question_json(string_id=question_id, premium=premium)
     
-    if not question:
+    if not content:
         raise HTTPException(status_code=404, detail="Question not found")
     
-    return question
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("/{question_id}/attempt", response_model=dict)
@@ -92,8 +91,18 @@ async def record_attempt(
 ):
     """
     Record a user's attempt at a question.
+    With the write-behind buffer enabled the attempt is queued and written in the background.
     """
     service = QuestionService(session)
+    attempt_buffer = get_attempt_buffer()
+    if attempt_buffer is not None:
+        # Validate up front (cached) so unknown IDs 404 here rather than vanish at flush time
+        question_uuid = await service.find_question_uuid(question_id)
+        if question_uuid is None:
+            raise HTTPException(status_code=404, detail="Question not found")
+        if attempt_buffer.submit(current_user.id, str(question_uuid), attempt.is_correct, attempt.time_taken_seconds):
+            return {"status": "success", "message": "Attempt queued"}
+
     try:
         await service.record_attempt(
             user_id=current_user.id,
@@ -112,6 +121,7 @@ async def record_attempt(
 @router.post("/import", response_model=dict)
 async def import_question(
     question_data: dict,
+    strict: bool = Query(False, description="Reject payloads that need type coercion"),
     session: AsyncSession = Depends(get_session),
 ):
     """
@@ -120,7 +130,8 @@ async def import_question(
     """
     service = QuestionService(session)
     try:
-        result = await service.import_question(question_data)
+        result = await service.import_question(question_data, strict=strict)
+        invalidate_question_caches()
         return {"message": "Question imported successfully", "question_id": result.question_id}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -129,6 +140,7 @@ async def import_question(
 @router.post("/import/bulk", response_model=dict)
 async def bulk_import_questions(
     file: UploadFile = File(..., description="JSON file containing array of questions"),
+    strict: bool = Query(False, description="Validate every question in strict mode before importing"),
     session: AsyncSession = Depends(get_session),
 ):
     """
@@ -139,15 +151,20 @@ async def bulk_import_questions(
     
     try:
         content = await file.read()
-        data = json.loads(content)
-        
-        # Handle both single question and array
-        if isinstance(data, list):
-            questions_data = data
+        if strict:
+            # Validate straight from the uploaded bytes with the cached adapter
+            questions_data = [q.model_dump() for q in validate_questions_json(content, strict=True)]
         else:
-            questions_data = [data]
+            data = json.loads(content)
+            
+            # Handle both single question and array
+            if isinstance(data, list):
+                questions_data = data
+            else:
+                questions_data = [data]
         
         result = await service.bulk_import(questions_data)
+        invalidate_question_caches()
         return {
             "message": "Import complete",
             "imported": result["imported"],
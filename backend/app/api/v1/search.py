@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.core.database import get_session
+from app.core.database import get_read_session
 from app.domains.questions.service import QuestionService
 from app.domains.questions.schemas import SearchResult, FilterOptions, SearchFilters
 
@@ -28,7 +28,7 @@ async def search_questions(
     question_type: Optional[str] = Query(None, description="MCQ or NAT"),
     difficulty_min: Optional[int] = Query(None, ge=1, le=10, description="Minimum difficulty"),
     difficulty_max: Optional[int] = Query(None, ge=1, le=10, description="Maximum difficulty"),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Search questions by concept, topic, or keyword.
@@ -73,7 +73,7 @@ async def search_questions(
 
 @router.get("/filters", response_model=FilterOptions)
 async def get_filter_options(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get available filter options for the search UI.
@@ -93,7 +93,7 @@ async def get_filter_options(
 async def get_search_suggestions(
     q: str = Query(..., min_length=2, description="Partial search query"),
     limit: int = Query(5, ge=1, le=20, description="Max suggestions"),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get autocomplete suggestions for the search box.
@@ -107,7 +107,7 @@ async def get_search_suggestions(
 
 @router.get("/year-counts", response_model=dict[int, int])
 async def get_year_counts(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get question counts grouped by year.
@@ -19,10 +19,7 @@ async def get_my_subscription(
     """Get current user's subscription status."""
     service = SubscriptionService(session)
     
-    # Check and update expiration status
-    await service.check_and_expire_subscription(current_user.id)
-    
-    # Get subscription
+    # Expires a lapsed subscription and reads it in one statement (or serves the cached entitlement)
     subscription = await service.get_subscription_response(current_user.id)
     
     if not subscription:
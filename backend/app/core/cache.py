@@ -0,0 +1,95 @@
+"""
+Small in-process caches.
+
+TTLCache is a bounded LRU whose entries also expire after a fixed TTL. Each
+cache registers itself by name so /health can report sizes and hit rates.
+Caches are per process: invalidation only reaches the local worker, so the
+TTL bounds how long other workers may serve a stale entry.
+
+Domains that derive cached state from another domain's data register a hook
+with on_invalidate(topic); the owning domain calls invalidate(topic) when the
+data changes, without importing its dependents.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_registry: dict[str, "TTLCache"] = {}
+_hooks: dict[str, list[Callable[[], None]]] = {}
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry expiry."""
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+def cache_stats() -> dict:
+    """Stats of every registered cache, by name."""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def on_invalidate(topic: str) -> Callable[[Callable[[], None]], Callable[[], None]]:
+    """Decorator registering a hook to run whenever invalidate(topic) is called."""
+    def register(hook: Callable[[], None]) -> Callable[[], None]:
+        _hooks.setdefault(topic, []).append(hook)
+        return hook
+    return register
+
+
+def invalidate(topic: str) -> None:
+    """Run every hook registered for a topic."""
+    for hook in _hooks.get(topic, ()):
+        hook()
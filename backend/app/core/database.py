@@ -4,27 +4,76 @@ Uses SQLModel with async PostgreSQL driver.
 """
 
 from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+import uuid
 
 from app.core.config import settings
 # Import all models here to ensure they are registered with SQLModel metadata before create_all is called
-from app.domains.questions.models import Question, UserAttempt
+from app.domains.questions.models import Question, UserAttempt, UserAttemptDailySummary, UserArchivedQuestion, QuestionStats
 from app.domains.auth.models import User
 from app.domains.subscriptions.models import UserSubscription
 from app.domains.discussions.models import Discussion
+from app.domains.progress.models import UserProgress, UserTopicProgress, UserAbility
+from app.domains.practice.models import UserPracticeQueue
+from app.domains.papers.models import MockPaper, PaperScoreHistogram, PaperSubmission
+from app.domains.flashcards.models import FlashcardReview
+from app.domains.leaderboards.models import LeaderboardEntry
 
 
 from sqlalchemy.pool import NullPool
 
+
+def build_engine(url: str, mode: Optional[str] = None, read_only: bool = False) -> AsyncEngine:
+    """
+    Create an async engine for the given pool mode (defaults to settings.db_pool_mode).
+    read_only engines run every statement in autocommit under
+    default_transaction_read_only: the server rejects writes, and no
+    BEGIN/COMMIT round trips are spent on pure reads.
+
+    Behind PgBouncer the setting is skipped: PgBouncer rejects unknown startup
+    parameters, and a session-level SET on connect would stick to a pooled
+    server connection that other clients' transactions then run on. There,
+    point database_read_url at a hot-standby replica (read-only by nature) or
+    a PgBouncer database entry whose role defaults to read-only
+    (ALTER ROLE ... SET default_transaction_read_only = on).
+    """
+    mode = mode or settings.db_pool_mode
+    options: dict = {"echo": settings.debug, "future": True}
+    connect_args: dict = {}
+    if mode == "null":
+        # Critical for Lambda: Disable pooling to avoid frozen/stale connections
+        options["poolclass"] = NullPool
+    elif mode == "queue":
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    elif mode == "pgbouncer":
+        # A transaction-mode pooler hands each transaction a different server
+        # connection, so named prepared statements must be neither cached nor reused
+        options["poolclass"] = NullPool
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        )
+    else:
+        raise ValueError(f"Unknown db_pool_mode: {mode!r}")
+    if read_only:
+        options["isolation_level"] = "AUTOCOMMIT"
+        if mode != "pgbouncer":
+            connect_args["server_settings"] = {"default_transaction_read_only": "on"}
+    return create_async_engine(url, connect_args=connect_args, **options)
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-    poolclass=NullPool,  # Critical for Lambda: Disable pooling to avoid frozen/stale connections
-)
+engine = build_engine(settings.database_url)
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -33,11 +82,34 @@ async_session_maker = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Read-only sessions for GET endpoints, on a replica when database_read_url is set
+read_engine = build_engine(settings.database_read_url or settings.database_url, read_only=True)
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+# Idempotent upgrades for tables created before newer model columns (create_all never alters tables)
+SCHEMA_UPGRADES = [
+    "ALTER TABLE questions ADD COLUMN IF NOT EXISTS irt_difficulty DOUBLE PRECISION",
+    "ALTER TABLE questions ADD COLUMN IF NOT EXISTS irt_discrimination DOUBLE PRECISION",
+    "ALTER TABLE questions ADD COLUMN IF NOT EXISTS irt_calibrated_at TIMESTAMP WITHOUT TIME ZONE",
+    "CREATE INDEX IF NOT EXISTS ix_questions_irt_difficulty ON questions (irt_difficulty)",
+    "CREATE INDEX IF NOT EXISTS ix_user_subscriptions_trial_end ON user_subscriptions (trial_end_date, status)"
+    " WHERE subscription_type = 'TRIAL'",
+    "CREATE INDEX IF NOT EXISTS ix_user_subscriptions_premium_end ON user_subscriptions (premium_end_date, status)"
+    " WHERE subscription_type = 'PREMIUM'",
+]
+
 
 async def init_db() -> None:
     """Initialize database tables."""
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        for statement in SCHEMA_UPGRADES:
+            await conn.execute(text(statement))
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -53,6 +125,15 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only handlers: never commits, and may be served by a
+    replica (settings.database_read_url), so it can lag behind recent writes.
+    """
+    async with read_session_maker() as session:
+        yield session
+
+
 @asynccontextmanager
 async def get_session_context() -> AsyncGenerator[AsyncSession, None]:
     """Context manager for database session (for non-FastAPI usage)."""
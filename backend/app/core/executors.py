@@ -0,0 +1,74 @@
+"""
+Bounded thread pools for blocking work called from async handlers.
+
+CPU-heavy or blocking library calls (bcrypt, Google token verification)
+must not run on the event loop: one 250 ms bcrypt round stalls every other
+request on the worker. run_blocking() hands them to a small named pool; the
+pool size caps how many run at once, and callers beyond max_pending fail
+fast instead of queueing without bound during a signup burst.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised when a pool already has max_pending calls queued or running."""
+
+
+class BoundedExecutor:
+    """A ThreadPoolExecutor plus a cap on in-flight calls."""
+
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        # Created on first use so importing the module starts no threads
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ExecutorBusy(f"{self.name} executor is saturated")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+auth_executor = BoundedExecutor("auth", settings.auth_executor_workers, settings.auth_executor_max_pending)
+
+
+async def run_blocking(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking auth-path call (bcrypt, Google verification) off the event loop."""
+    return await auth_executor.run(fn, *args, **kwargs)
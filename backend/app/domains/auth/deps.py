@@ -1,9 +1,12 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import async_session_maker, get_read_session, get_session
 from app.domains.auth import services
 from app.domains.auth.models import User
 
@@ -12,25 +15,100 @@ SECRET_KEY = services.SECRET_KEY
 ALGORITHM = services.ALGORITHM
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token", auto_error=False)
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_session)
-) -> User:
-    credentials_exception = HTTPException(
+# Active users by token subject; entries are detached from any session and read-only
+principal_cache = TTLCache("principals", settings.principal_cache_size, settings.principal_cache_ttl_seconds)
+
+
+def _principal_key(user_id, email: str) -> tuple:
+    # Tokens issued before the "uid" claim are keyed by email
+    return ("uid", user_id) if user_id is not None else ("sub", email)
+
+
+def invalidate_principal(user: User) -> None:
+    """Drop a user's cached principal (e.g. on deactivation) under both key forms."""
+    principal_cache.pop(("uid", user.id))
+    principal_cache.pop(("sub", user.email))
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> tuple:
+    """(user_id or None, email) from a valid token; 401 otherwise."""
+    from jose import JWTError, jwt  # Imported on first use to keep cold starts short
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-        
-    user = await services.get_user_by_email(session, email=email)
+        raise _credentials_exception()
+    email: str = payload.get("sub")
+    if email is None:
+        raise _credentials_exception()
+    return payload.get("uid"), email
+
+
+async def _load_principal(session: AsyncSession, user_id, email: str) -> Optional[User]:
+    """The active user a token names, detached from the session, or None."""
+    if user_id is not None:
+        user = await session.get(User, user_id)
+        if user is not None and user.email != email:
+            user = None
+    else:
+        user = await services.get_user_by_email(session, email=email)
+    if user is None or not user.is_active:
+        return None
+    # Detach so the cached instance is never refreshed or expired by a later request's session
+    session.expunge(user)
+    return user
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_session)
+) -> User:
+    user_id, email = _decode_token(token)
+    key = _principal_key(user_id, email)
+    user = principal_cache.get(key)
+    if user is not None:
+        return user
+
+    user = await _load_principal(session, user_id, email)
+    if user is None:
+        raise _credentials_exception()
+    principal_cache.set(key, user)
+    return user
+
+
+async def get_optional_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    session: AsyncSession = Depends(get_read_session)
+) -> Optional[User]:
+    """
+    The current user, or None for anonymous requests. A token that is present but invalid is still a 401.
+    Looks the user up on the read session, so read-only GETs normally never open a primary session;
+    a user the replica does not show yet (just registered or reactivated) is looked up on the primary
+    before giving up.
+    """
+    if token is None:
+        return None
+    user_id, email = _decode_token(token)
+    key = _principal_key(user_id, email)
+    user = principal_cache.get(key)
+    if user is not None:
+        return user
+
+    user = await _load_principal(session, user_id, email)
+    if user is None:
+        async with async_session_maker() as primary:
+            user = await _load_principal(primary, user_id, email)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    principal_cache.set(key, user)
     return user
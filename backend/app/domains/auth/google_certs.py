@@ -0,0 +1,98 @@
+"""
+Google signing-certificate caching for ID token verification.
+
+google-auth fetches the certificate set on every verify_token() call.
+CachingCertsRequest wraps the requests transport and keeps successful GET
+responses until they expire per their Cache-Control max-age (or Expires)
+header, so verification only hits the network when Google rotates keys.
+It is called from the auth executor threads, hence the lock. google-auth
+only calls the request and reads status/headers/data, so neither class
+subclasses its transport ABCs; the requests transport is imported on the
+first fetch, keeping google-auth and requests out of cold starts.
+"""
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+_MAX_AGE = re.compile(r"max-age=(\d+)", re.IGNORECASE)
+
+
+def cache_lifetime(headers) -> float:
+    """Seconds a response may be reused: Cache-Control max-age, else Expires, else 0."""
+    cache_control = headers.get("Cache-Control") or headers.get("cache-control") or ""
+    if "no-store" in cache_control.lower() or "no-cache" in cache_control.lower():
+        return 0.0
+    match = _MAX_AGE.search(cache_control)
+    if match:
+        return float(match.group(1))
+    expires = headers.get("Expires") or headers.get("expires")
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires)
+        except (TypeError, ValueError):
+            return 0.0
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return max((expires_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    return 0.0
+
+
+class _CachedResponse:
+    """The google.auth.transport.Response interface over a stored response."""
+
+    def __init__(self, status: int, headers: dict, data: bytes):
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+class CachingCertsRequest:
+    """google.auth transport Request that serves cacheable GETs from memory until they expire."""
+
+    def __init__(self, inner=None):
+        self._inner = inner
+        self._cache: dict[str, tuple[float, _CachedResponse]] = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.hits = 0
+
+    @property
+    def inner(self):
+        if self._inner is None:
+            from google.auth.transport import requests as google_requests
+
+            self._inner = google_requests.Request()
+        return self._inner
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        if method.upper() != "GET" or body is not None:
+            return self.inner(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(url)
+            if cached is not None and cached[0] > now:
+                self.hits += 1
+                return cached[1]
+
+        response = self.inner(url, method=method, headers=headers, timeout=timeout, **kwargs)
+        self.fetches += 1
+        if response.status == 200:
+            lifetime = cache_lifetime(response.headers)
+            if lifetime > 0:
+                stored = _CachedResponse(response.status, dict(response.headers), response.data)
+                with self._lock:
+                    self._cache[url] = (now + lifetime, stored)
+                return stored
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        return {"cached_urls": len(self._cache), "fetches": self.fetches, "hits": self.hits}
+
+
+google_request = CachingCertsRequest()
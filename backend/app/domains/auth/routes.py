@@ -35,5 +35,5 @@ async def login_with_google(token_data: schemas.GoogleAuthToken, session: AsyncS
         user = await services.create_user(session=session, user=user_create)
 
     # Issue access token
-    access_token = services.create_access_token(data={"sub": user.email})
+    access_token = services.create_user_token(user)
     return {"access_token": access_token, "token_type": "bearer"}
@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
 # from passlib.context import CryptContext
 import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,8 +7,8 @@ from sqlalchemy import select
 from app.domains.auth.models import User
 from app.domains.auth.schemas import UserCreate
 from app.core.config import settings
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+from app.core.executors import run_blocking
+from app.domains.auth.google_certs import google_request
 import secrets
 
 # SECRET_KEY should ideally be in env vars
@@ -37,7 +36,14 @@ def get_password_hash(password):
     return bcrypt.hashpw(pwd_bytes, salt).decode('utf-8')
 
 
+async def hash_password(password: str) -> str:
+    """get_password_hash on the auth executor, so bcrypt never blocks the event loop."""
+    return await run_blocking(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt  # Imported on first use to keep cold starts short
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -53,10 +59,28 @@ async def get_user_by_email(session: AsyncSession, email: str):
     return result.scalar_one_or_none()
 
 
+def create_user_token(user: User) -> str:
+    """Access token carrying the email (sub) and the integer user id (uid) for primary-key lookups."""
+    return create_access_token(data={"sub": user.email, "uid": user.id})
+
+
+async def set_user_active(session: AsyncSession, user_id: int, is_active: bool) -> Optional[User]:
+    """Activate or deactivate a user; deactivation takes effect immediately on this worker."""
+    from app.domains.auth.deps import invalidate_principal
+
+    user = await session.get(User, user_id)
+    if user is None:
+        return None
+    user.is_active = is_active
+    await session.commit()
+    invalidate_principal(user)
+    return user
+
+
 async def create_user(session: AsyncSession, user: UserCreate):
     from app.domains.subscriptions.service import SubscriptionService
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
     db_user = User(email=user.email, hashed_password=hashed_password, full_name=user.full_name)
     session.add(db_user)
     await session.commit()
@@ -68,21 +92,36 @@ async def create_user(session: AsyncSession, user: UserCreate):
     
     return db_user
 
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+
+def _verify_google_token_sync(token: str) -> dict:
+    # Same checks as id_token.verify_oauth2_token, with a configurable certs URL
+    # and the caching transport (certs are refetched only when they expire)
+    from google.oauth2 import id_token
+
+    idinfo = id_token.verify_token(
+        token, google_request, audience=settings.google_client_id, certs_url=settings.google_certs_url
+    )
+    if idinfo.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError("Wrong issuer")
+    return idinfo
+
+
 async def verify_google_token(token: str):
     """Verifies a Google OAuth token and returns user info."""
     if not settings.google_client_id:
         return None
+    from google.auth import exceptions as google_exceptions
 
     try:
-        # Verify the token against Google's API
-        idinfo = id_token.verify_oauth2_token(
-            token, google_requests.Request(), settings.google_client_id
-        )
+        # Signature checks and the (rare) certs fetch run on the auth executor
+        idinfo = await run_blocking(_verify_google_token_sync, token)
 
         return {
             "email": idinfo.get("email"),
             "full_name": idinfo.get("name"),
             "email_verified": idinfo.get("email_verified"),
         }
-    except ValueError as e:
+    except (ValueError, google_exceptions.GoogleAuthError):
         return None
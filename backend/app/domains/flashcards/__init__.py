@@ -0,0 +1 @@
+"""Spaced-repetition flashcard domain package."""
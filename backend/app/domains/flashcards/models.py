@@ -0,0 +1,30 @@
+"""Per-user spaced-repetition state for tier_2 flashcards."""
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, Index, SmallInteger
+from sqlmodel import Field, SQLModel
+
+
+class FlashcardReview(SQLModel, table=True):
+    """
+    SM-2 state of one card (questions.tier_2_student_learning.flashcards[card_index])
+    for one user. Kept narrow: small integers, ease in thousandths (2500 = 2.5).
+    """
+    __tablename__ = "flashcard_reviews"
+    __table_args__ = (
+        # The due queue is a range scan: user_id = ? AND due_at <= now() ORDER BY due_at
+        # (card key appended so ties come back in a stable order straight from the index)
+        Index("ix_flashcard_reviews_user_id_due_at", "user_id", "due_at", "question_id", "card_index"),
+    )
+
+    user_id: int = Field(primary_key=True)
+    question_id: uuid.UUID = Field(primary_key=True)
+    card_index: int = Field(sa_column=Column(SmallInteger, primary_key=True))
+    ease: int = Field(default=2500, sa_column=Column(SmallInteger, nullable=False, default=2500))
+    interval_days: int = Field(default=0)
+    repetitions: int = Field(default=0, sa_column=Column(SmallInteger, nullable=False, default=0))
+    lapses: int = Field(default=0, sa_column=Column(SmallInteger, nullable=False, default=0))
+    due_at: datetime = Field(default_factory=datetime.utcnow)
+    last_reviewed_at: Optional[datetime] = None
@@ -0,0 +1,49 @@
+"""
+SM-2 review scheduling.
+
+quality is the SM-2 self-grade: 0-2 = forgotten (the card lapses and restarts
+at a 1-day interval), 3 = recalled with difficulty, 4 = recalled, 5 = easy.
+Ease starts at 2.5, moves with every review and stays between 1.3 and 5.0.
+"""
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+DEFAULT_EASE = 2500  # thousandths
+MIN_EASE = 1300
+MAX_EASE = 5000  # Keeps a long run of easy reviews well inside the SMALLINT column
+MAX_INTERVAL_DAYS = 3650
+
+
+class CardState(NamedTuple):
+    ease: int = DEFAULT_EASE
+    interval_days: int = 0
+    repetitions: int = 0
+    lapses: int = 0
+
+
+def review(state: Optional[CardState], quality: int, now: datetime) -> tuple[CardState, datetime]:
+    """Apply one review; returns the new state and when the card is next due."""
+    state = state or CardState()
+    if not 0 <= quality <= 5:
+        raise ValueError("quality must be between 0 and 5")
+
+    if quality < 3:
+        repetitions, interval, lapses = 0, 1, state.lapses + 1
+    else:
+        if state.repetitions == 0:
+            interval = 1
+        elif state.repetitions == 1:
+            interval = 6
+        else:
+            interval = round(state.interval_days * state.ease / 1000)
+        repetitions, lapses = state.repetitions + 1, state.lapses
+    interval = min(max(interval, 1), MAX_INTERVAL_DAYS)
+
+    miss = 5 - quality
+    ease = state.ease + round(1000 * (0.1 - miss * (0.08 + miss * 0.02)))
+    ease = min(max(ease, MIN_EASE), MAX_EASE)
+
+    # Cap the counters to their SMALLINT columns
+    new_state = CardState(ease=ease, interval_days=interval,
+                          repetitions=min(repetitions, 32767), lapses=min(lapses, 32767))
+    return new_state, now + timedelta(days=interval)
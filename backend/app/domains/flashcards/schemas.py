@@ -0,0 +1,53 @@
+"""Pydantic schemas for flashcard study."""
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class FlashcardEnrollRequest(BaseModel):
+    """Add every flashcard of these questions (UUIDs or string IDs) to the user's deck."""
+    question_ids: list[str] = Field(min_length=1, max_length=500)
+
+
+class FlashcardEnrollResponse(BaseModel):
+    enrolled: int  # Newly added cards (already enrolled ones are kept as they are)
+
+
+class DueFlashcard(BaseModel):
+    question_id: uuid.UUID
+    question_code: str  # e.g. GATE_AE_2019_Q12
+    card_index: int
+    card_type: Optional[str] = None
+    front: Optional[str] = None
+    back: Optional[str] = None
+    due_at: datetime
+    interval_days: int
+    repetitions: int
+
+
+class DueFlashcards(BaseModel):
+    cards: list[DueFlashcard]
+    has_more: bool
+
+
+class FlashcardReviewItem(BaseModel):
+    question_id: uuid.UUID
+    card_index: int = Field(ge=0, le=32767)
+    quality: int = Field(ge=0, le=5, description="SM-2 grade: 0-2 forgotten, 3 hard, 4 good, 5 easy")
+
+
+class FlashcardReviewRequest(BaseModel):
+    reviews: list[FlashcardReviewItem] = Field(min_length=1, max_length=500)
+
+
+class ScheduledFlashcard(BaseModel):
+    question_id: uuid.UUID
+    card_index: int
+    interval_days: int
+    due_at: datetime
+
+
+class FlashcardReviewResponse(BaseModel):
+    scheduled: list[ScheduledFlashcard]
@@ -0,0 +1,158 @@
+"""
+Flashcard study service.
+
+Card state lives in flashcard_reviews, one narrow row per (user, question,
+card index). The due queue is a single range scan over (user_id, due_at)
+joined to the card text; batch reviews read the affected states in one
+query, apply SM-2 in Python and write them back with one update.
+"""
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.flashcards.scheduler import DEFAULT_EASE, CardState, review
+from app.domains.flashcards.schemas import DueFlashcard, DueFlashcards, FlashcardReviewItem, ScheduledFlashcard
+from app.domains.questions.service import QuestionService
+
+
+class FlashcardService:
+    """Enrolls, serves and schedules a user's flashcards."""
+
+    # One row per card of each question; cards already in the deck keep their state
+    ENROLL_SQL = text(f"""
+        INSERT INTO flashcard_reviews (user_id, question_id, card_index, ease, interval_days, repetitions, lapses, due_at)
+        SELECT :user_id, q.id, g.i, {DEFAULT_EASE}, 0, 0, 0, :now
+        FROM questions q
+        CROSS JOIN LATERAL generate_series(
+            0,
+            CASE WHEN json_typeof(q.tier_2_student_learning -> 'flashcards') = 'array'
+                 THEN json_array_length(q.tier_2_student_learning -> 'flashcards') ELSE 0 END - 1
+        ) AS g(i)
+        WHERE q.id = ANY(CAST(:question_ids AS uuid[]))
+        ON CONFLICT (user_id, question_id, card_index) DO NOTHING
+    """)
+
+    DUE_SQL = text("""
+        SELECT r.question_id, q.question_id, r.card_index,
+               card.c ->> 'card_type', card.c ->> 'front', card.c ->> 'back',
+               r.due_at, r.interval_days, r.repetitions
+        FROM (
+            SELECT question_id, card_index, due_at, interval_days, repetitions
+            FROM flashcard_reviews
+            WHERE user_id = :user_id AND due_at <= :now
+            ORDER BY due_at, question_id, card_index
+            LIMIT :limit
+        ) r
+        JOIN questions q ON q.id = r.question_id
+        CROSS JOIN LATERAL (
+            SELECT q.tier_2_student_learning -> 'flashcards' -> CAST(r.card_index AS int) AS c
+        ) card
+        ORDER BY r.due_at, r.question_id, r.card_index
+    """)
+
+    STATES_SQL = text("""
+        SELECT r.question_id, r.card_index, r.ease, r.interval_days, r.repetitions, r.lapses
+        FROM flashcard_reviews r
+        JOIN unnest(CAST(:question_ids AS uuid[]), CAST(:card_indexes AS int[])) AS k(question_id, card_index)
+          ON r.question_id = k.question_id AND r.card_index = k.card_index
+        WHERE r.user_id = :user_id
+    """)
+
+    # Updates enrolled cards only; review() rejects keys STATES_SQL did not return
+    SAVE_SQL = text("""
+        UPDATE flashcard_reviews r SET
+            ease = s.ease,
+            interval_days = s.interval_days,
+            repetitions = s.repetitions,
+            lapses = s.lapses,
+            due_at = s.due_at,
+            last_reviewed_at = :now
+        FROM unnest(
+            CAST(:question_ids AS uuid[]), CAST(:card_indexes AS int[]), CAST(:eases AS int[]),
+            CAST(:intervals AS int[]), CAST(:repetitions AS int[]), CAST(:lapses AS int[]),
+            CAST(:due_ats AS timestamp[])
+        ) AS s(question_id, card_index, ease, interval_days, repetitions, lapses, due_at)
+        WHERE r.user_id = :user_id AND r.question_id = s.question_id AND r.card_index = s.card_index
+    """)
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enroll(self, user_id: int, question_ids: list[str]) -> int:
+        """
+        Add all flashcards of the given questions to the user's deck, due now.
+        Raises ValueError naming unknown question IDs. Returns newly added cards.
+        """
+        resolved = await QuestionService(self.session).resolve_question_uuids(question_ids)
+        missing = sorted(set(question_ids) - set(resolved))
+        if missing:
+            raise ValueError(f"Questions not found: {', '.join(missing)}")
+        result = await self.session.execute(self.ENROLL_SQL, {
+            "user_id": user_id,
+            "question_ids": list(set(resolved.values())),
+            "now": datetime.utcnow(),
+        })
+        await self.session.commit()
+        return result.rowcount
+
+    async def due(self, user_id: int, limit: int = 50, now: Optional[datetime] = None) -> DueFlashcards:
+        """Cards due for review, most overdue first."""
+        rows = (await self.session.execute(self.DUE_SQL, {
+            "user_id": user_id,
+            "now": now or datetime.utcnow(),
+            "limit": limit + 1,
+        })).all()
+        cards = [
+            DueFlashcard(
+                question_id=qid, question_code=code, card_index=index, card_type=card_type,
+                front=front, back=back, due_at=due_at, interval_days=interval, repetitions=repetitions,
+            )
+            for qid, code, index, card_type, front, back, due_at, interval, repetitions in rows[:limit]
+        ]
+        return DueFlashcards(cards=cards, has_more=len(rows) > limit)
+
+    async def review(self, user_id: int, items: list[FlashcardReviewItem], now: Optional[datetime] = None) -> list[ScheduledFlashcard]:
+        """
+        Apply a batch of reviews in order (a card may appear more than once) and save the new schedule.
+        Raises ValueError naming cards that are not in the user's deck; nothing is saved in that case.
+        """
+        now = now or datetime.utcnow()
+        keys = list(dict.fromkeys((item.question_id, item.card_index) for item in items))
+        rows = (await self.session.execute(self.STATES_SQL, {
+            "user_id": user_id,
+            "question_ids": [qid for qid, _ in keys],
+            "card_indexes": [index for _, index in keys],
+        })).all()
+        states: dict[tuple[uuid.UUID, int], CardState] = {
+            (qid, index): CardState(ease, interval, repetitions, lapses)
+            for qid, index, ease, interval, repetitions, lapses in rows
+        }
+        missing = [f"{qid}#{index}" for qid, index in keys if (qid, index) not in states]
+        if missing:
+            raise ValueError(f"Flashcards not in deck: {', '.join(missing)}")
+
+        due: dict[tuple[uuid.UUID, int], datetime] = {}
+        for item in items:
+            key = (item.question_id, item.card_index)
+            states[key], due[key] = review(states[key], item.quality, now)
+
+        await self.session.execute(self.SAVE_SQL, {
+            "user_id": user_id,
+            "now": now,
+            "question_ids": [qid for qid, _ in keys],
+            "card_indexes": [index for _, index in keys],
+            "eases": [states[k].ease for k in keys],
+            "intervals": [states[k].interval_days for k in keys],
+            "repetitions": [states[k].repetitions for k in keys],
+            "lapses": [states[k].lapses for k in keys],
+            "due_ats": [due[k] for k in keys],
+        })
+        await self.session.commit()
+        return [
+            ScheduledFlashcard(question_id=qid, card_index=index, interval_days=states[(qid, index)].interval_days,
+                               due_at=due[(qid, index)])
+            for qid, index in keys
+        ]
@@ -0,0 +1 @@
+"""Leaderboard domain package."""
@@ -0,0 +1,77 @@
+"""
+In-memory top-N boards.
+
+Each (period, metric) board keeps its best N users as a list sorted by
+(-score, user_id), maintained with bisect. Boards are snapshots of
+leaderboard_entries, reloaded every leaderboard_refresh_seconds, and patched
+in between with the scores this process writes. The boards themselves sit in
+a bounded TTLCache, so boards for old or rarely viewed weeks are evicted.
+"""
+import bisect
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class TopN:
+    """Best `size` (user_id, score) pairs, highest score first, ties by lower user_id."""
+
+    def __init__(self, size: int, rows: list[tuple[int, float]] = ()):
+        self.size = size
+        self.loaded_at = datetime.utcnow()
+        self.stale = False
+        self._order: list[tuple[float, int]] = sorted((-score, user_id) for user_id, score in rows)[:size]
+        self._scores = {user_id: -neg for neg, user_id in self._order}
+
+    def update(self, user_id: int, score: Optional[float]) -> None:
+        """Apply a user's new score. Marks the board stale if it can no longer be sure of its top N."""
+        # A full board only knows its own members; one that is not full holds every scorer
+        full = len(self._order) >= self.size
+        old = self._scores.pop(user_id, None)
+        if old is not None:
+            del self._order[bisect.bisect_left(self._order, (-old, user_id))]
+        if not score:  # Unranked (None) or nothing yet (0)
+            if old is not None and full:
+                self.stale = True  # Someone outside the board may now belong in it
+            return
+        entry = (-score, user_id)
+        if full and self._order and entry > self._order[-1]:
+            if old is not None:
+                self.stale = True  # Dropped to the edge; users below the board may be ahead
+            else:
+                return
+        bisect.insort(self._order, entry)
+        self._scores[user_id] = score
+        if len(self._order) > self.size:
+            _, evicted = self._order.pop()
+            del self._scores[evicted]
+
+    def top(self, limit: int) -> list[tuple[int, float]]:
+        return [(user_id, -neg) for neg, user_id in self._order[:limit]]
+
+    def is_fresh(self, max_age: timedelta) -> bool:
+        return not self.stale and datetime.utcnow() - self.loaded_at < max_age
+
+
+_boards = TTLCache("leaderboard_boards", settings.leaderboard_board_cache_size, settings.leaderboard_board_ttl_seconds)
+
+
+def get_board(period: str, metric: str) -> Optional[TopN]:
+    return _boards.get((period, metric))
+
+
+def set_board(period: str, metric: str, board: TopN) -> None:
+    _boards.set((period, metric), board)
+
+
+def record(period: str, metric: str, user_id: int, score: Optional[float]) -> None:
+    """Patch a cached board with a score just written to the database (no-op if not cached)."""
+    board = _boards.get((period, metric))
+    if board is not None:
+        board.update(user_id, score)
+
+
+def clear() -> None:
+    _boards.clear()
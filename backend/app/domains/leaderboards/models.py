@@ -0,0 +1,29 @@
+"""Per-period leaderboard scores, maintained from attempt writes."""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Index, text
+from sqlmodel import Field, SQLModel
+
+
+class LeaderboardEntry(SQLModel, table=True):
+    """
+    One user's scores for a period ("all" or an ISO week like "2026-W42").
+    Each metric has a (period, metric) index so "my rank" is a count of the
+    entries above the user's score.
+    """
+    __tablename__ = "leaderboard_entries"
+    __table_args__ = (
+        Index("ix_leaderboard_entries_solved", "period", text("solved DESC")),
+        Index("ix_leaderboard_entries_accuracy", "period", text("accuracy DESC")),
+        Index("ix_leaderboard_entries_streak", "period", text("streak DESC")),
+    )
+
+    period: str = Field(primary_key=True)
+    user_id: int = Field(primary_key=True)
+    solved: int = Field(default=0, description="Distinct questions first answered correctly in the period")
+    attempts: int = Field(default=0)
+    correct: int = Field(default=0)
+    accuracy: Optional[float] = Field(default=None, description="correct / attempts; NULL until enough attempts")
+    streak: int = Field(default=0, description="Longest daily streak (all-time) or best streak reached that week")
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,25 @@
+"""Pydantic schemas for leaderboards."""
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardRow(BaseModel):
+    rank: int
+    user_id: int
+    name: Optional[str] = None
+    score: float
+
+
+class LeaderboardResponse(BaseModel):
+    metric: str  # solved, accuracy or streak
+    period: str  # "all" or an ISO week like "2026-W42"
+    rows: list[LeaderboardRow]
+
+
+class MyRank(BaseModel):
+    metric: str
+    period: str
+    score: Optional[float] = None  # None if the user is not ranked in this period
+    rank: Optional[int] = None
+    ranked_users: int = 0
@@ -0,0 +1,265 @@
+"""
+Leaderboard service.
+
+Scores per user and period are upserted incrementally with every batch of
+attempts (inside the attempt transaction); the in-memory top-N boards
+(app.domains.leaderboards.board) are patched with the new scores only once
+that transaction commits, and reloaded with one index scan when stale; "my rank" counts the entries above the user's score on the metric's
+(period, metric DESC) index.
+"""
+import re
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domains.auth.models import User
+from app.domains.leaderboards import board
+from app.domains.leaderboards.board import TopN
+from app.domains.leaderboards.schemas import LeaderboardResponse, LeaderboardRow, MyRank
+
+ALL_TIME = "all"
+METRICS = ("solved", "accuracy", "streak")
+TOP_SIZE = 100
+MIN_ACCURACY_ATTEMPTS = 20  # Accuracy boards only rank users with at least this many attempts in the period
+WEEK_PERIOD = re.compile(r"[0-9]{4}-W[0-9]{2}")
+
+
+def week_period(day: date) -> str:
+    """ISO week key, e.g. "2026-W42"."""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_start(day: date) -> datetime:
+    monday = day - timedelta(days=day.weekday())
+    return datetime(monday.year, monday.month, monday.day)
+
+
+def resolve_period(period: str) -> str:
+    """"all", "week" (the current ISO week) or an explicit week key; ValueError for anything else."""
+    if period == "week":
+        return week_period(datetime.utcnow().date())
+    if period != ALL_TIME and not WEEK_PERIOD.fullmatch(period):
+        raise ValueError(f"Unknown leaderboard period: {period}")
+    return period
+
+
+class LeaderboardService:
+    """Maintains and reads leaderboards."""
+
+    # Last earlier correct attempt per question (archived months included), to count only first solves
+    PRIOR_SOLVES_SQL = text("""
+        SELECT q.id, GREATEST(
+            (
+                SELECT max(a.attempted_at) FROM user_attempts a
+                WHERE a.user_id = :user_id AND a.question_id = q.id AND a.is_correct
+            ),
+            (
+                SELECT h.last_correct_at FROM user_archived_questions h
+                WHERE h.user_id = :user_id AND h.question_id = q.id
+            )
+        )
+        FROM unnest(CAST(:question_ids AS uuid[])) AS q(id)
+    """)
+
+    # Streaks are records, so they never go stale: the all-time entry holds the longest
+    # streak, a weekly entry the best streak reached while active that week.
+    UPSERT_SQL = text("""
+        INSERT INTO leaderboard_entries AS e (period, user_id, solved, attempts, correct, accuracy, streak, updated_at)
+        SELECT p.period, :user_id, p.solved, p.attempts, p.correct,
+               CASE WHEN p.attempts >= :min_attempts THEN CAST(p.correct AS float) / p.attempts END,
+               CASE WHEN p.period = :all_time THEN s.longest_streak ELSE s.current_streak END,
+               :now
+        FROM unnest(
+            CAST(:periods AS text[]), CAST(:solved AS int[]), CAST(:attempts AS int[]), CAST(:corrects AS int[])
+        ) AS p(period, solved, attempts, correct)
+        CROSS JOIN (
+            SELECT coalesce(max(current_streak), 0) AS current_streak, coalesce(max(longest_streak), 0) AS longest_streak
+            FROM user_progress WHERE user_id = :user_id
+        ) s
+        ON CONFLICT (period, user_id) DO UPDATE SET
+            solved = e.solved + EXCLUDED.solved,
+            attempts = e.attempts + EXCLUDED.attempts,
+            correct = e.correct + EXCLUDED.correct,
+            accuracy = CASE WHEN e.attempts + EXCLUDED.attempts >= :min_attempts
+                            THEN CAST(e.correct + EXCLUDED.correct AS float) / (e.attempts + EXCLUDED.attempts) END,
+            streak = GREATEST(e.streak, EXCLUDED.streak),
+            updated_at = EXCLUDED.updated_at
+        RETURNING e.period, e.solved, e.accuracy, e.streak
+    """)
+
+    # Recompute every entry from user_attempts (first deploy / after data fixes).
+    # All-time entries add archived months from user_archived_questions; weeks that
+    # were archived have no raw attempts left, so their entries are left as they are.
+    # ISO week keys come from to_char's IYYY-IW, matching week_period(). A weekly streak is
+    # the longest run (gaps-and-islands over active days) reached on any day of that week.
+    REBUILD_SQL = text("""
+        WITH days AS (
+            SELECT user_id, CAST(attempted_at AS date) AS day FROM user_attempts
+            UNION
+            SELECT user_id, day FROM user_attempt_daily_summaries
+        ),
+        runs AS (
+            SELECT user_id, day,
+                   day - CAST(row_number() OVER (PARTITION BY user_id ORDER BY day) AS int) AS anchor
+            FROM days
+        ),
+        week_streaks AS (
+            SELECT to_char(day, 'IYYY-"W"IW') AS period, user_id, max(streak) AS streak
+            FROM (
+                SELECT user_id, day, row_number() OVER (PARTITION BY user_id, anchor ORDER BY day) AS streak
+                FROM runs
+            ) r
+            GROUP BY 1, 2
+        )
+        INSERT INTO leaderboard_entries (period, user_id, solved, attempts, correct, accuracy, streak, updated_at)
+        SELECT t.period, t.user_id, t.solved, t.attempts, t.correct,
+               CASE WHEN t.attempts >= :min_attempts THEN CAST(t.correct AS float) / t.attempts END,
+               coalesce(CASE WHEN t.period = :all_time THEN p.longest_streak ELSE w.streak END, 0), :now
+        FROM (
+            SELECT :all_time AS period, user_id,
+                   count(DISTINCT question_id) FILTER (WHERE correct > 0) AS solved,
+                   sum(attempts) AS attempts, sum(correct) AS correct
+            FROM (
+                SELECT user_id, question_id, count(*) AS attempts, count(*) FILTER (WHERE is_correct) AS correct
+                FROM user_attempts GROUP BY user_id, question_id
+                UNION ALL
+                SELECT user_id, question_id, attempts, correct FROM user_archived_questions
+            ) h
+            GROUP BY user_id
+            UNION ALL
+            SELECT to_char(attempted_at, 'IYYY-"W"IW'), user_id,
+                   count(DISTINCT question_id) FILTER (WHERE is_correct),
+                   count(*), count(*) FILTER (WHERE is_correct)
+            FROM user_attempts GROUP BY 1, user_id
+        ) t
+        LEFT JOIN user_progress p ON p.user_id = t.user_id
+        LEFT JOIN week_streaks w ON w.period = t.period AND w.user_id = t.user_id
+        ON CONFLICT (period, user_id) DO UPDATE SET
+            solved = EXCLUDED.solved,
+            attempts = EXCLUDED.attempts,
+            correct = EXCLUDED.correct,
+            accuracy = EXCLUDED.accuracy,
+            streak = EXCLUDED.streak,
+            updated_at = EXCLUDED.updated_at
+    """)
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def rebuild(self) -> int:
+        """
+        Recompute entries from attempt history (see REBUILD_SQL for archived months).
+        Returns the number of entries written.
+        """
+        result = await self.session.execute(self.REBUILD_SQL, {
+            "all_time": ALL_TIME, "min_attempts": MIN_ACCURACY_ATTEMPTS, "now": datetime.utcnow(),
+        })
+        board.clear()
+        return result.rowcount
+
+    async def on_attempts(self, user_id: int, attempts: list) -> list[tuple]:
+        """
+        Add a user's new attempts to their all-time and weekly entries.
+        Call after the progress rollups are updated (for the streaks) and before
+        the attempts are inserted (so earlier solves are told apart).
+        Returns the updated (period, solved, accuracy, streak) scores; pass them
+        to record_scores() after the transaction commits.
+        """
+        correct_ids = list({a.question_id for a in attempts if a.is_correct})
+        prior: dict[uuid.UUID, Optional[datetime]] = {}
+        if correct_ids:
+            prior = dict((await self.session.execute(self.PRIOR_SOLVES_SQL, {
+                "user_id": user_id, "question_ids": correct_ids,
+            })).all())
+
+        # period -> [solved question IDs, attempts, correct]
+        totals: dict[str, list] = {}
+        for attempt in attempts:
+            day = attempt.attempted_at.date()
+            for period, since in ((ALL_TIME, None), (week_period(day), week_start(day))):
+                entry = totals.setdefault(period, [set(), 0, 0])
+                entry[1] += 1
+                if attempt.is_correct:
+                    entry[2] += 1
+                    last = prior.get(attempt.question_id)
+                    if last is None or (since is not None and last < since):
+                        entry[0].add(attempt.question_id)
+
+        periods = list(totals)
+        rows = (await self.session.execute(self.UPSERT_SQL, {
+            "user_id": user_id,
+            "periods": periods,
+            "solved": [len(totals[p][0]) for p in periods],
+            "attempts": [totals[p][1] for p in periods],
+            "corrects": [totals[p][2] for p in periods],
+            "all_time": ALL_TIME,
+            "min_attempts": MIN_ACCURACY_ATTEMPTS,
+            "now": datetime.utcnow(),
+        })).all()
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def record_scores(user_id: int, scores: list[tuple]) -> None:
+        """Patch the in-memory boards with committed scores from on_attempts()."""
+        for period, solved, accuracy, streak in scores:
+            board.record(period, "solved", user_id, solved)
+            board.record(period, "accuracy", user_id, accuracy)
+            board.record(period, "streak", user_id, streak)
+
+    async def _load_board(self, period: str, metric: str) -> TopN:
+        # metric is one of METRICS (validated by the caller), so interpolation is safe
+        rows = (await self.session.execute(text(f"""
+            SELECT user_id, {metric} FROM leaderboard_entries
+            WHERE period = :period AND {metric} IS NOT NULL AND {metric} > 0
+            ORDER BY {metric} DESC, user_id
+            LIMIT :size
+        """), {"period": period, "size": TOP_SIZE})).all()
+        top = TopN(TOP_SIZE, [(user_id, score) for user_id, score in rows])
+        board.set_board(period, metric, top)
+        return top
+
+    async def top(self, metric: str, period: str, limit: int = 20) -> LeaderboardResponse:
+        """Top users for a metric and period, from the cached board."""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown leaderboard metric: {metric}")
+        top = board.get_board(period, metric)
+        if top is None or not top.is_fresh(timedelta(seconds=settings.leaderboard_refresh_seconds)):
+            top = await self._load_board(period, metric)
+
+        entries = top.top(min(limit, TOP_SIZE))
+        names = {}
+        if entries:
+            names = dict((await self.session.execute(
+                select(User.id, User.full_name).where(User.id.in_([user_id for user_id, _ in entries]))
+            )).all())
+        return LeaderboardResponse(
+            metric=metric,
+            period=period,
+            rows=[
+                LeaderboardRow(rank=rank, user_id=user_id, name=names.get(user_id), score=score)
+                for rank, (user_id, score) in enumerate(entries, start=1)
+            ],
+        )
+
+    async def my_rank(self, user_id: int, metric: str, period: str) -> MyRank:
+        """The user's score and rank (1 + users strictly ahead), via indexed counts."""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown leaderboard metric: {metric}")
+        row = (await self.session.execute(text(f"""
+            SELECT e.{metric},
+                   (SELECT count(*) FROM leaderboard_entries o
+                    WHERE o.period = e.period AND o.{metric} > e.{metric}) + 1,
+                   (SELECT count(*) FROM leaderboard_entries o
+                    WHERE o.period = e.period AND o.{metric} IS NOT NULL)
+            FROM leaderboard_entries e
+            WHERE e.period = :period AND e.user_id = :user_id
+        """), {"period": period, "user_id": user_id})).first()
+        if row is None or row[0] is None:
+            return MyRank(metric=metric, period=period)
+        score, rank, ranked = row
+        return MyRank(metric=metric, period=period, score=score, rank=rank, ranked_users=ranked)
@@ -0,0 +1 @@
+"""Mock test paper domain package."""
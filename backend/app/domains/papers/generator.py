@@ -0,0 +1,189 @@
+"""
+Stratified mock paper sampling over an in-memory question index.
+
+Questions are bucketed by (syllabus section, topic, difficulty band, type)
+once; a paper is then drawn in a single pass: the question count is split
+across sections by weight, each section's share across difficulty bands,
+and each band's share across topics in proportion to how often the topic
+appears, sampling without replacement inside the buckets. Shortfalls at any
+level are redistributed to the siblings that still have candidates.
+"""
+import bisect
+import random
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+# GATE AE paper sections, in paper order, with the default question share (65 questions)
+DEFAULT_SECTION_WEIGHTS = {
+    "General Aptitude": 10,
+    "Engineering Mathematics": 9,
+    "Flight Mechanics": 8,
+    "Space Dynamics": 4,
+    "Aerodynamics": 12,
+    "Structures": 12,
+    "Propulsion": 10,
+}
+SECTION_ORDER = list(DEFAULT_SECTION_WEIGHTS)
+OTHER_SECTION = "Other"
+
+# Keywords mapping the free-form tier_1 subject tag (e.g. "Mathematics for
+# Aerospace Engineers", "Vibrations") onto a section; first match wins
+SECTION_KEYWORDS = [
+    ("General Aptitude", ("aptitude", "english", "grammar", "general knowledge", "verbal", "reasoning")),
+    ("Engineering Mathematics", ("math", "calculus", "linear algebra", "numerical", "differential", "probability")),
+    ("Space Dynamics", ("space", "orbit")),
+    ("Flight Mechanics", ("flight", "control system", "stability")),
+    ("Aerodynamics", ("aerodynamic", "fluid", "gas dynamic")),
+    ("Structures", ("structur", "vibration", "solid mechanic", "engineering mechanic", "dynamics")),
+    ("Propulsion", ("propulsion", "thermodynamic", "combustion", "rocket", "engine")),
+]
+
+DIFFICULTY_BANDS = ("Easy", "Medium", "Hard")
+DEFAULT_DIFFICULTY_MIX = {"Easy": 0.3, "Medium": 0.5, "Hard": 0.2}
+
+
+def syllabus_section(subject_tag: Optional[str], subject: Optional[str] = None) -> str:
+    """Normalize a question's syllabus subject tag (falling back to its subject column) to a section."""
+    for text in (subject_tag, subject):
+        if not text:
+            continue
+        lowered = text.lower()
+        for section, keywords in SECTION_KEYWORDS:
+            if any(k in lowered for k in keywords):
+                return section
+    return OTHER_SECTION
+
+
+def difficulty_band(irt_difficulty: Optional[float], difficulty_score: Optional[float]) -> str:
+    """Calibrated IRT difficulty when available, else the tier_0 1-10 score (same cut-offs as list items)."""
+    if irt_difficulty is not None:
+        return "Easy" if irt_difficulty < -0.5 else "Hard" if irt_difficulty > 0.5 else "Medium"
+    if difficulty_score is not None:
+        return "Easy" if difficulty_score <= 4 else "Hard" if difficulty_score >= 8 else "Medium"
+    return "Medium"
+
+
+class IndexedQuestion(NamedTuple):
+    id: uuid.UUID
+    year: int
+    section: str
+    topic: str
+    band: str
+    question_type: str
+    marks: float
+
+
+def allocate(total: int, weights: dict, capacity: dict) -> dict:
+    """
+    Split total across keys proportionally to weights (largest remainder),
+    never exceeding a key's capacity; leftovers go to keys with room.
+    Returns {key: count} for keys with a positive count.
+    """
+    result = {k: 0 for k in weights}
+    remaining = total
+    open_keys = [k for k, w in weights.items() if w > 0 and capacity.get(k, 0) > 0]
+    while remaining > 0 and open_keys:
+        weight_sum = sum(weights[k] for k in open_keys)
+        shares = {k: remaining * weights[k] / weight_sum for k in open_keys}
+        grants = {k: min(int(shares[k]), capacity[k] - result[k]) for k in open_keys}
+        granted = sum(grants.values())
+        if granted < remaining:
+            # Hand out the remainder by largest fractional part, one each
+            by_fraction = sorted(open_keys, key=lambda k: shares[k] - int(shares[k]), reverse=True)
+            for k in by_fraction:
+                if granted >= remaining:
+                    break
+                if result[k] + grants[k] < capacity[k]:
+                    grants[k] += 1
+                    granted += 1
+        for k, n in grants.items():
+            result[k] += n
+        remaining -= granted
+        open_keys = [k for k in open_keys if result[k] < capacity[k]]
+        if granted == 0:
+            break
+    return {k: n for k, n in result.items() if n > 0}
+
+
+class QuestionIndex:
+    """Question IDs bucketed by (section, topic, band, type), each bucket sorted by year."""
+
+    def __init__(self, questions: list[IndexedQuestion]):
+        self.built_at = datetime.utcnow()
+        self.size = len(questions)
+        buckets: dict[tuple, list[IndexedQuestion]] = defaultdict(list)
+        for q in questions:
+            buckets[(q.section, q.topic, q.band, q.question_type)].append(q)
+        self._buckets = {key: sorted(qs, key=lambda q: q.year) for key, qs in buckets.items()}
+        self._years = {key: [q.year for q in qs] for key, qs in self._buckets.items()}
+        self._sections = {q.id: q.section for q in questions}
+
+    def section_of(self, question_id: uuid.UUID) -> str:
+        return self._sections.get(question_id, OTHER_SECTION)
+
+    def _candidates(self, year_from: Optional[int], year_to: Optional[int], types: Optional[set], exclude: set) -> dict:
+        """{section: {band: {topic: [questions]}}} within the year range, minus excluded IDs."""
+        tree: dict = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+        for key, questions in self._buckets.items():
+            section, topic, band, question_type = key
+            if types and question_type not in types:
+                continue
+            years = self._years[key]
+            lo = bisect.bisect_left(years, year_from) if year_from is not None else 0
+            hi = bisect.bisect_right(years, year_to) if year_to is not None else len(years)
+            picked = [q for q in questions[lo:hi] if q.id not in exclude]
+            if picked:
+                tree[section][band][topic].extend(picked)
+        return tree
+
+    def sample(
+        self,
+        num_questions: int,
+        section_weights: Optional[dict] = None,
+        difficulty_mix: Optional[dict] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        question_types: Optional[list] = None,
+        exclude: Optional[set] = None,
+        rng: Optional[random.Random] = None,
+    ) -> list[IndexedQuestion]:
+        """Draw a stratified paper, ordered by section (paper order) then marks."""
+        rng = rng or random.Random()
+        section_weights = section_weights or DEFAULT_SECTION_WEIGHTS
+        difficulty_mix = difficulty_mix or DEFAULT_DIFFICULTY_MIX
+        tree = self._candidates(year_from, year_to, set(question_types or []), exclude or set())
+
+        def size(node) -> int:
+            return sum(size(v) for v in node.values()) if isinstance(node, dict) else len(node)
+
+        paper = []
+        section_counts = allocate(
+            num_questions,
+            # Sections outside the weights (e.g. "Other") only absorb shortfalls
+            {s: section_weights.get(s, 0) or 1e-6 for s in tree},
+            {s: size(bands) for s, bands in tree.items()},
+        )
+        for section, section_count in section_counts.items():
+            bands = tree[section]
+            band_counts = allocate(
+                section_count,
+                # Bands outside the mix still get a tiny weight so they can absorb shortfalls
+                {b: difficulty_mix.get(b, 0) or 1e-6 for b in bands},
+                {b: size(topics) for b, topics in bands.items()},
+            )
+            for band, band_count in band_counts.items():
+                topics = bands[band]
+                # Topic weights follow how often each topic appears, like the real papers
+                topic_counts = allocate(
+                    band_count,
+                    {t: len(qs) + rng.random() * 1e-3 for t, qs in topics.items()},
+                    {t: len(qs) for t, qs in topics.items()},
+                )
+                for topic, topic_count in topic_counts.items():
+                    paper.extend(rng.sample(topics[topic], topic_count))
+
+        order = {s: i for i, s in enumerate(SECTION_ORDER)}
+        paper.sort(key=lambda q: (order.get(q.section, len(order)), q.marks))
+        return paper
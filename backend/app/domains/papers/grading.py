@@ -0,0 +1,168 @@
+"""
+Vectorized paper grading.
+
+A paper's answer keys are compiled once into a PaperKey of parallel NumPy
+arrays (question kind, choice bitmask, NAT range, marks, negative marks) and
+kept in a small TTL cache keyed by paper id. Submissions are encoded into the
+same layout (choice bitmask, numeric value) so a whole paper, or a whole
+batch of submissions as a 2-D array, is graded with a handful of array ops.
+
+Answer key formats:
+  MCQ  "B"                      one option
+  MSQ  "A;C" / "A,C" / "AC"     all listed options, nothing else
+  NAT  "12.5" / "1.5 to 1.6"    a value or an inclusive range ("1.5:1.6" also accepted)
+Only MCQ answers carry negative marks (GATE rules). Keys that cannot be
+parsed grade as "invalid" and score nothing either way.
+
+NumPy is imported on first use, so it stays out of the API's cold start.
+"""
+from __future__ import annotations
+
+import re
+import uuid
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MCQ, MSQ, NAT, INVALID = 0, 1, 2, 3
+KINDS = {"MCQ": MCQ, "MSQ": MSQ, "NAT": NAT}
+OPTION_BITS = {letter: 1 << i for i, letter in enumerate("ABCDEFGH")}
+
+NAT_TOLERANCE = 1e-9
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_NAT_RANGE = re.compile(rf"^\s*({_NUMBER})\s*(?:to|:|–|—|-)\s*({_NUMBER})\s*$", re.IGNORECASE)
+_NAT_VALUE = re.compile(rf"^\s*({_NUMBER})\s*$")
+
+# Per-question status codes in a GradeResult
+UNANSWERED, CORRECT, WRONG = 0, 1, 2
+STATUS_NAMES = {UNANSWERED: "unanswered", CORRECT: "correct", WRONG: "wrong"}
+
+
+def choice_mask(answer: Optional[str]) -> int:
+    """Bitmask of the options in "A", "A;C", "a, c", "A and C" or "AC". 0 if none/unrecognized."""
+    if not answer:
+        return 0
+    mask = 0
+    for letter in re.sub(r"[\s;,/&]|AND", "", answer.upper()):
+        bit = OPTION_BITS.get(letter)
+        if bit is None:
+            return 0
+        mask |= bit
+    return mask
+
+
+def nat_range(answer: Optional[str]) -> Optional[tuple[float, float]]:
+    """(low, high) for "12.5" or "1.5 to 1.6"; None if unparseable."""
+    if not answer:
+        return None
+    match = _NAT_RANGE.match(answer) or _NAT_VALUE.match(answer)
+    if not match:
+        return None
+    values = [float(v) for v in match.groups()]
+    return min(values), max(values)
+
+
+class PaperKey(NamedTuple):
+    """Compiled answer keys for one paper, in paper order."""
+    question_uuids: list[uuid.UUID]
+    question_ids: list[str]
+    kind: np.ndarray       # int8, MCQ/MSQ/NAT/INVALID
+    mask: np.ndarray       # uint8 option bitmask (MCQ/MSQ)
+    low: np.ndarray        # float64 NAT range
+    high: np.ndarray
+    marks: np.ndarray      # float64
+    negative: np.ndarray   # float64, already zeroed for non-MCQ
+
+    @property
+    def max_score(self) -> float:
+        return float(self.marks[self.kind != INVALID].sum())
+
+    def position(self) -> dict[str, int]:
+        return {qid: i for i, qid in enumerate(self.question_ids)}
+
+
+def compile_key(questions: Sequence) -> PaperKey:
+    """Build a PaperKey from Question-like rows (question_type, answer_key, marks, negative_marks)."""
+    import numpy as np
+
+    n = len(questions)
+    kind = np.full(n, INVALID, dtype=np.int8)
+    mask = np.zeros(n, dtype=np.uint8)
+    low = np.full(n, np.nan)
+    high = np.full(n, np.nan)
+    for i, q in enumerate(questions):
+        question_kind = KINDS.get((q.question_type or "").upper(), INVALID)
+        if question_kind == NAT:
+            bounds = nat_range(q.answer_key)
+            if bounds is not None:
+                kind[i] = NAT
+                low[i], high[i] = bounds
+        elif question_kind != INVALID:
+            bits = choice_mask(q.answer_key)
+            if bits:
+                # A single-option key on an "MSQ" still grades exactly; a multi-option MCQ key is an MSQ
+                kind[i] = MSQ if question_kind == MSQ or bits & (bits - 1) else MCQ
+                mask[i] = bits
+    marks = np.array([float(q.marks or 0) for q in questions])
+    negative = np.array([float(q.negative_marks or 0) for q in questions])
+    negative[kind != MCQ] = 0.0
+    return PaperKey(
+        question_uuids=[q.id for q in questions],
+        question_ids=[q.question_id for q in questions],
+        kind=kind, mask=mask, low=low, high=high, marks=marks, negative=negative,
+    )
+
+
+class GradeResult(NamedTuple):
+    status: np.ndarray   # int8 UNANSWERED/CORRECT/WRONG, shape (..., n_questions)
+    awarded: np.ndarray  # float64 marks per question (negative for wrong MCQs)
+    total: np.ndarray    # float64 per submission (scalar for a single one)
+
+
+def encode_responses(key: PaperKey, responses: Sequence[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encode submissions ({question_id: "B" | "A;C" | 12.5}) as (masks, values)
+    arrays of shape (n_submissions, n_questions). Unknown question IDs are ignored.
+    """
+    import numpy as np
+
+    position = key.position()
+    masks = np.zeros((len(responses), len(key.question_ids)), dtype=np.uint8)
+    values = np.full((len(responses), len(key.question_ids)), np.nan)
+    for row, answers in enumerate(responses):
+        for question_id, answer in answers.items():
+            col = position.get(question_id)
+            if col is None or answer is None or answer == "":
+                continue
+            if key.kind[col] == NAT:
+                try:
+                    values[row, col] = float(answer)
+                except (TypeError, ValueError):
+                    values[row, col] = np.inf  # Answered, but never inside a range
+            else:
+                masks[row, col] = choice_mask(str(answer)) or 0xFF  # Garbage still counts as an answer
+    return masks, values
+
+
+def grade(key: PaperKey, masks: np.ndarray, values: np.ndarray) -> GradeResult:
+    """Grade encoded responses against a key; works for 1-D (one submission) or 2-D (batch) inputs."""
+    import numpy as np
+
+    is_nat = key.kind == NAT
+    answered = np.where(is_nat, ~np.isnan(values), masks != 0) & (key.kind != INVALID)
+    nat_hit = (values >= key.low - NAT_TOLERANCE) & (values <= key.high + NAT_TOLERANCE)
+    correct = answered & np.where(is_nat, nat_hit, masks == key.mask)
+    wrong = answered & ~correct
+
+    awarded = np.where(correct, key.marks, np.where(wrong, -key.negative, 0.0))
+    status = np.where(correct, CORRECT, np.where(wrong, WRONG, UNANSWERED)).astype(np.int8)
+    return GradeResult(status=status, awarded=awarded, total=awarded.sum(axis=-1))
+
+
+# (owner user ID or None for official papers, compiled PaperKey) by paper id
+# (e.g. "GATE_AE_2019" or a mock paper UUID)
+answer_keys = TTLCache("answer_keys", settings.answer_key_cache_size, settings.answer_key_cache_ttl_seconds)
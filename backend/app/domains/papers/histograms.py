@@ -0,0 +1,134 @@
+"""
+Per-paper score histograms.
+
+Each paper has one row of fixed-width bin counts (paper_score_histograms),
+incremented atomically in the same transaction as every graded submission.
+Percentile and rank for any score are read from the counts in O(bins),
+without touching paper_submissions. rebuild() recomputes a row from the
+stored submissions.
+"""
+import math
+from typing import NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.papers.grading import PaperKey
+
+BIN_WIDTH = 1.0  # marks per bin
+
+
+class Histogram(NamedTuple):
+    low: float          # Lower edge of the first bin
+    bin_width: float
+    counts: list[int]
+    total: int
+
+
+def layout(key: PaperKey, bin_width: float = BIN_WIDTH) -> tuple[float, int]:
+    """(low, n_bins) covering every reachable score: all MCQs wrong up to full marks."""
+    low = math.floor(-float(key.negative.sum()) / bin_width) * bin_width
+    n_bins = int(math.ceil((key.max_score - low) / bin_width)) + 1
+    return low, n_bins
+
+
+def bin_index(score: float, low: float, bin_width: float, n_bins: int) -> int:
+    """0-based bin for a score, clamped to the histogram."""
+    return min(max(int(math.floor((score - low) / bin_width)), 0), n_bins - 1)
+
+
+def percentile_and_rank(histogram: Histogram, score: float) -> tuple[Optional[float], Optional[int]]:
+    """
+    Percentile rank (submissions in lower bins plus half of the score's own
+    bin) and rank (1 + submissions in higher bins; same-bin scores tie).
+    (None, None) when the histogram is empty.
+    """
+    if histogram.total == 0:
+        return None, None
+    b = bin_index(score, histogram.low, histogram.bin_width, len(histogram.counts))
+    below = sum(histogram.counts[:b])
+    above = histogram.total - below - histogram.counts[b]
+    percentile = round((below + 0.5 * histogram.counts[b]) / histogram.total * 100, 1)
+    return percentile, above + 1
+
+
+class ScoreHistogramRepository:
+    """Reads and atomically updates paper_score_histograms."""
+
+    # Creates the row with the caller's layout, or increments the bin the score
+    # falls in under the stored layout; the row lock serializes concurrent submits
+    RECORD_SQL = text("""
+        INSERT INTO paper_score_histograms AS h (paper_id, low, bin_width, counts, total, updated_at)
+        VALUES (
+            :paper_id, :low, :bin_width,
+            array_fill(0, ARRAY[CAST(:index AS int)]) || 1
+                || array_fill(0, ARRAY[CAST(:n_bins AS int) - CAST(:index AS int) - 1]),
+            1, :now
+        )
+        ON CONFLICT (paper_id) DO UPDATE SET
+            counts[least(greatest(CAST(floor((CAST(:score AS float) - h.low) / h.bin_width) AS int), 0), cardinality(h.counts) - 1) + 1] =
+                h.counts[least(greatest(CAST(floor((CAST(:score AS float) - h.low) / h.bin_width) AS int), 0), cardinality(h.counts) - 1) + 1] + 1,
+            total = h.total + 1,
+            updated_at = EXCLUDED.updated_at
+        RETURNING h.low, h.bin_width, h.counts, h.total
+    """)
+
+    GET_SQL = text("SELECT low, bin_width, counts, total FROM paper_score_histograms WHERE paper_id = :paper_id")
+
+    # Counts per bin over all stored submissions, replacing the row
+    REBUILD_SQL = text("""
+        WITH bins AS (
+            SELECT least(greatest(CAST(floor((score - CAST(:low AS float)) / CAST(:bin_width AS float)) AS int), 0),
+                         CAST(:n_bins AS int) - 1) AS b,
+                   count(*) AS n
+            FROM paper_submissions
+            WHERE paper_id = :paper_id
+            GROUP BY 1
+        )
+        INSERT INTO paper_score_histograms (paper_id, low, bin_width, counts, total, updated_at)
+        SELECT :paper_id, :low, :bin_width,
+               ARRAY(SELECT CAST(coalesce(bins.n, 0) AS int)
+                     FROM generate_series(0, CAST(:n_bins AS int) - 1) AS g
+                     LEFT JOIN bins ON bins.b = g ORDER BY g),
+               CAST(coalesce((SELECT sum(n) FROM bins), 0) AS int),
+               :now
+        ON CONFLICT (paper_id) DO UPDATE SET
+            low = EXCLUDED.low,
+            bin_width = EXCLUDED.bin_width,
+            counts = EXCLUDED.counts,
+            total = EXCLUDED.total,
+            updated_at = EXCLUDED.updated_at
+        RETURNING total
+    """)
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record(self, paper_id: str, key: PaperKey, score: float, now) -> Histogram:
+        """Add one score to the paper's histogram and return the updated histogram."""
+        low, n_bins = layout(key)
+        row = (await self.session.execute(self.RECORD_SQL, {
+            "paper_id": paper_id,
+            "low": low,
+            "bin_width": BIN_WIDTH,
+            "n_bins": n_bins,
+            "index": bin_index(score, low, BIN_WIDTH, n_bins),
+            "score": score,
+            "now": now,
+        })).one()
+        return Histogram(*row)
+
+    async def get(self, paper_id: str) -> Optional[Histogram]:
+        row = (await self.session.execute(self.GET_SQL, {"paper_id": paper_id})).first()
+        return Histogram(*row) if row else None
+
+    async def rebuild(self, paper_id: str, key: PaperKey, now) -> int:
+        """Recompute a paper's histogram from paper_submissions. Returns the submission count."""
+        low, n_bins = layout(key)
+        return (await self.session.execute(self.REBUILD_SQL, {
+            "paper_id": paper_id,
+            "low": low,
+            "bin_width": BIN_WIDTH,
+            "n_bins": n_bins,
+            "now": now,
+        })).scalar_one()
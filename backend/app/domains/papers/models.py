@@ -0,0 +1,48 @@
+"""Generated mock papers."""
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Column, Integer, JSON
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlmodel import Field, SQLModel
+
+
+class MockPaper(SQLModel, table=True):
+    """A sampled mock paper: the ordered question IDs and the request that produced them."""
+    __tablename__ = "mock_papers"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: int = Field(index=True)
+    question_ids: List[uuid.UUID] = Field(default_factory=list, sa_column=Column(ARRAY(UUID(as_uuid=True)), nullable=False))
+    config: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PaperSubmission(SQLModel, table=True):
+    """A graded paper attempt: totals plus the raw responses ({question_id: answer})."""
+    __tablename__ = "paper_submissions"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    user_id: int = Field(index=True)
+    paper_id: str = Field(index=True)  # "GATE_AE_2019" or a mock paper UUID
+    score: float
+    max_score: float
+    correct: int = Field(default=0)
+    wrong: int = Field(default=0)
+    unanswered: int = Field(default=0)
+    time_taken_seconds: int = Field(default=0)
+    responses: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    submitted_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PaperScoreHistogram(SQLModel, table=True):
+    """Fixed-width score bins for a paper; bin i covers [low + i * bin_width, low + (i + 1) * bin_width)."""
+    __tablename__ = "paper_score_histograms"
+
+    paper_id: str = Field(primary_key=True)
+    low: float
+    bin_width: float
+    counts: List[int] = Field(default_factory=list, sa_column=Column(ARRAY(Integer), nullable=False))
+    total: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,93 @@
+"""Pydantic schemas for mock papers and paper grading."""
+import uuid
+from datetime import datetime
+from typing import Optional, Union
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.domains.papers.generator import DEFAULT_DIFFICULTY_MIX
+from app.domains.questions.schemas import QuestionStatsSummary
+
+
+class MockPaperRequest(BaseModel):
+    """How to sample a mock paper. Defaults produce a 65-question GATE AE layout."""
+    num_questions: int = Field(default=65, ge=1, le=200)
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    section_weights: Optional[dict[str, float]] = None  # e.g. {"Aerodynamics": 2, "Structures": 1}; default GATE AE split
+    difficulty_mix: dict[str, float] = Field(default_factory=lambda: dict(DEFAULT_DIFFICULTY_MIX))
+    question_types: Optional[list[str]] = None  # e.g. ["MCQ", "NAT"]; default all
+    exclude_attempted: bool = True
+    seed: Optional[int] = None  # Reproducible sampling
+
+    @model_validator(mode="after")
+    def check_years(self):
+        if self.year_from is not None and self.year_to is not None and self.year_from > self.year_to:
+            raise ValueError("year_from must not be after year_to")
+        return self
+
+
+class PaperQuestionItem(BaseModel):
+    """A question as set in a paper: QuestionListItem without the answer key and explanation."""
+    id: uuid.UUID
+    question_id: str
+    year: int
+    question_number: int
+    subject: str
+    question_text: str
+    question_text_latex: Optional[str] = None
+    question_type: str
+    marks: float
+    difficulty_score: Optional[int] = None
+    difficulty_level: Optional[str] = "Medium"
+    topic: Optional[str] = None
+    concepts: list[str] = []
+    options: Optional[dict] = None
+    stats: Optional[QuestionStatsSummary] = None
+
+    class Config:
+        from_attributes = True
+
+
+class MockPaperResponse(BaseModel):
+    """A generated paper with its questions in paper order."""
+    id: uuid.UUID
+    created_at: datetime
+    total_marks: float
+    composition: dict[str, int]  # Questions per section
+    questions: list[PaperQuestionItem]  # Graded server-side: no answers until submission
+
+
+class PaperSubmissionRequest(BaseModel):
+    """Answers keyed by question ID: "B" (MCQ), "A;C" (MSQ) or a number (NAT). Omit unanswered questions."""
+    answers: dict[str, Union[float, str]]
+    time_taken_seconds: int = Field(default=0, ge=0)
+
+
+class QuestionGrade(BaseModel):
+    question_id: str
+    status: str  # correct, wrong or unanswered
+    awarded: float
+
+
+class PaperGradeResponse(BaseModel):
+    """Server-side grade of a paper submission."""
+    submission_id: uuid.UUID
+    paper_id: str
+    score: float
+    max_score: float
+    correct: int
+    wrong: int
+    unanswered: int
+    percentile: Optional[float] = None  # Among all submissions for the paper, this one included
+    rank: Optional[int] = None
+    questions: list[QuestionGrade]
+
+
+class ScorePercentile(BaseModel):
+    """Where a score sits in a paper's score distribution."""
+    paper_id: str
+    score: float
+    percentile: Optional[float] = None  # None until the paper has submissions
+    rank: Optional[int] = None
+    total_submissions: int
@@ -0,0 +1,283 @@
+"""
+Mock paper and grading service.
+
+Keeps a process-wide QuestionIndex (built from one narrow query over the
+questions table and refreshed after paper_index_ttl_seconds), samples a
+whole paper from it in memory, stores the paper and returns its questions
+via a single batch fetch. Submissions for official ("GATE_AE_2019") or mock
+papers are graded against answer keys compiled once per paper
+(app.domains.papers.grading) and recorded as attempts.
+"""
+import asyncio
+import random
+import re
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import on_invalidate
+from app.core.config import settings
+from app.domains.papers.generator import IndexedQuestion, QuestionIndex, difficulty_band, syllabus_section
+from app.domains.papers.grading import (
+    CORRECT,
+    STATUS_NAMES,
+    UNANSWERED,
+    WRONG,
+    PaperKey,
+    answer_keys,
+    compile_key,
+    encode_responses,
+    grade,
+)
+from app.domains.papers.histograms import ScoreHistogramRepository, percentile_and_rank
+from app.domains.papers.models import MockPaper, PaperSubmission
+from app.domains.papers.schemas import (
+    MockPaperRequest,
+    MockPaperResponse,
+    PaperGradeResponse,
+    PaperQuestionItem,
+    PaperSubmissionRequest,
+    QuestionGrade,
+    ScorePercentile,
+)
+from app.domains.progress.service import TOPIC_SQL
+from app.domains.questions.models import Question, UserAttempt
+from app.domains.questions.service import QUESTIONS_CHANGED, QuestionService
+
+# Official papers are addressed by their question ID prefix, e.g. GATE_AE_2019
+OFFICIAL_PAPER_ID = re.compile(r"^GATE_[A-Z]+_\d{4}$")
+
+_index: Optional[QuestionIndex] = None
+_index_lock = asyncio.Lock()
+
+
+@on_invalidate(QUESTIONS_CHANGED)
+def _drop_question_index() -> None:
+    """Drop the cached index and answer keys when questions change."""
+    global _index
+    _index = None
+    answer_keys.clear()
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class PaperService:
+    """Generates, loads and grades papers."""
+
+    INDEX_SQL = text(f"""
+        SELECT q.id, q.year, q.subject, q.question_type, q.marks,
+               q.tier_1_core_research -> 'hierarchical_tags' -> 'subject' ->> 'name',
+               {TOPIC_SQL},
+               q.irt_difficulty,
+               q.tier_0_classification ->> 'difficulty_score'
+        FROM questions q
+    """)
+
+    ATTEMPTED_SQL = text("""
+        SELECT question_id FROM user_attempts WHERE user_id = :user_id
+        UNION
+        SELECT question_id FROM user_archived_questions WHERE user_id = :user_id
+    """)
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.questions = QuestionService(session)
+        self.histograms = ScoreHistogramRepository(session)
+
+    async def _load_index(self) -> QuestionIndex:
+        rows = (await self.session.execute(self.INDEX_SQL)).all()
+        return QuestionIndex([
+            IndexedQuestion(
+                id=qid,
+                year=year,
+                section=syllabus_section(subject_tag, subject),
+                topic=topic,
+                band=difficulty_band(irt, _to_float(score)),
+                question_type=question_type,
+                marks=marks,
+            )
+            for qid, year, subject, question_type, marks, subject_tag, topic, irt, score in rows
+        ])
+
+    async def get_index(self) -> QuestionIndex:
+        """The cached index, rebuilt when missing or older than the configured TTL."""
+        global _index
+        max_age = timedelta(seconds=settings.paper_index_ttl_seconds)
+        if _index is not None and datetime.utcnow() - _index.built_at < max_age:
+            return _index
+        async with _index_lock:
+            if _index is None or datetime.utcnow() - _index.built_at >= max_age:
+                _index = await self._load_index()
+            return _index
+
+    async def generate(self, user_id: int, request: MockPaperRequest) -> MockPaperResponse:
+        """Sample, store and return a mock paper. Raises ValueError if nothing matches."""
+        index = await self.get_index()
+        exclude = set()
+        if request.exclude_attempted:
+            exclude = set((await self.session.execute(self.ATTEMPTED_SQL, {"user_id": user_id})).scalars())
+
+        picked = index.sample(
+            request.num_questions,
+            section_weights=request.section_weights,
+            difficulty_mix=request.difficulty_mix,
+            year_from=request.year_from,
+            year_to=request.year_to,
+            question_types=request.question_types,
+            exclude=exclude,
+            rng=random.Random(request.seed),
+        )
+        if not picked:
+            raise ValueError("No questions match the requested paper")
+
+        paper = MockPaper(
+            user_id=user_id,
+            question_ids=[q.id for q in picked],
+            config=request.model_dump(),
+        )
+        self.session.add(paper)
+        await self.session.commit()
+        return await self._to_response(paper, picked)
+
+    async def get_paper(self, user_id: int, paper_id: uuid.UUID) -> Optional[MockPaperResponse]:
+        """Load one of the user's papers with its questions, or None."""
+        paper = (await self.session.execute(
+            select(MockPaper).where(MockPaper.id == paper_id, MockPaper.user_id == user_id)
+        )).scalar_one_or_none()
+        if paper is None:
+            return None
+        return await self._to_response(paper)
+
+    async def _to_response(self, paper: MockPaper, picked: Optional[list[IndexedQuestion]] = None) -> MockPaperResponse:
+        items = await self.questions.get_list_items(paper.question_ids)
+        if picked is not None:
+            composition = Counter(q.section for q in picked)
+        else:
+            index = await self.get_index()
+            composition = Counter(index.section_of(item.id) for item in items)
+        return MockPaperResponse(
+            id=paper.id,
+            created_at=paper.created_at,
+            total_marks=sum(item.marks for item in items),
+            composition=dict(composition),
+            questions=[PaperQuestionItem.model_validate(item) for item in items],
+        )
+
+    async def load_key(self, paper_id: str, user_id: Optional[int] = None) -> Optional[PaperKey]:
+        """
+        Compiled answer keys for an official or mock paper (cached), or None if the paper is unknown.
+        With a user_id, mock papers belonging to someone else are treated as unknown.
+        """
+        cached = answer_keys.get(paper_id)
+        if cached is not None:
+            owner_id, key = cached
+            return key if user_id is None or owner_id in (None, user_id) else None
+        columns = (Question.id, Question.question_id, Question.question_type,
+                   Question.answer_key, Question.marks, Question.negative_marks)
+        owner_id = None
+        if OFFICIAL_PAPER_ID.match(paper_id):
+            questions = (await self.session.execute(
+                select(*columns)
+                .where(Question.question_id.startswith(f"{paper_id}_", autoescape=True))
+                .order_by(Question.question_number)
+            )).all()
+        else:
+            try:
+                mock_id = uuid.UUID(paper_id)
+            except ValueError:
+                return None
+            paper = (await self.session.execute(
+                select(MockPaper.user_id, MockPaper.question_ids).where(MockPaper.id == mock_id)
+            )).first()
+            if paper is None or (user_id is not None and paper.user_id != user_id):
+                return None
+            owner_id, question_ids = paper
+            rows = {row.id: row for row in (await self.session.execute(
+                select(*columns).where(Question.id.in_(question_ids))
+            )).all()}
+            questions = [rows[qid] for qid in question_ids if qid in rows]
+        if not questions:
+            return None
+        key = compile_key(questions)
+        answer_keys.set(paper_id, (owner_id, key))
+        return key
+
+    async def score_percentile(self, paper_id: str, score: float) -> ScorePercentile:
+        """Percentile and rank of a score from the paper's histogram (no submission scan)."""
+        histogram = await self.histograms.get(paper_id)
+        percentile, rank = percentile_and_rank(histogram, score) if histogram else (None, None)
+        return ScorePercentile(
+            paper_id=paper_id,
+            score=score,
+            percentile=percentile,
+            rank=rank,
+            total_submissions=histogram.total if histogram else 0,
+        )
+
+    async def submit(self, user_id: int, paper_id: str, request: PaperSubmissionRequest) -> Optional[PaperGradeResponse]:
+        """
+        Grade a submission, store it, add it to the paper's score histogram and
+        record every answered question as an attempt (time split evenly across
+        them). Returns None if the paper is unknown or is another user's mock paper.
+        """
+        key = await self.load_key(paper_id, user_id)
+        if key is None:
+            return None
+        masks, values = encode_responses(key, [request.answers])
+        result = grade(key, masks[0], values[0])
+        counts = {code: int((result.status == code).sum()) for code in (CORRECT, WRONG, UNANSWERED)}
+
+        submission = PaperSubmission(
+            user_id=user_id,
+            paper_id=paper_id,
+            score=round(float(result.total), 2),
+            max_score=key.max_score,
+            correct=counts[CORRECT],
+            wrong=counts[WRONG],
+            unanswered=counts[UNANSWERED],
+            time_taken_seconds=request.time_taken_seconds,
+            responses=request.answers,
+        )
+        self.session.add(submission)
+        now = datetime.utcnow()
+        histogram = await self.histograms.record(paper_id, key, submission.score, now)
+        percentile, rank = percentile_and_rank(histogram, submission.score)
+
+        answered = [i for i, status in enumerate(result.status.tolist()) if status != UNANSWERED]
+        per_question = request.time_taken_seconds // len(answered) if answered else 0
+        # store_attempts commits the submission and histogram update together with the attempts
+        await self.questions.store_attempts([
+            UserAttempt(
+                user_id=user_id,
+                question_id=key.question_uuids[i],
+                is_correct=bool(result.status[i] == CORRECT),
+                time_taken_seconds=per_question,
+                attempted_at=now,
+            )
+            for i in answered
+        ])
+
+        return PaperGradeResponse(
+            submission_id=submission.id,
+            paper_id=paper_id,
+            score=submission.score,
+            max_score=submission.max_score,
+            correct=submission.correct,
+            wrong=submission.wrong,
+            unanswered=submission.unanswered,
+            percentile=percentile,
+            rank=rank,
+            questions=[
+                QuestionGrade(question_id=question_id, status=STATUS_NAMES[status], awarded=round(awarded, 2))
+                for question_id, status, awarded in zip(key.question_ids, result.status.tolist(), result.awarded.tolist())
+            ],
+        )
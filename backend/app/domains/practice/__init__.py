@@ -0,0 +1 @@
+"""Practice recommendation domain package."""
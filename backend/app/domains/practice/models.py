@@ -0,0 +1,18 @@
+"""Precomputed per-user practice queues."""
+import uuid
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import Column
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlmodel import Field, SQLModel
+
+
+class UserPracticeQueue(SQLModel, table=True):
+    """Ranked, not-yet-attempted question IDs for a user; the head is the next recommendation."""
+    __tablename__ = "user_practice_queues"
+
+    user_id: int = Field(primary_key=True)
+    question_ids: List[uuid.UUID] = Field(default_factory=list, sa_column=Column(ARRAY(UUID(as_uuid=True)), nullable=False))
+    attempts_since_refresh: int = Field(default=0)
+    refreshed_at: datetime = Field(default_factory=datetime.utcnow)
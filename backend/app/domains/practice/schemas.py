@@ -0,0 +1,13 @@
+"""Pydantic schemas for practice recommendations."""
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.domains.questions.schemas import QuestionListItem
+
+
+class PracticeRecommendation(BaseModel):
+    """The next question to practice and why it was picked."""
+    question: QuestionListItem
+    topic_accuracy: Optional[float] = None  # User's accuracy % on the question's topic, if attempted before
+    remaining: int  # Questions left in the precomputed queue
@@ -0,0 +1,200 @@
+"""
+Practice recommendation service.
+
+Each user has a precomputed queue of unattempted question IDs ranked by
+topic weakness (from user_topic_progress) and how close the question's
+difficulty is to the user's level. Serving a recommendation reads the queue
+head by primary key; recording attempts only trims the queue. The ranking
+query runs once the queue has gone stale, or has run low and was last built
+more than a cooldown ago (so an exhausted queue is not re-ranked on every
+request). A stale queue that still has questions keeps being served while it
+is re-ranked in a background task; only a missing or empty queue is ranked on
+the request path, since there is nothing to serve until it is.
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.progress.service import TOPIC_SQL
+
+
+class PracticeService:
+    """Builds, trims and serves per-user practice queues."""
+
+    QUEUE_SIZE = 50
+    LOW_WATER = 10          # Rebuild once fewer than this many candidates remain
+    REFRESH_EVERY = 10      # Re-rank after this many attempts (topic accuracy has moved)
+    TARGET_ACCURACY = 0.7   # Prefer questions the user should get right ~70% of the time
+    REBUILD_COOLDOWN = timedelta(minutes=10)  # A low or empty queue is re-ranked at most this often
+
+    # Difficulty falls back from the IRT calibration to the tier_0 1-10 score mapped
+    # onto the ability scale; ability falls back to 0 (average) before calibration.
+    # Untried topics count as 50% accuracy so they get explored.
+    BUILD_SQL = text(f"""
+        WITH topics AS (
+            SELECT topic, (correct + 1.0) / (total + 2.0) AS accuracy
+            FROM user_topic_progress
+            WHERE user_id = :user_id
+        ),
+        ability AS (
+            SELECT coalesce((SELECT ability FROM user_abilities WHERE user_id = :user_id), 0.0) AS theta
+        ),
+        candidates AS (
+            SELECT q.id,
+                   {TOPIC_SQL} AS topic,
+                   coalesce(
+                       q.irt_difficulty,
+                       (CAST(q.tier_0_classification ->> 'difficulty_score' AS float) - 5.5) / 2.0,
+                       0.0
+                   ) AS difficulty,
+                   coalesce(q.irt_discrimination, 1.0) AS discrimination
+            FROM questions q
+            WHERE NOT EXISTS (
+                SELECT 1 FROM user_attempts a WHERE a.user_id = :user_id AND a.question_id = q.id
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM user_archived_questions h WHERE h.user_id = :user_id AND h.question_id = q.id
+            )
+        ),
+        ranked AS (
+            SELECT c.id,
+                   :topic_weight * (1.0 - coalesce(t.accuracy, 0.5))
+                   + :fit_weight * (1.0 - abs(
+                       1.0 / (1.0 + exp(-c.discrimination * (ability.theta - c.difficulty))) - :target
+                   ))
+                   + 0.05 * random() AS score
+            FROM candidates c
+            CROSS JOIN ability
+            LEFT JOIN topics t ON t.topic = c.topic
+            ORDER BY score DESC
+            LIMIT :size
+        )
+        INSERT INTO user_practice_queues (user_id, question_ids, attempts_since_refresh, refreshed_at)
+        SELECT :user_id, coalesce(array_agg(id ORDER BY score DESC), CAST('{{}}' AS uuid[])), 0, :now
+        FROM ranked
+        ON CONFLICT (user_id) DO UPDATE SET
+            question_ids = EXCLUDED.question_ids,
+            attempts_since_refresh = 0,
+            refreshed_at = EXCLUDED.refreshed_at
+        RETURNING question_ids[1], cardinality(question_ids)
+    """)
+
+    # Drop attempted questions from the queue, keeping the ranking order
+    TRIM_SQL = text("""
+        UPDATE user_practice_queues SET
+            question_ids = ARRAY(
+                SELECT q FROM unnest(question_ids) WITH ORDINALITY AS t(q, n)
+                WHERE q <> ALL(CAST(:attempted AS uuid[]))
+                ORDER BY n
+            ),
+            attempts_since_refresh = attempts_since_refresh + :count
+        WHERE user_id = :user_id
+    """)
+
+    # Head, length, and whether the queue should be re-ranked before serving it
+    PEEK_SQL = text("""
+        SELECT question_ids[1], cardinality(question_ids),
+               attempts_since_refresh >= :refresh_every
+               OR (cardinality(question_ids) < :low_water AND refreshed_at < :cooldown_start)
+        FROM user_practice_queues WHERE user_id = :user_id
+    """)
+
+    # Move the head to the back of the queue
+    SKIP_SQL = text("""
+        UPDATE user_practice_queues
+        SET question_ids = question_ids[2:] || question_ids[1:1]
+        WHERE user_id = :user_id
+        RETURNING question_ids[1], cardinality(question_ids)
+    """)
+
+    def __init__(self, session: AsyncSession, schedule_rebuild: Optional[Callable[[int], None]] = None):
+        """
+        schedule_rebuild(user_id) queues a background re-rank of a stale queue
+        (see rebuild_in_background); without it stale queues are re-ranked inline.
+        """
+        self.session = session
+        self.schedule_rebuild = schedule_rebuild
+
+    async def rebuild(self, user_id: int) -> tuple[Optional[uuid.UUID], int]:
+        """Rank candidates for a user and store the queue. Returns (head, length)."""
+        row = (await self.session.execute(self.BUILD_SQL, {
+            "user_id": user_id,
+            "topic_weight": 1.0,
+            "fit_weight": 1.0,
+            "target": self.TARGET_ACCURACY,
+            "size": self.QUEUE_SIZE,
+            "now": datetime.utcnow(),
+        })).one()
+        return row[0], row[1]
+
+    async def next_question(self, user_id: int) -> tuple[Optional[uuid.UUID], int]:
+        """
+        Head of the user's queue. A missing queue is built first; a stale one is
+        re-ranked in the background while its current head is served, or inline
+        when it is empty or no scheduler was given.
+        Returns (question UUID or None, remaining); an exhausted queue returns (None, 0)
+        without re-ranking until REBUILD_COOLDOWN has passed since it was built.
+        """
+        row = (await self.session.execute(self.PEEK_SQL, {
+            "user_id": user_id,
+            "refresh_every": self.REFRESH_EVERY,
+            "low_water": self.LOW_WATER,
+            "cooldown_start": datetime.utcnow() - self.REBUILD_COOLDOWN,
+        })).first()
+        if row is None:
+            return await self.rebuild(user_id)
+        head, remaining, stale = row
+        if stale:
+            if self.schedule_rebuild is None or remaining == 0:
+                return await self.rebuild(user_id)
+            self.schedule_rebuild(user_id)
+        return head, remaining
+
+    async def skip(self, user_id: int) -> tuple[Optional[uuid.UUID], int]:
+        """Send the current recommendation to the back of the queue and return the new head."""
+        head, remaining = await self.next_question(user_id)
+        if remaining < 2:
+            return head, remaining
+        row = (await self.session.execute(self.SKIP_SQL, {"user_id": user_id})).one()
+        return row[0], row[1]
+
+    async def on_attempts(self, user_id: int, question_ids: list[uuid.UUID]) -> None:
+        """
+        Trim newly attempted questions from the user's queue and count them towards
+        the next re-rank. Call after the attempts are inserted, inside the same
+        transaction; the ranking query itself is left to the next next_question().
+        Users without a queue are skipped; theirs is built on first request.
+        """
+        await self.session.execute(self.TRIM_SQL, {
+            "user_id": user_id,
+            "attempted": list(set(question_ids)),
+            "count": len(question_ids),
+        })
+
+
+# Users whose queue is being re-ranked in this process, so concurrent requests schedule it once
+_rebuilding: set[int] = set()
+
+
+async def rebuild_in_background(session_factory: Callable[[], AsyncSession], user_id: int) -> bool:
+    """
+    Re-rank a user's queue in its own session and commit. Meant for FastAPI
+    BackgroundTasks; failures are logged, and the queue stays stale so the next
+    request schedules another try. Returns False if a rebuild was already running.
+    """
+    if user_id in _rebuilding:
+        return False
+    _rebuilding.add(user_id)
+    try:
+        async with session_factory() as session:
+            await PracticeService(session).rebuild(user_id)
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"Background practice queue rebuild failed for user {user_id}: {e}")
+    finally:
+        _rebuilding.discard(user_id)
+    return True
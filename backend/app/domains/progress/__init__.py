@@ -0,0 +1 @@
+"""Progress rollup domain package."""
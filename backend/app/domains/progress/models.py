@@ -0,0 +1,38 @@
+"""Progress rollup models maintained incrementally from user attempts."""
+from datetime import date, datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class UserProgress(SQLModel, table=True):
+    """Per-user dashboard totals, updated in the same transaction as each attempt."""
+    __tablename__ = "user_progress"
+
+    user_id: int = Field(primary_key=True)
+    questions_attempted: int = Field(default=0, description="Distinct questions attempted")
+    total_seconds: int = Field(default=0)
+    current_streak: int = Field(default=0, description="Run of consecutive days ending at last_activity_date")
+    longest_streak: int = Field(default=0)
+    last_activity_date: Optional[date] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class UserTopicProgress(SQLModel, table=True):
+    """Per-user, per-topic attempt counts for the topic heatmap."""
+    __tablename__ = "user_topic_progress"
+
+    user_id: int = Field(primary_key=True)
+    topic: str = Field(primary_key=True)
+    correct: int = Field(default=0)
+    total: int = Field(default=0)
+
+
+class UserAbility(SQLModel, table=True):
+    """Per-user IRT ability estimate, written by the calibration job."""
+    __tablename__ = "user_abilities"
+
+    user_id: int = Field(primary_key=True)
+    ability: float = Field(description="Theta on the N(0, 1) scale shared with questions.irt_difficulty")
+    responses: int = Field(default=0, description="Questions answered in the calibration data")
+    calibrated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,228 @@
+"""
+Progress rollup service.
+Keeps user_progress / user_topic_progress in step with user_attempts so the
+dashboard reads a handful of primary-key rows instead of scanning history.
+"""
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.questions.models import UserAttempt
+from .models import UserProgress, UserTopicProgress
+
+# Topic label used for the heatmap, read from the question's tier_1 tags
+TOPIC_SQL = "coalesce(nullif(q.tier_1_core_research -> 'hierarchical_tags' -> 'topic' ->> 'name', ''), 'General')"
+
+
+def _day_runs(days: list[date]) -> tuple[date, int, int]:
+    """
+    For a batch's activity days return (run_end, run_length, longest_run):
+    the consecutive run ending at the latest day, and the longest run in the batch.
+    """
+    ordered = sorted(set(days))
+    longest = current = 1
+    for prev, day in zip(ordered, ordered[1:]):
+        current = current + 1 if day - prev == timedelta(days=1) else 1
+        longest = max(longest, current)
+    return ordered[-1], current, longest
+
+
+class ProgressService:
+    """Service for incrementally maintained progress rollups."""
+
+    # Distinct-question count must be taken before the batch's attempts are inserted;
+    # questions archived out of user_attempts count as seen (user_archived_questions).
+    # Streak merge, with the batch's trailing run [run_start, run_end]:
+    #   last activity before run_start - 1 -> streak restarts at run_length
+    #   last activity inside the run       -> existing streak extends to run_end
+    #   last activity at/after run_end     -> unchanged (late, out-of-order batch)
+    UPSERT_PROGRESS_SQL = text("""
+        INSERT INTO user_progress AS p (
+            user_id, questions_attempted, total_seconds,
+            current_streak, longest_streak, last_activity_date, updated_at
+        )
+        SELECT
+            :user_id,
+            (
+                SELECT count(*) FROM unnest(CAST(:question_ids AS uuid[])) AS b(question_id)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM user_attempts a
+                    WHERE a.user_id = :user_id AND a.question_id = b.question_id
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM user_archived_questions h
+                    WHERE h.user_id = :user_id AND h.question_id = b.question_id
+                )
+            ),
+            :seconds, :run_length, :run_longest, :run_end, now() at time zone 'utc'
+        ON CONFLICT (user_id) DO UPDATE SET
+            questions_attempted = p.questions_attempted + EXCLUDED.questions_attempted,
+            total_seconds = p.total_seconds + EXCLUDED.total_seconds,
+            current_streak = CASE
+                WHEN p.last_activity_date IS NULL
+                     OR p.last_activity_date < CAST(:run_end AS date) - CAST(:run_length AS int) THEN EXCLUDED.current_streak
+                WHEN p.last_activity_date < EXCLUDED.last_activity_date
+                     THEN p.current_streak + (EXCLUDED.last_activity_date - p.last_activity_date)
+                ELSE p.current_streak
+            END,
+            longest_streak = GREATEST(
+                p.longest_streak,
+                EXCLUDED.longest_streak,
+                CASE
+                    WHEN p.last_activity_date IS NULL
+                         OR p.last_activity_date < CAST(:run_end AS date) - CAST(:run_length AS int) THEN EXCLUDED.current_streak
+                    WHEN p.last_activity_date < EXCLUDED.last_activity_date
+                         THEN p.current_streak + (EXCLUDED.last_activity_date - p.last_activity_date)
+                    ELSE p.current_streak
+                END
+            ),
+            last_activity_date = GREATEST(p.last_activity_date, EXCLUDED.last_activity_date),
+            updated_at = EXCLUDED.updated_at
+    """)
+
+    UPSERT_TOPICS_SQL = text(f"""
+        INSERT INTO user_topic_progress AS t (user_id, topic, correct, total)
+        SELECT :user_id, {TOPIC_SQL}, sum(b.correct), sum(b.total)
+        FROM unnest(
+            CAST(:question_ids AS uuid[]), CAST(:corrects AS int[]), CAST(:totals AS int[])
+        ) AS b(question_id, correct, total)
+        JOIN questions q ON q.id = b.question_id
+        GROUP BY 2
+        ON CONFLICT (user_id, topic) DO UPDATE SET
+            correct = t.correct + EXCLUDED.correct,
+            total = t.total + EXCLUDED.total
+    """)
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply_attempts(self, user_id: int, attempts: list[UserAttempt]) -> None:
+        """
+        Fold a batch of new attempts into the user's rollups.
+        Call before the attempts are flushed, inside the same transaction.
+        The first time a user gets a rollup row, it is backfilled from their
+        existing history (attempts predating rollups) before the batch is added.
+        """
+        if not attempts:
+            return
+        if await self.session.get(UserProgress, user_id) is None:
+            await self.rebuild(user_id)
+
+        per_question: dict = {}
+        for attempt in attempts:
+            counts = per_question.setdefault(attempt.question_id, [0, 0])
+            counts[0] += 1 if attempt.is_correct else 0
+            counts[1] += 1
+        question_ids = list(per_question)
+
+        run_end, run_length, run_longest = _day_runs([a.attempted_at.date() for a in attempts])
+        await self.session.execute(self.UPSERT_PROGRESS_SQL, {
+            "user_id": user_id,
+            "question_ids": question_ids,
+            "seconds": sum(a.time_taken_seconds for a in attempts),
+            "run_end": run_end,
+            "run_length": run_length,
+            "run_longest": run_longest,
+        })
+        await self.session.execute(self.UPSERT_TOPICS_SQL, {
+            "user_id": user_id,
+            "question_ids": question_ids,
+            "corrects": [per_question[q][0] for q in question_ids],
+            "totals": [per_question[q][1] for q in question_ids],
+        })
+
+    async def get_progress(self, user_id: int) -> tuple[Optional[UserProgress], dict[str, tuple[int, int]]]:
+        """Read a user's rollup row and topic counts ({topic: (correct, total)}) by primary key."""
+        progress = await self.session.get(UserProgress, user_id)
+        if progress is None:
+            return None, {}
+        result = await self.session.execute(
+            select(UserTopicProgress.topic, UserTopicProgress.correct, UserTopicProgress.total)
+            .where(UserTopicProgress.user_id == user_id)
+        )
+        return progress, {topic: (correct, total) for topic, correct, total in result.all()}
+
+    @staticmethod
+    def current_streak(progress: UserProgress, today: date) -> int:
+        """The stored streak only counts while the user was active today or yesterday."""
+        if progress.last_activity_date and progress.last_activity_date >= today - timedelta(days=1):
+            return progress.current_streak
+        return 0
+
+    async def rebuild(self, user_id: Optional[int] = None) -> int:
+        """
+        Recompute rollups from user_attempts history, for one user or everyone.
+        Archived months count too: days (user_attempt_daily_summaries) toward
+        streaks and study time, questions (user_archived_questions) toward
+        distinct questions and topic accuracy.
+        Returns the number of user_progress rows written.
+        """
+        user_filter = "WHERE user_id = :user_id" if user_id is not None else ""
+        params = {"user_id": user_id} if user_id is not None else {}
+
+        await self.session.execute(text(f"DELETE FROM user_topic_progress {user_filter}"), params)
+        await self.session.execute(text(f"DELETE FROM user_progress {user_filter}"), params)
+
+        result = await self.session.execute(text(f"""
+            WITH days AS (
+                SELECT user_id, CAST(attempted_at AS date) AS day FROM user_attempts {user_filter}
+                UNION
+                SELECT user_id, day FROM user_attempt_daily_summaries {user_filter}
+            ),
+            islands AS (
+                SELECT user_id, min(day) AS run_start, max(day) AS run_end, count(*) AS run_length
+                FROM (
+                    SELECT user_id, day,
+                           day - CAST(row_number() OVER (PARTITION BY user_id ORDER BY day) AS int) AS anchor
+                    FROM days
+                ) d
+                GROUP BY user_id, anchor
+            ),
+            streaks AS (
+                SELECT user_id,
+                       max(run_length) AS longest_streak,
+                       max(run_end) AS last_activity_date,
+                       (array_agg(run_length ORDER BY run_end DESC))[1] AS current_streak
+                FROM islands
+                GROUP BY user_id
+            ),
+            totals AS (
+                SELECT user_id, count(DISTINCT question_id) AS questions_attempted,
+                       coalesce(sum(seconds), 0) AS total_seconds
+                FROM (
+                    SELECT user_id, question_id, time_taken_seconds AS seconds
+                    FROM user_attempts {user_filter}
+                    UNION ALL
+                    SELECT user_id, question_id, 0 FROM user_archived_questions {user_filter}
+                    UNION ALL
+                    SELECT user_id, NULL, total_seconds FROM user_attempt_daily_summaries {user_filter}
+                ) t
+                GROUP BY user_id
+            )
+            INSERT INTO user_progress (
+                user_id, questions_attempted, total_seconds,
+                current_streak, longest_streak, last_activity_date, updated_at
+            )
+            SELECT t.user_id, t.questions_attempted, t.total_seconds,
+                   s.current_streak, s.longest_streak, s.last_activity_date, now() at time zone 'utc'
+            FROM totals t JOIN streaks s USING (user_id)
+        """), params)
+        written = result.rowcount
+
+        await self.session.execute(text(f"""
+            INSERT INTO user_topic_progress (user_id, topic, correct, total)
+            SELECT a.user_id, {TOPIC_SQL}, sum(a.correct), sum(a.total)
+            FROM (
+                SELECT user_id, question_id,
+                       count(*) FILTER (WHERE is_correct) AS correct, count(*) AS total
+                FROM user_attempts {user_filter}
+                GROUP BY user_id, question_id
+                UNION ALL
+                SELECT user_id, question_id, correct, attempts FROM user_archived_questions {user_filter}
+            ) a
+            JOIN questions q ON q.id = a.question_id
+            GROUP BY 1, 2
+        """), params)
+        return written
@@ -0,0 +1,293 @@
+"""
+Write-behind buffer for practice-mode attempts.
+
+Attempts are queued in memory and written to user_attempts in multi-row
+batches every flush interval or once enough records are waiting. On
+long-lived containers the queue can be mirrored to a local JSONL spool so
+queued attempts survive a crash; the spool is replayed on start and
+compacted after every successful flush.
+
+A batch that keeps failing for a non-transient reason (a bad row, not a
+lost connection) is split in half after max_retries attempts until the
+offending record is isolated; that record is then moved to a dead-letter
+list (and a ".dead" JSONL file next to the spool) instead of blocking the
+queue forever.
+
+Disabled by default: on Lambda the process may be frozen between requests,
+so attempts are written synchronously there.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from loguru import logger
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domains.questions.models import UserAttempt
+from app.domains.questions.service import QuestionService
+
+
+class BufferedAttempt(NamedTuple):
+    """An attempt waiting to be written; attempted_at is the submission time."""
+    user_id: int
+    question_id: str
+    is_correct: bool
+    time_taken_seconds: int
+    attempted_at: datetime
+
+    def to_json(self) -> str:
+        return json.dumps({**self._asdict(), "attempted_at": self.attempted_at.isoformat()})
+
+    @classmethod
+    def from_json(cls, line: str) -> "BufferedAttempt":
+        data = json.loads(line)
+        data["attempted_at"] = datetime.fromisoformat(data["attempted_at"])
+        return cls(**data)
+
+
+class AttemptBuffer:
+    """Bounded in-process queue of attempts with a periodic background flush."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_size: int = 10000,
+        flush_interval_ms: int = 500,
+        flush_records: int = 200,
+        spool_path: Optional[str] = None,
+        max_retries: int = 3,
+    ):
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_records = flush_records
+        self.spool_path = Path(spool_path) if spool_path else None
+        self.max_retries = max_retries
+
+        self._queue: deque[BufferedAttempt] = deque()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._spool = None
+        self._batch_limit = flush_records  # Shrinks while bisecting a failing batch
+        self._suspect = 0                  # Head records still inside the span that failed
+        self._failures = 0                 # Consecutive failures of the current head batch
+        self.dead_letter: list[BufferedAttempt] = []
+
+        # Metrics
+        self.submitted = 0
+        self.flushed = 0
+        self.dropped = 0      # refused because the queue was full
+        self.invalid = 0      # discarded at flush time: unknown question ID
+        self.flush_count = 0
+        self.flush_errors = 0
+        self.dead_lettered = 0  # isolated records that failed max_retries times on their own
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def submit(self, user_id: int, question_id: str, is_correct: bool, time_taken_seconds: int) -> bool:
+        """
+        Queue an attempt. Returns False when the buffer is full or not running;
+        the caller should then record the attempt synchronously.
+        """
+        if self._task is None or self._stopping or len(self._queue) >= self.max_size:
+            self.dropped += 1
+            return False
+
+        record = BufferedAttempt(user_id, question_id, is_correct, time_taken_seconds, datetime.utcnow())
+        if self._spool is not None:
+            self._spool.write(record.to_json() + "\n")
+            self._spool.flush()
+        self._queue.append(record)
+        self.submitted += 1
+        if len(self._queue) >= self.flush_records:
+            self._wakeup.set()
+        return True
+
+    async def start(self) -> None:
+        """Replay any spooled attempts and start the background flusher."""
+        if self._task is not None:
+            return
+        if self.spool_path is not None:
+            replayed = self._replay_spool()
+            if replayed:
+                logger.info(f"Replayed {replayed} spooled attempts from {self.spool_path}")
+            self._spool = open(self.spool_path, "a")
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop accepting attempts and drain the queue."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        if self._queue:
+            logger.warning(f"Attempt buffer stopped with {len(self._queue)} attempts unflushed")
+
+    async def flush(self) -> int:
+        """Write up to flush_records queued attempts. Returns the number written."""
+        async with self._flush_lock:
+            if not self._queue:
+                return 0
+            batch = [self._queue.popleft() for _ in range(min(self._batch_limit, len(self._queue)))]
+            started = time.perf_counter()
+            try:
+                written = await self._write(batch)
+            except Exception as e:
+                # Put the batch back in order and retry on the next tick
+                self._queue.extendleft(reversed(batch))
+                self.flush_errors += 1
+                logger.error(f"Attempt buffer flush failed ({len(batch)} attempts requeued): {e}")
+                if not self._is_transient(e):
+                    self._on_batch_failure(batch)
+                raise
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flush_count += 1
+            self.flushed += written
+            self.invalid += len(batch) - written
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+            self._failures = 0
+            self._suspect = max(0, self._suspect - len(batch))
+            if not self._suspect:
+                self._batch_limit = self.flush_records
+            self._compact_spool()
+            return written
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """Connection-level failures are retried as-is; anything else may be a bad record."""
+        if isinstance(error, (OperationalError, InterfaceError, OSError)):
+            return True
+        return isinstance(error, DBAPIError) and error.connection_invalidated
+
+    def _on_batch_failure(self, batch: list[BufferedAttempt]) -> None:
+        """Bisect a batch that failed max_retries times; dead-letter it once it is a single record."""
+        self._failures += 1
+        if self._failures < self.max_retries:
+            return
+        self._failures = 0
+        self._suspect = max(self._suspect, len(batch))
+        if len(batch) > 1:
+            self._batch_limit = len(batch) // 2
+            return
+        record = self._queue.popleft()
+        self._suspect -= 1
+        self.dead_letter.append(record)
+        self.dead_lettered += 1
+        logger.error(f"Attempt dead-lettered after {self.max_retries} failed flushes: {record.to_json()}")
+        if self.spool_path is not None:
+            with open(self.spool_path.with_suffix(".dead"), "a") as f:
+                f.write(record.to_json() + "\n")
+        self._compact_spool()
+
+    def stats(self) -> dict:
+        """Queue depth, throughput counters and flush latency."""
+        return {
+            "depth": len(self._queue),
+            "max_size": self.max_size,
+            "submitted": self.submitted,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "invalid": self.invalid,
+            "flush_count": self.flush_count,
+            "flush_errors": self.flush_errors,
+            "dead_lettered": self.dead_lettered,
+            "batch_limit": self._batch_limit,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.flush_count, 2) if self.flush_count else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                # Keep going while full batches are waiting, or until empty when draining
+                while self._queue and (self._stopping or len(self._queue) >= self.flush_records):
+                    await self.flush()
+            except Exception:
+                if self._stopping:
+                    return  # Unflushed attempts stay in the spool (if any) for the next start
+                continue
+            if self._stopping:
+                return
+
+    async def _write(self, batch: list[BufferedAttempt]) -> int:
+        """Write one batch through the shared batch path; unknown question IDs are discarded."""
+        async with self.session_factory() as session:
+            service = QuestionService(session)
+            resolved = await service.resolve_question_uuids(list({r.question_id for r in batch}))
+            attempts = [
+                UserAttempt(
+                    user_id=r.user_id,
+                    question_id=resolved[r.question_id],
+                    is_correct=r.is_correct,
+                    time_taken_seconds=r.time_taken_seconds,
+                    attempted_at=r.attempted_at,
+                )
+                for r in batch
+                if r.question_id in resolved
+            ]
+            if attempts:
+                await service.store_attempts(attempts)
+            return len(attempts)
+
+    def _replay_spool(self) -> int:
+        if not self.spool_path.exists():
+            return 0
+        replayed = 0
+        with open(self.spool_path) as f:
+            for line in f:
+                try:
+                    self._queue.append(BufferedAttempt.from_json(line))
+                    replayed += 1
+                except (ValueError, TypeError, KeyError):
+                    continue  # Torn last line from a crash mid-write
+        return replayed
+
+    def _compact_spool(self) -> None:
+        """Rewrite the spool to hold exactly the attempts still queued."""
+        if self._spool is None:
+            return
+        tmp_path = self.spool_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            f.writelines(r.to_json() + "\n" for r in self._queue)
+        self._spool.close()
+        os.replace(tmp_path, self.spool_path)
+        self._spool = open(self.spool_path, "a")
+
+
+# Process-wide buffer, created at startup when enabled
+attempt_buffer: Optional[AttemptBuffer] = None
+
+
+def get_attempt_buffer() -> Optional[AttemptBuffer]:
+    """Return the running attempt buffer, or None when write-behind is disabled."""
+    return attempt_buffer
@@ -0,0 +1,81 @@
+"""
+Per-question serialized response fragments.
+
+A full QuestionResponse is mostly tier JSON. Each question is serialized
+once into byte fragments: the object's scalar fields, the free tiers
+(0, 1, 4) and the premium tiers (2, 3). A response is then assembled by
+splicing the fragments the caller is entitled to, plus the live stats, with
+no model construction or tier re-serialization per request. Non-subscribers
+get the premium tiers as null, so the response shape is unchanged.
+
+Entries carry the row's updated_at and are rebuilt when it moves (imports,
+scripts/ingest_premium_data.py), so updates from other processes are
+picked up on the next read.
+"""
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from pydantic_core import to_json
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.domains.questions.models import Question
+from app.domains.questions.schemas import QuestionResponse
+from app.domains.questions.validation import get_adapter, question_response_from_row
+
+FREE_TIERS = ("tier_0_classification", "tier_1_core_research", "tier_4_metadata")
+PREMIUM_TIERS = ("tier_2_student_learning", "tier_3_enhanced_learning")
+TIER_FIELDS = FREE_TIERS + PREMIUM_TIERS
+
+_BASE_FIELDS = set(QuestionResponse.model_fields) - set(TIER_FIELDS) - {"stats"}
+_LOCKED = b"".join(b',"%s":null' % name.encode() for name in PREMIUM_TIERS)
+
+fragment_cache = TTLCache("question_fragments", settings.fragment_cache_size, settings.fragment_cache_ttl_seconds)
+
+
+class QuestionFragments(NamedTuple):
+    updated_at: datetime
+    base: bytes     # '{"id":...,"updated_at":"..."': the scalar fields, object left open
+    free: bytes     # ',"tier_0_classification":{...},...'
+    premium: bytes  # ',"tier_2_student_learning":{...},"tier_3_enhanced_learning":{...}'
+
+
+def _tiers(question: Question, names: tuple[str, ...]) -> bytes:
+    return b"".join(b',"%s":%s' % (name.encode(), to_json(getattr(question, name))) for name in names)
+
+
+def build_fragments(question: Question) -> QuestionFragments:
+    """Serialize a fully loaded question row into fragments."""
+    base = get_adapter(QuestionResponse).dump_json(
+        question_response_from_row(question), include=_BASE_FIELDS, warnings=False
+    )
+    return QuestionFragments(
+        updated_at=question.updated_at,
+        base=base[:-1],
+        free=_tiers(question, FREE_TIERS),
+        premium=_tiers(question, PREMIUM_TIERS),
+    )
+
+
+def cached_fragments(question_id, updated_at: datetime) -> Optional[QuestionFragments]:
+    """Fragments for a question if cached at this version."""
+    fragments = fragment_cache.get(question_id)
+    if fragments is None or fragments.updated_at != updated_at:
+        return None
+    return fragments
+
+
+def assemble(fragments: QuestionFragments, premium: bool, stats: Optional[dict]) -> bytes:
+    """One QuestionResponse JSON object, with premium tiers only for entitled callers."""
+    return b"".join((
+        fragments.base,
+        fragments.free,
+        fragments.premium if premium else _LOCKED,
+        b',"stats":',
+        to_json(stats),
+        b"}",
+    ))
+
+
+def assemble_list(items: list[bytes]) -> bytes:
+    return b"[" + b",".join(items) + b"]"
@@ -4,11 +4,11 @@ Stores the rich JSON data structure with PostgreSQL JSONB columns.
 """
 
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import Text, JSON
+from sqlalchemy import Text, JSON, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from pgvector.sqlalchemy import Vector
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 import uuid
 
 
@@ -55,6 +55,11 @@ class Question(SQLModel, table=True):
     search_content: Optional[str] = Field(default=None, sa_column=Column(Text))
     embedding: Optional[List[float]] = Field(default=None, sa_column=Column(Vector(384)))
     
+    # IRT parameters calibrated from attempts by scripts/calibrate_irt.py (NULL until enough data)
+    irt_difficulty: Optional[float] = Field(default=None, index=True)
+    irt_discrimination: Optional[float] = None
+    irt_calibrated_at: Optional[datetime] = None
+    
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -74,13 +79,66 @@ class Question(SQLModel, table=True):
 class UserAttempt(SQLModel, table=True):
     """
     Tracks a user's attempt at a question.
+    Production tables are range-partitioned by month on attempted_at
+    (see app/domains/questions/partitions.py).
     """
     __tablename__ = "user_attempts"
+    __table_args__ = (
+        # Dashboard reads filter by user and sort newest first
+        Index("ix_user_attempts_user_id_attempted_at", "user_id", text("attempted_at DESC")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(index=True)
+    user_id: int  # Covered by the (user_id, attempted_at) index
     question_id: uuid.UUID = Field(index=True)
     is_correct: bool = Field(default=False)
     time_taken_seconds: int = Field(default=0)
     attempted_at: datetime = Field(default_factory=datetime.utcnow)
 
+
+class QuestionStats(SQLModel, table=True):
+    """
+    Observed attempt statistics per question.
+    Counts are incremented with every recorded attempt; solve-time percentiles
+    are refreshed by scripts/refresh_question_stats.py.
+    """
+    __tablename__ = "question_stats"
+
+    question_id: uuid.UUID = Field(primary_key=True)
+    attempts: int = Field(default=0)
+    correct: int = Field(default=0)
+    total_seconds: int = Field(default=0)
+    p50_seconds: Optional[int] = None
+    p90_seconds: Optional[int] = None
+    percentiles_updated_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class UserAttemptDailySummary(SQLModel, table=True):
+    """
+    Per-user, per-day totals of attempts archived out of user_attempts.
+    Keeps streak and study-time history once raw attempts are dropped.
+    """
+    __tablename__ = "user_attempt_daily_summaries"
+
+    user_id: int = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    attempts: int = Field(default=0)
+    correct: int = Field(default=0)
+    distinct_questions: int = Field(default=0)
+    total_seconds: int = Field(default=0)
+
+
+class UserArchivedQuestion(SQLModel, table=True):
+    """
+    Per-user, per-question totals of attempts archived out of user_attempts.
+    Keeps "attempted before" / "solved before" checks and all-time counts
+    whole once raw attempts are dropped.
+    """
+    __tablename__ = "user_archived_questions"
+
+    user_id: int = Field(primary_key=True)
+    question_id: uuid.UUID = Field(primary_key=True)
+    attempts: int = Field(default=0)
+    correct: int = Field(default=0)
+    last_correct_at: Optional[datetime] = None
@@ -0,0 +1,197 @@
+"""
+Monthly range partitioning and archival for user_attempts.
+
+- convert_to_partitioned: one-off migration of the plain table created by
+  init_db into a table partitioned by month on attempted_at.
+- ensure_partitions: creates upcoming monthly partitions ahead of time,
+  moving any rows the default partition already holds for those months.
+- archive_partitions: compacts partitions older than a cutoff into
+  user_attempt_daily_summaries (per user and day) and user_archived_questions
+  (per user and question), then detaches and drops them.
+
+Run through scripts/partition_attempts.py.
+"""
+
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PARENT = "user_attempts"
+DEFAULT_PARTITION = f"{PARENT}_default"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_p{month:%Y_%m}"
+
+
+def month_of(name: str) -> Optional[date]:
+    """Inverse of partition_name; None for the default partition or foreign names."""
+    prefix = f"{PARENT}_p"
+    if not name.startswith(prefix):
+        return None
+    try:
+        year, month = name[len(prefix):].split("_")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+async def is_partitioned(session: AsyncSession) -> bool:
+    result = await session.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"),
+        {"name": PARENT},
+    )
+    return bool(result.scalar())
+
+
+async def list_partitions(session: AsyncSession) -> list[str]:
+    """Names of the monthly partitions attached to user_attempts, oldest first."""
+    result = await session.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:name)
+    """), {"name": PARENT})
+    return sorted(name for name in result.scalars().all() if month_of(name))
+
+
+async def ensure_indexes(session: AsyncSession) -> None:
+    """Create the composite dashboard index on existing tables; drop the user_id index it covers."""
+    await session.execute(text(
+        f"CREATE INDEX IF NOT EXISTS ix_user_attempts_user_id_attempted_at ON {PARENT} (user_id, attempted_at DESC)"
+    ))
+    await session.execute(text("DROP INDEX IF EXISTS ix_user_attempts_user_id"))
+
+
+async def create_partition(session: AsyncSession, month: date) -> bool:
+    """
+    Create the partition for one month. Returns False if it already existed.
+    Rows for that month already sitting in the default partition (written
+    before the partition existed) are moved into it: the partition is built
+    standalone, filled from the default and then attached, since attaching
+    fails while the default still holds rows in the new range.
+    """
+    name = partition_name(month)
+    exists = await session.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+    if exists.scalar():
+        return False
+    bounds = f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    has_default = await session.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION})
+    if not has_default.scalar():
+        await session.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT} {bounds}"))
+        return True
+
+    # Attaching locks the default partition anyway; take it first so no row for the month lands mid-move
+    await session.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE"))
+    await session.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+    await session.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE attempted_at >= CAST(:start AS date) AND attempted_at < CAST(:end AS date)
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), {"start": month, "end": add_months(month, 1)})
+    await session.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} {bounds}"))
+    return True
+
+
+async def ensure_partitions(session: AsyncSession, months_ahead: int = 3, today: Optional[date] = None) -> list[str]:
+    """Create partitions from the current month through months_ahead. Returns the names created."""
+    current = month_start(today or date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if await create_partition(session, month):
+            created.append(partition_name(month))
+    return created
+
+
+async def convert_to_partitioned(session: AsyncSession, months_ahead: int = 3) -> int:
+    """
+    Rebuild user_attempts as a monthly range-partitioned table, copying existing rows.
+    Runs in the caller's transaction and holds an exclusive lock on the table until commit.
+    Returns the number of rows copied.
+    """
+    legacy = f"{PARENT}_unpartitioned"
+    await session.execute(text(f"LOCK TABLE {PARENT} IN ACCESS EXCLUSIVE MODE"))
+    await session.execute(text(f"ALTER TABLE {PARENT} RENAME TO {legacy}"))
+    await session.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {PARENT}_pkey TO {legacy}_pkey"))
+    for index in ("ix_user_attempts_user_id", "ix_user_attempts_question_id", "ix_user_attempts_user_id_attempted_at"):
+        await session.execute(text(f"DROP INDEX IF EXISTS {index}"))
+    await session.execute(text(f"ALTER SEQUENCE {PARENT}_id_seq OWNED BY NONE"))
+
+    # The partition key must be part of the primary key
+    await session.execute(text(
+        f"CREATE TABLE {PARENT} (LIKE {legacy} INCLUDING DEFAULTS, PRIMARY KEY (id, attempted_at)) "
+        "PARTITION BY RANGE (attempted_at)"
+    ))
+    await session.execute(text(f"ALTER SEQUENCE {PARENT}_id_seq OWNED BY {PARENT}.id"))
+
+    oldest = (await session.execute(text(f"SELECT min(attempted_at) FROM {legacy}"))).scalar()
+    month = month_start(oldest.date()) if oldest else month_start(date.today())
+    while month < month_start(date.today()):
+        await create_partition(session, month)
+        month = add_months(month, 1)
+    await ensure_partitions(session, months_ahead)
+    await session.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT} DEFAULT"))
+
+    result = await session.execute(text(f"INSERT INTO {PARENT} SELECT * FROM {legacy}"))
+    await session.execute(text(f"DROP TABLE {legacy}"))
+
+    # Indexes on the parent cascade to every partition; built after the bulk copy
+    await session.execute(text(f"CREATE INDEX ix_user_attempts_question_id ON {PARENT} (question_id)"))
+    await ensure_indexes(session)
+    return result.rowcount
+
+
+async def archive_partition(session: AsyncSession, name: str) -> int:
+    """
+    Fold one partition into daily per-user summaries and per-user question
+    totals, then detach and drop it. The question totals keep the user's
+    distinct attempted/solved set, which progress and leaderboard checks read
+    alongside user_attempts. Returns the number of daily summary rows written.
+    """
+    result = await session.execute(text(f"""
+        INSERT INTO user_attempt_daily_summaries AS s
+            (user_id, day, attempts, correct, distinct_questions, total_seconds)
+        SELECT user_id, CAST(attempted_at AS date), count(*), count(*) FILTER (WHERE is_correct),
+               count(DISTINCT question_id), coalesce(sum(time_taken_seconds), 0)
+        FROM {name}
+        GROUP BY 1, 2
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            attempts = s.attempts + EXCLUDED.attempts,
+            correct = s.correct + EXCLUDED.correct,
+            distinct_questions = s.distinct_questions + EXCLUDED.distinct_questions,
+            total_seconds = s.total_seconds + EXCLUDED.total_seconds
+    """))
+    await session.execute(text(f"""
+        INSERT INTO user_archived_questions AS h (user_id, question_id, attempts, correct, last_correct_at)
+        SELECT user_id, question_id, count(*), count(*) FILTER (WHERE is_correct),
+               max(attempted_at) FILTER (WHERE is_correct)
+        FROM {name}
+        GROUP BY 1, 2
+        ON CONFLICT (user_id, question_id) DO UPDATE SET
+            attempts = h.attempts + EXCLUDED.attempts,
+            correct = h.correct + EXCLUDED.correct,
+            last_correct_at = GREATEST(h.last_correct_at, EXCLUDED.last_correct_at)
+    """))
+    await session.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+    await session.execute(text(f"DROP TABLE {name}"))
+    return result.rowcount
+
+
+def archivable(partitions: list[str], older_than_months: int, today: Optional[date] = None) -> list[str]:
+    """Partitions whose whole month ends before the retention cutoff."""
+    cutoff = add_months(month_start(today or date.today()), -older_than_months)
+    return [name for name in partitions if add_months(month_of(name), 1) <= cutoff]
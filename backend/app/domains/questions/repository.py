@@ -4,18 +4,55 @@ Handles CRUD and search queries.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_, Text, text, cast, String
+from sqlalchemy import select, insert, func, or_, and_, Text, text, cast, String
 from sqlalchemy.dialects.postgresql import JSONB
 from pgvector.sqlalchemy import Vector
 from pgvector.sqlalchemy import Vector
-from typing import Optional, List, Set
+from typing import Optional, List, Sequence, Set
+from datetime import date, datetime
+import json
 import uuid
 
-from app.domains.questions.models import Question
+from app.domains.questions.models import Question, QuestionStats, UserAttempt
 from app.domains.questions.schemas import QuestionCreate, SearchFilters
 from app.core.embedding import generate_embeddings
 
 
+def build_search_content(data: dict) -> str:
+    """
+    Combine question fields into the 'Content Soup' used for trigram search.
+    Pure function so bulk ingest can build soups outside a session.
+    """
+    parts = [
+        str(data.get("question_text", "")),
+        str(data.get("year", "")),      # Add Year to content
+        str(data.get("source", ""))     # Add Source to content
+    ]
+    
+    # Extract Tier 1 Concepts
+    tier1 = data.get("tier_1_core_research", {})
+    if tier1:
+        tags = tier1.get("hierarchical_tags", {})
+        parts.append(str(tags.get("topic", {}).get("name", "")))
+        concepts = [str(c.get("name", "")) for c in tags.get("concepts", [])]
+        parts.extend(concepts)
+        
+        # Extract Explanation summary
+        expl = tier1.get("explanation", {})
+        parts.append(str(expl.get("question_nature", "")))
+        if expl.get("step_by_step"):
+            parts.extend([str(s) for s in expl["step_by_step"] if s])
+
+    # Extract Tier 3 Keywords
+    tier3 = data.get("tier_3_enhanced_learning", {})
+    if tier3:
+        keywords = tier3.get("search_keywords", [])
+        if keywords:
+            parts.extend([str(k) for k in keywords])
+
+    return " | ".join([p for p in parts if p and p.strip()])
+
+
 
 class QuestionRepository:
     """Repository for Question database operations."""
@@ -34,37 +71,9 @@ class QuestionRepository:
 
     def _prepare_search_data(self, data: dict) -> tuple[str, List[float]]:
         """Combine fields into 'Content Soup' and generate vector embedding."""
-        # 1. Build Content Soup (Text)
-        parts = [
-            str(data.get("question_text", "")),
-            str(data.get("year", "")),      # Add Year to content
-            str(data.get("source", ""))     # Add Source to content
-        ]
-        
-        # Extract Tier 1 Concepts
-        tier1 = data.get("tier_1_core_research", {})
-        if tier1:
-            tags = tier1.get("hierarchical_tags", {})
-            parts.append(str(tags.get("topic", {}).get("name", "")))
-            concepts = [str(c.get("name", "")) for c in tags.get("concepts", [])]
-            parts.extend(concepts)
-            
-            # Extract Explanation summary
-            expl = tier1.get("explanation", {})
-            parts.append(str(expl.get("question_nature", "")))
-            if expl.get("step_by_step"):
-                parts.extend([str(s) for s in expl["step_by_step"] if s])
-
-        # Extract Tier 3 Keywords
-        tier3 = data.get("tier_3_enhanced_learning", {})
-        if tier3:
-            keywords = tier3.get("search_keywords", [])
-            if keywords:
-                parts.extend([str(k) for k in keywords])
-
-        search_content = " | ".join([p for p in parts if p and p.strip()])
+        search_content = build_search_content(data)
         
-        # 2. Generate Embedding (BGE-Large)
+        # Generate Embedding (BGE-Large)
         embedding_vec = generate_embeddings(search_content)
         embedding = embedding_vec.tolist()
         
@@ -84,20 +93,92 @@ class QuestionRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_with_stats(
+        self, question_id: Optional[uuid.UUID] = None, string_id: Optional[str] = None, options: Sequence = ()
+    ) -> Optional[tuple[Question, Optional[QuestionStats]]]:
+        """Get a question by UUID or string ID together with its stats row (outer join)."""
+        condition = Question.id == question_id if question_id is not None else Question.question_id == string_id
+        result = await self.session.execute(
+            select(Question, QuestionStats)
+            .outerjoin(QuestionStats, QuestionStats.question_id == Question.id)
+            .where(condition)
+            .options(*options)
+        )
+        row = result.first()
+        return (row[0], row[1]) if row else None
+    
+    async def get_many_with_stats(self, question_ids: list[uuid.UUID]) -> list[tuple[Question, Optional[QuestionStats]]]:
+        """Fetch many questions with their stats rows in one IN query, in the order of question_ids."""
+        if not question_ids:
+            return []
+        result = await self.session.execute(
+            select(Question, QuestionStats)
+            .outerjoin(QuestionStats, QuestionStats.question_id == Question.id)
+            .where(Question.id.in_(set(question_ids)))
+        )
+        rows = {question.id: (question, stats) for question, stats in result.all()}
+        return [rows[qid] for qid in question_ids if qid in rows]
+    
+    async def load_full(self, question_ids: list[uuid.UUID]) -> None:
+        """Load every column (including deferred ones) of already-fetched questions in one IN query."""
+        if question_ids:
+            await self.session.execute(
+                select(Question).where(Question.id.in_(set(question_ids))),
+                execution_options={"populate_existing": True},
+            )
+    
+    async def resolve_question_ids(self, question_ids: list[str]) -> dict[str, uuid.UUID]:
+        """
+        Map question IDs to UUIDs with a single query. Each ID may be a string ID
+        (e.g., GATE_AE_2008_Q01) or a UUID; both are checked against existing
+        questions, and unknown IDs are omitted.
+        """
+        if not question_ids:
+            return {}
+        string_ids: set[str] = set()
+        uuids: dict[uuid.UUID, list[str]] = {}  # Several spellings may name the same UUID
+        for question_id in question_ids:
+            try:
+                uuids.setdefault(uuid.UUID(question_id), []).append(question_id)
+            except ValueError:
+                string_ids.add(question_id)
+        result = await self.session.execute(
+            select(Question.question_id, Question.id)
+            .where(or_(Question.question_id.in_(string_ids), Question.id.in_(list(uuids))))
+        )
+        resolved: dict[str, uuid.UUID] = {}
+        for string_id, question_uuid in result.all():
+            if string_id in string_ids:
+                resolved[string_id] = question_uuid
+            for spelling in uuids.get(question_uuid, ()):
+                resolved[spelling] = question_uuid
+        return resolved
+    
+    async def find_question_uuid(self, question_id: str) -> Optional[uuid.UUID]:
+        """UUID of the question with this UUID or string ID, or None if there is none."""
+        try:
+            condition = Question.id == uuid.UUID(question_id)
+        except ValueError:
+            condition = Question.question_id == question_id
+        result = await self.session.execute(select(Question.id).where(condition))
+        return result.scalar_one_or_none()
+    
     async def search(
         self,
         query: str,
         filters: Optional[SearchFilters] = None,
         page: int = 1,
         page_size: int = 20,
-    ) -> tuple[list[Question], int]:
+        options: Sequence = (),
+    ) -> tuple[list[tuple[Question, Optional[QuestionStats]]], int]:
         """
         Hybrid Search: Combined pgvector (Semantic) + pg_trgm (Typos).
         Logic: Score = (0.7 * cosine_similarity) + (0.3 * trigram_similarity).
+        Each result is paired with its stats row (None if never attempted).
         """
         if not query:
             # Fallback to basic list if no query, sorted by question number ascending
-            stmt = select(Question).order_by(Question.year.desc(), Question.question_number.asc())
+            stmt = select(Question, QuestionStats).order_by(Question.year.desc(), Question.question_number.asc())
             count_stmt = select(func.count(Question.id))
         else:
             # Generate query embedding
@@ -123,7 +204,7 @@ class QuestionRepository:
             )
             
             stmt = (
-                select(Question)
+                select(Question, QuestionStats)
                 .add_columns(hybrid_score.label("relevance"))
                 .where(content_contains)
                 .order_by(hybrid_score.desc())
@@ -160,15 +241,13 @@ class QuestionRepository:
         total_result = await self.session.execute(count_stmt)
         total = total_result.scalar_one()
         
-        # Apply pagination
-        stmt = stmt.offset((page - 1) * page_size).limit(page_size)
+        # Apply pagination; stats come from the same query via an outer join
+        stmt = stmt.outerjoin(QuestionStats, QuestionStats.question_id == Question.id)
+        stmt = stmt.offset((page - 1) * page_size).limit(page_size).options(*options)
         
         result = await self.session.execute(stmt)
-        # Handle cases where we have either Question or (Question, relevance)
-        if query:
-            questions = [row[0] for row in result.all()]
-        else:
-            questions = list(result.scalars().all())
+        # Rows are (Question, QuestionStats) or (Question, QuestionStats, relevance)
+        questions = [(row[0], row[1]) for row in result.all()]
         
         return questions, total
     
@@ -300,3 +379,280 @@ class QuestionRepository:
                 tree[subject].append(topic)
                 
         return tree
+
+
+class UserAttemptRepository:
+    """Repository for UserAttempt reads and writes."""
+    
+    # One pass over the user's attempts: totals, streak (gaps-and-islands) and per-topic accuracy.
+    # Attempts are grouped per question before joining, so each question's tier JSON is read once.
+    DASHBOARD_AGGREGATES_SQL = text("""
+        WITH attempts AS (
+            SELECT question_id, is_correct, time_taken_seconds, CAST(attempted_at AS date) AS day
+            FROM user_attempts
+            WHERE user_id = :user_id
+        ),
+        totals AS (
+            SELECT count(DISTINCT question_id) AS attempted,
+                   coalesce(sum(time_taken_seconds), 0) AS total_seconds
+            FROM attempts
+        ),
+        islands AS (
+            -- Consecutive days share the same (day - row_number) anchor
+            SELECT day, day - CAST(row_number() OVER (ORDER BY day) AS int) AS anchor
+            FROM (SELECT DISTINCT day FROM attempts) d
+        ),
+        latest AS (
+            SELECT day, anchor FROM islands ORDER BY day DESC LIMIT 1
+        ),
+        per_question AS (
+            SELECT question_id, count(*) AS total, count(*) FILTER (WHERE is_correct) AS correct
+            FROM attempts
+            GROUP BY question_id
+        ),
+        topics AS (
+            SELECT coalesce(
+                       nullif(q.tier_1_core_research -> 'hierarchical_tags' -> 'topic' ->> 'name', ''),
+                       'General'
+                   ) AS topic,
+                   sum(pq.correct) AS correct,
+                   sum(pq.total) AS total
+            FROM per_question pq
+            JOIN questions q ON q.id = pq.question_id
+            GROUP BY 1
+        )
+        SELECT
+            t.attempted,
+            t.total_seconds,
+            (
+                SELECT count(*) FROM islands i, latest l
+                WHERE i.anchor = l.anchor AND l.day BETWEEN CAST(:today AS date) - 1 AND CAST(:today AS date)
+            ) AS current_streak,
+            (SELECT json_agg(json_build_array(topic, correct, total)) FROM topics) AS topics,
+            (SELECT count(*) FROM questions) AS total_questions
+        FROM totals t
+    """)
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get_dashboard_aggregates(self, user_id: int, today: date) -> dict:
+        """
+        Aggregate a user's attempt history in a single statement.
+        Returns attempted/total_seconds/current_streak/total_questions and
+        topics as {topic: (correct, total)}.
+        """
+        result = await self.session.execute(
+            self.DASHBOARD_AGGREGATES_SQL, {"user_id": user_id, "today": today}
+        )
+        row = result.mappings().one()
+        topics = row["topics"] or []
+        if isinstance(topics, str):
+            topics = json.loads(topics)
+        return {
+            "attempted": row["attempted"] or 0,
+            "total_seconds": int(row["total_seconds"] or 0),
+            "current_streak": row["current_streak"] or 0,
+            "total_questions": row["total_questions"] or 0,
+            "topics": {topic: (int(correct), int(total)) for topic, correct, total in topics},
+        }
+    
+    async def get_recent_activity(self, user_id: int, limit: int = 3, text_length: int = 100) -> list[dict]:
+        """Latest attempts with a truncated question text, reading only the columns shown."""
+        stmt = (
+            select(
+                Question.question_id,
+                func.left(Question.question_text, text_length + 1),
+                UserAttempt.is_correct,
+                UserAttempt.attempted_at,
+            )
+            .join(Question, UserAttempt.question_id == Question.id)
+            .where(UserAttempt.user_id == user_id)
+            .order_by(UserAttempt.attempted_at.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        
+        items = []
+        for question_id, q_text, is_correct, attempted_at in result.all():
+            if len(q_text) > text_length:
+                q_text = q_text[:text_length] + "..."
+            items.append({
+                "question_id": question_id,
+                "question_text": q_text,
+                "is_correct": is_correct,
+                "attempted_at": attempted_at,
+            })
+        return items
+
+    async def insert_many(self, attempts: list[UserAttempt]) -> None:
+        """Insert attempts with one multi-row INSERT (no per-row flush or refresh)."""
+        if not attempts:
+            return
+        columns = ("user_id", "question_id", "is_correct", "time_taken_seconds", "attempted_at")
+        # Stay under asyncpg's 32767 bind-parameter limit for large flushes
+        rows_per_statement = 32767 // len(columns)
+        for start in range(0, len(attempts), rows_per_statement):
+            chunk = attempts[start:start + rows_per_statement]
+            await self.session.execute(
+                insert(UserAttempt).values([{c: getattr(a, c) for c in columns} for a in chunk])
+            )
+
+
+class QuestionStatsRepository:
+    """Repository for per-question attempt statistics."""
+    
+    # Rows are sorted by question_id so concurrent batches lock stats rows in the same order
+    INCREMENT_SQL = text("""
+        INSERT INTO question_stats AS s (question_id, attempts, correct, total_seconds, updated_at)
+        SELECT b.question_id, b.attempts, b.correct, b.seconds, now() at time zone 'utc'
+        FROM unnest(
+            CAST(:question_ids AS uuid[]), CAST(:attempts AS int[]),
+            CAST(:corrects AS int[]), CAST(:seconds AS int[])
+        ) AS b(question_id, attempts, correct, seconds)
+        ORDER BY b.question_id
+        ON CONFLICT (question_id) DO UPDATE SET
+            attempts = s.attempts + EXCLUDED.attempts,
+            correct = s.correct + EXCLUDED.correct,
+            total_seconds = s.total_seconds + EXCLUDED.total_seconds,
+            updated_at = EXCLUDED.updated_at
+    """)
+    
+    REFRESH_PERCENTILES_SQL = text("""
+        UPDATE question_stats AS s SET
+            p50_seconds = p.p50,
+            p90_seconds = p.p90,
+            percentiles_updated_at = now() at time zone 'utc'
+        FROM (
+            SELECT question_id,
+                   percentile_disc(0.5) WITHIN GROUP (ORDER BY time_taken_seconds) AS p50,
+                   percentile_disc(0.9) WITHIN GROUP (ORDER BY time_taken_seconds) AS p90
+            FROM user_attempts
+            WHERE attempted_at >= :since
+            GROUP BY question_id
+        ) p
+        WHERE s.question_id = p.question_id
+    """)
+    
+    REBUILD_COUNTS_SQL = text("""
+        INSERT INTO question_stats AS s (question_id, attempts, correct, total_seconds, updated_at)
+        SELECT question_id, count(*), count(*) FILTER (WHERE is_correct),
+               coalesce(sum(time_taken_seconds), 0), now() at time zone 'utc'
+        FROM user_attempts
+        GROUP BY question_id
+        ON CONFLICT (question_id) DO UPDATE SET
+            attempts = EXCLUDED.attempts,
+            correct = EXCLUDED.correct,
+            total_seconds = EXCLUDED.total_seconds,
+            updated_at = EXCLUDED.updated_at
+    """)
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def increment(self, attempts: list[UserAttempt]) -> None:
+        """Fold new attempts into their questions' counters with one upsert."""
+        if not attempts:
+            return
+        per_question: dict[uuid.UUID, list[int]] = {}
+        for attempt in attempts:
+            counts = per_question.setdefault(attempt.question_id, [0, 0, 0])
+            counts[0] += 1
+            counts[1] += 1 if attempt.is_correct else 0
+            counts[2] += attempt.time_taken_seconds
+        question_ids = list(per_question)
+        await self.session.execute(self.INCREMENT_SQL, {
+            "question_ids": question_ids,
+            "attempts": [per_question[q][0] for q in question_ids],
+            "corrects": [per_question[q][1] for q in question_ids],
+            "seconds": [per_question[q][2] for q in question_ids],
+        })
+    
+    async def refresh_percentiles(self, since: datetime) -> int:
+        """Recompute p50/p90 solve times from attempts made since the given time."""
+        result = await self.session.execute(self.REFRESH_PERCENTILES_SQL, {"since": since})
+        return result.rowcount
+    
+    async def rebuild_counts(self) -> int:
+        """
+        Reset counters from user_attempts history (backfill or drift repair).
+        Only covers unarchived attempts.
+        """
+        result = await self.session.execute(self.REBUILD_COUNTS_SQL)
+        return result.rowcount
+
+
+class CalibrationRepository:
+    """Columnar reads and bulk writes for the IRT calibration job."""
+    
+    # First attempt per (user, question), returned as parallel arrays in a single row.
+    # Questions are numbered densely so the arrays index straight into parameter vectors.
+    RESPONSES_SQL = text("""
+        WITH firsts AS (
+            SELECT DISTINCT ON (user_id, question_id) user_id, question_id, is_correct
+            FROM user_attempts
+            ORDER BY user_id, question_id, attempted_at
+        ),
+        items AS (
+            SELECT question_id, CAST(row_number() OVER (ORDER BY question_id) - 1 AS int) AS idx
+            FROM firsts
+            GROUP BY question_id
+            HAVING count(*) >= :min_responses
+        )
+        SELECT (SELECT array_agg(question_id ORDER BY idx) FROM items),
+               array_agg(f.user_id), array_agg(i.idx), array_agg(f.is_correct)
+        FROM firsts f JOIN items i USING (question_id)
+    """)
+    
+    SAVE_ITEMS_SQL = text("""
+        UPDATE questions AS q SET
+            irt_difficulty = v.difficulty,
+            irt_discrimination = v.discrimination,
+            irt_calibrated_at = :now
+        FROM unnest(
+            CAST(:question_ids AS uuid[]), CAST(:difficulty AS float8[]), CAST(:discrimination AS float8[])
+        ) AS v(id, difficulty, discrimination)
+        WHERE q.id = v.id
+    """)
+    
+    SAVE_ABILITIES_SQL = text("""
+        INSERT INTO user_abilities (user_id, ability, responses, calibrated_at)
+        SELECT v.user_id, v.ability, v.responses, :now
+        FROM unnest(CAST(:user_ids AS int[]), CAST(:ability AS float8[]), CAST(:responses AS int[]))
+            AS v(user_id, ability, responses)
+        ON CONFLICT (user_id) DO UPDATE SET
+            ability = EXCLUDED.ability,
+            responses = EXCLUDED.responses,
+            calibrated_at = EXCLUDED.calibrated_at
+    """)
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def load_responses(self, min_responses: int = 20) -> tuple[list[uuid.UUID], list[int], list[int], list[bool]]:
+        """
+        Returns (question_ids, user_ids, item_indexes, correct): question_ids[k] is the
+        question for item index k; the other three lists hold one entry per response.
+        Questions with fewer than min_responses first attempts are left out.
+        """
+        row = (await self.session.execute(self.RESPONSES_SQL, {"min_responses": min_responses})).one()
+        question_ids, user_ids, item_indexes, correct = row
+        return question_ids or [], user_ids or [], item_indexes or [], correct or []
+    
+    async def save_items(self, question_ids: list[uuid.UUID], difficulty: list[float], discrimination: list[float]) -> int:
+        result = await self.session.execute(self.SAVE_ITEMS_SQL, {
+            "question_ids": question_ids,
+            "difficulty": difficulty,
+            "discrimination": discrimination,
+            "now": datetime.utcnow(),
+        })
+        return result.rowcount
+    
+    async def save_abilities(self, user_ids: list[int], ability: list[float], responses: list[int]) -> int:
+        result = await self.session.execute(self.SAVE_ABILITIES_SQL, {
+            "user_ids": user_ids,
+            "ability": ability,
+            "responses": responses,
+            "now": datetime.utcnow(),
+        })
+        return result.rowcount
@@ -62,6 +62,16 @@ class SearchFilters(BaseModel):
 
 # ============== Response Schemas ==============
 
+class QuestionStatsSummary(BaseModel):
+    """Observed performance on a question across all students."""
+    attempts: int
+    correct: int
+    accuracy_percent: float
+    mean_seconds: float
+    p50_seconds: Optional[int] = None
+    p90_seconds: Optional[int] = None
+
+
 class QuestionListItem(BaseModel):
     """Lightweight question for list/search results."""
     id: uuid.UUID
@@ -80,6 +90,7 @@ class QuestionListItem(BaseModel):
     options: Optional[dict] = None
     answer_key: Optional[str] = None
     explanation: Optional[dict] = None
+    stats: Optional[QuestionStatsSummary] = None
     
     class Config:
         from_attributes = True
@@ -109,6 +120,7 @@ class QuestionResponse(BaseModel):
     tier_4_metadata: Optional[Tier4Metadata]
     created_at: datetime
     updated_at: datetime
+    stats: Optional[QuestionStatsSummary] = None
     
     class Config:
         from_attributes = True
@@ -149,6 +161,21 @@ class DashboardStats(BaseModel):
 class AttemptRequest(BaseModel):
     """Request schema for recording an attempt."""
     is_correct: bool
-    time_taken_seconds: int = 0
+    time_taken_seconds: int = Field(0, ge=0)
+
+
+class BatchAttemptItem(BaseModel):
+    """One answered question within a batch submission."""
+    question_id: str
+    is_correct: bool
+    time_taken_seconds: int = Field(0, ge=0)
+
+
+class BatchAttemptRequest(BaseModel):
+    """Request schema for recording many attempts at once (e.g. a finished mock paper)."""
+    attempts: list[BatchAttemptItem] = Field(..., min_length=1, max_length=500)
 
 
+class BatchAttemptResponse(BaseModel):
+    """Result of a batch submission."""
+    recorded: int
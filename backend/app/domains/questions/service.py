@@ -4,20 +4,54 @@ Orchestrates between API and repository layers.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 from typing import Optional
+from datetime import date, datetime
 import uuid
 
-from app.domains.questions.repository import QuestionRepository
+from app.core.cache import TTLCache, invalidate
+from app.core.config import settings
+from app.domains.questions.repository import QuestionRepository, QuestionStatsRepository, UserAttemptRepository
 from app.domains.questions.schemas import (
     QuestionCreate,
     QuestionResponse,
     QuestionListItem,
+    QuestionStatsSummary,
     SearchFilters,
     SearchResult,
     FilterOptions,
     DashboardStats,
 )
-from app.domains.questions.models import Question, UserAttempt
+from app.domains.questions.models import Question, QuestionStats, UserAttempt
+from app.domains.questions.fragments import (
+    TIER_FIELDS,
+    assemble,
+    assemble_list,
+    build_fragments,
+    cached_fragments,
+    fragment_cache,
+)
+from app.domains.questions.validation import question_response_from_row, validate_question_create
+from app.domains.progress.service import ProgressService
+from app.domains.practice.service import PracticeService
+from app.domains.leaderboards.service import LeaderboardService
+
+# Known question IDs (string or UUID form) -> UUID; unknown IDs are not cached
+question_id_cache = TTLCache("question_ids", settings.question_id_cache_size, settings.question_id_cache_ttl_seconds)
+
+# Topic other domains register on_invalidate() hooks under for question changes
+QUESTIONS_CHANGED = "questions"
+
+
+def invalidate_question_caches() -> None:
+    """Drop response fragments, the ID map and every dependent cache (e.g. after a question import)."""
+    fragment_cache.clear()
+    question_id_cache.clear()
+    invalidate(QUESTIONS_CHANGED)
+
+
+# Columns the fragment path only needs on a cache miss
+LIGHT_LOAD = tuple(defer(getattr(Question, name)) for name in TIER_FIELDS + ("embedding", "search_content"))
 
 
 class QuestionService:
@@ -25,20 +59,23 @@ class QuestionService:
     
     def __init__(self, session: AsyncSession):
         self.repo = QuestionRepository(session)
+        self.attempts = UserAttemptRepository(session)
+        self.progress = ProgressService(session)
+        self.stats = QuestionStatsRepository(session)
+        self.practice = PracticeService(session)
+        self.leaderboards = LeaderboardService(session)
     
-    async def get_question(self, question_id: uuid.UUID) -> Optional[QuestionResponse]:
-        """Get a single question by ID."""
-        question = await self.repo.get_by_id(question_id)
-        if not question:
+    async def get_list_item(self, question_id: uuid.UUID) -> Optional[QuestionListItem]:
+        """Get a lightweight list item (with stats) for a single question."""
+        row = await self.repo.get_with_stats(question_id=question_id)
+        if not row:
             return None
-        return QuestionResponse.model_validate(question)
+        return self._to_list_item(*row)
     
-    async def get_question_by_string_id(self, question_id: str) -> Optional[QuestionResponse]:
-        """Get a single question by string ID (e.g., GATE_AE_2008_Q01)."""
-        question = await self.repo.get_by_question_id(question_id)
-        if not question:
-            return None
-        return QuestionResponse.model_validate(question)
+    async def get_list_items(self, question_ids: list[uuid.UUID]) -> list[QuestionListItem]:
+        """Get list items (with stats) for many questions in one query, preserving order."""
+        rows = await self.repo.get_many_with_stats(question_ids)
+        return [self._to_list_item(question, stats) for question, stats in rows]
     
     async def search_questions(
         self,
@@ -48,12 +85,12 @@ class QuestionService:
         page_size: int = 20,
     ) -> SearchResult:
         """Search questions with filters and pagination."""
-        questions, total = await self.repo.search(query, filters, page, page_size)
+        rows, total = await self.repo.search(query, filters, page, page_size)
         
         # Convert to list items with extracted metadata
         items = []
-        for q in questions:
-            item = self._to_list_item(q)
+        for q, stats in rows:
+            item = self._to_list_item(q, stats)
             items.append(item)
         
         return SearchResult(
@@ -65,7 +102,58 @@ class QuestionService:
             questions=items,
         )
     
-    def _to_list_item(self, question: Question) -> QuestionListItem:
+    @staticmethod
+    def _stats_values(stats: Optional[QuestionStats]) -> Optional[dict]:
+        """Public view of a question's stats row as plain values; None until someone has attempted it."""
+        if stats is None or not stats.attempts:
+            return None
+        return {
+            "attempts": stats.attempts,
+            "correct": stats.correct,
+            "accuracy_percent": round(stats.correct / stats.attempts * 100, 1),
+            "mean_seconds": round(stats.total_seconds / stats.attempts, 1),
+            "p50_seconds": stats.p50_seconds,
+            "p90_seconds": stats.p90_seconds,
+        }
+    
+    @classmethod
+    def _stats_summary(cls, stats: Optional[QuestionStats]) -> Optional[QuestionStatsSummary]:
+        values = cls._stats_values(stats)
+        return QuestionStatsSummary(**values) if values else None
+    
+    async def get_question_json(
+        self, question_id: Optional[uuid.UUID] = None, string_id: Optional[str] = None, premium: bool = False
+    ) -> Optional[bytes]:
+        """A question's response JSON spliced from cached fragments; premium tiers only if entitled."""
+        row = await self.repo.get_with_stats(question_id=question_id, string_id=string_id, options=LIGHT_LOAD)
+        if not row:
+            return None
+        return (await self._assemble([row], premium))[0]
+    
+    async def list_questions_json(
+        self,
+        filters: Optional[SearchFilters] = None,
+        page: int = 1,
+        page_size: int = 20,
+        premium: bool = False,
+    ) -> bytes:
+        """A page of full questions as a JSON array, spliced from cached fragments."""
+        rows, _ = await self.repo.search("", filters, page, page_size, options=LIGHT_LOAD)
+        return assemble_list(await self._assemble(rows, premium))
+    
+    async def _assemble(self, rows: list[tuple[Question, Optional[QuestionStats]]], premium: bool) -> list[bytes]:
+        fragments = {question.id: cached_fragments(question.id, question.updated_at) for question, _ in rows}
+        misses = [qid for qid, cached in fragments.items() if cached is None]
+        if misses:
+            # Rows were fetched without their tier columns; load those only for the misses
+            await self.repo.load_full(misses)
+            for question, _ in rows:
+                if fragments[question.id] is None:
+                    fragments[question.id] = build_fragments(question)
+                    fragment_cache.set(question.id, fragments[question.id])
+        return [assemble(fragments[question.id], premium, self._stats_values(stats)) for question, stats in rows]
+    
+    def _to_list_item(self, question: Question, stats: Optional[QuestionStats] = None) -> QuestionListItem:
         """Convert Question model to lightweight list item."""
         # Extract difficulty from tier_0
         # Extract difficulty from tier_0
@@ -113,6 +201,7 @@ class QuestionService:
             options=question.options,
             answer_key=question.answer_key,
             explanation=explanation,
+            stats=self._stats_summary(stats),
         )
     
     async def get_filter_options(self) -> FilterOptions:
@@ -120,11 +209,11 @@ class QuestionService:
         options = await self.repo.get_filter_options()
         return FilterOptions(**options)
     
-    async def import_question(self, data: dict) -> QuestionResponse:
+    async def import_question(self, data: dict, strict: bool = False) -> QuestionResponse:
         """Import a single question from JSON data."""
-        question_data = QuestionCreate(**data)
+        question_data = validate_question_create(data, strict=strict)
         question = await self.repo.create(question_data)
-        return QuestionResponse.model_validate(question)
+        return question_response_from_row(question)
     
     async def bulk_import(self, questions_data: list[dict]) -> dict:
         """Bulk import questions from JSON."""
@@ -141,143 +230,108 @@ class QuestionService:
 
     async def get_user_dashboard_stats(self, user_id: int) -> DashboardStats:
         """Calculate dashboard statistics for a user."""
-        # This belongs in a repo, but for now we put it here or access a new repo
-        # To avoid circular imports or complexity, we'll do a direct query for now
-        # Ideally we should have a UserAttemptRepository
-        
-        from sqlalchemy import select, func
-        from app.domains.questions.models import UserAttempt, Question
-        
-        # Count total questions
-        total_questions = await self.repo.count_all()
-        
-        # Count distinct questions attempted by user
-        # We verify attempts against actual user_id
-        statement = select(func.count(func.distinct(UserAttempt.question_id))).where(UserAttempt.user_id == user_id)
-        result = await self.repo.session.execute(statement)
-        attempted_count = result.scalar() or 0
-        
-        # Calculate total time taken
-        time_stmt = select(func.sum(UserAttempt.time_taken_seconds)).where(UserAttempt.user_id == user_id)
-        time_result = await self.repo.session.execute(time_stmt)
-        total_seconds = time_result.scalar() or 0
-        hours_studied = round(total_seconds / 3600, 1)
-
-        # Calculate Current Streak
-        # Logic: Consecutive days ending today or yesterday
-        streak = 0
-        date_stmt = select(func.date(UserAttempt.attempted_at)).where(UserAttempt.user_id == user_id).distinct()
-        date_result = await self.repo.session.execute(date_stmt)
-        # Dates come as date objects or strings depending on driver, usually date objects
-        dates = sorted([r[0] for r in date_result.all()], reverse=True)
-        
-        if dates:
-            from datetime import date, timedelta
-            today = date.today()
-            yesterday = today - timedelta(days=1)
-            
-            # Check if streak is active (activity today or yesterday)
-            if dates[0] == today or dates[0] == yesterday:
-                streak = 1
-                current_check = dates[0]
-                
-                # Iterate backwards to find consecutive days
-                for i in range(1, len(dates)):
-                    expected_prev = current_check - timedelta(days=1)
-                    if dates[i] == expected_prev:
-                        streak += 1
-                        current_check = dates[i]
-                    else:
-                        break
-
-        # Calculate Topic Performance (Heatmap)
-        # Select Attempts + Question Data
-        perf_stmt = select(UserAttempt, Question).join(Question, UserAttempt.question_id == Question.id).where(UserAttempt.user_id == user_id)
-        perf_result = await self.repo.session.execute(perf_stmt)
-        
-        topic_stats = {} # {topic: {'correct': 0, 'total': 0}}
-        
-        for attempt, question in perf_result.all():
-            # Safely extract topic
-            topic = "General"
-            if question.tier_1_core_research:
-                tags = question.tier_1_core_research.get("hierarchical_tags", {})
-                if tags.get("topic"):
-                    topic = tags["topic"].get("name") or "General"
-            
-            if topic not in topic_stats:
-                topic_stats[topic] = {'correct': 0, 'total': 0}
-            
-            topic_stats[topic]['total'] += 1
-            if attempt.is_correct:
-                topic_stats[topic]['correct'] += 1
+        today = date.today()
+        progress, topics = await self.progress.get_progress(user_id)
+        if progress is not None:
+            aggregates = {
+                "attempted": progress.questions_attempted,
+                "total_seconds": progress.total_seconds,
+                "current_streak": self.progress.current_streak(progress, today),
+                "total_questions": await self.repo.count_all(),
+                "topics": topics,
+            }
+        else:
+            # No rollup yet (new user, or history predating rollups): aggregate from attempts
+            aggregates = await self.attempts.get_dashboard_aggregates(user_id, today)
+        recent_activity = await self.attempts.get_recent_activity(user_id, limit=3)
         
         # Calculate percentages
         topic_performance = {}
-        for topic, counts in topic_stats.items():
-            if counts['total'] > 0:
-                topic_performance[topic] = round((counts['correct'] / counts['total']) * 100, 1)
-
+        for topic, (correct, total) in aggregates["topics"].items():
+            if total > 0:
+                topic_performance[topic] = round((correct / total) * 100, 1)
+        
+        attempted_count = aggregates["attempted"]
+        total_questions = aggregates["total_questions"]
         percentage = 0.0
         if total_questions > 0:
             percentage = round((attempted_count / total_questions) * 100, 1)
-            
-        # Get Recent Activity
-        recent_stmt = (
-            select(UserAttempt, Question)
-            .join(Question, UserAttempt.question_id == Question.id)
-            .where(UserAttempt.user_id == user_id)
-            .order_by(UserAttempt.attempted_at.desc())
-            .limit(3)
-        )
-        recent_result = await self.repo.session.execute(recent_stmt)
         
-        recent_activity_items = []
-        for attempt, question in recent_result.all():
-            q_text = question.question_text
-            if len(q_text) > 100:
-                q_text = q_text[:100] + "..."
-                
-            recent_activity_items.append({
-                "question_id": question.question_id,
-                "question_text": q_text,
-                "is_correct": attempt.is_correct,
-                "attempted_at": attempt.attempted_at
-            })
-            
+        total_seconds = aggregates["total_seconds"]
         return DashboardStats(
             questions_attempted=attempted_count,
             attempt_percentage=percentage,
-            hours_studied=hours_studied,
-            time_studied_seconds=int(total_seconds),
-            current_streak=streak,
+            hours_studied=round(total_seconds / 3600, 1),
+            time_studied_seconds=total_seconds,
+            current_streak=aggregates["current_streak"],
             syllabus_progress=0.0,  # Placeholder for future implementation
             topic_performance=topic_performance,
-            recent_activity=recent_activity_items
+            recent_activity=recent_activity
         )
 
     async def record_attempt(self, user_id: int, question_id: str, is_correct: bool, time_taken: int) -> UserAttempt:
         """Record a user's attempt at a question."""
-        
-        # Convert string ID to UUID if needed, though we expect UUID here
-        # If question_id is a string like "GATE...", we need to find its UUID
-        try:
-            q_uuid = uuid.UUID(question_id)
-        except ValueError:
-            q = await self.repo.get_by_question_id(question_id)
-            if not q:
-                raise ValueError("Question not found")
-            q_uuid = q.id
+        attempts = await self.record_attempts(user_id, [(question_id, is_correct, time_taken)])
+        return attempts[0]
 
-        attempt = UserAttempt(
-            user_id=user_id,
-            question_id=q_uuid,
-            is_correct=is_correct,
-            time_taken_seconds=time_taken
-        )
-        self.repo.session.add(attempt)
-        await self.repo.session.commit()
-        await self.repo.session.refresh(attempt)
-        return attempt
+    async def record_attempts(self, user_id: int, items: list[tuple[str, bool, int]]) -> list[UserAttempt]:
+        """
+        Record a batch of (question_id, is_correct, time_taken) attempts in one transaction:
+        one lookup for string IDs, one rollup update and one multi-row insert.
+        Raises ValueError naming any unknown question IDs; nothing is recorded in that case.
+        """
+        resolved = await self.resolve_question_uuids([question_id for question_id, _, _ in items])
+        missing = sorted({q for q, _, _ in items if q not in resolved})
+        if missing:
+            raise ValueError("Question not found" if len(items) == 1 else f"Questions not found: {', '.join(missing)}")
+
+        now = datetime.utcnow()
+        attempts = [
+            UserAttempt(
+                user_id=user_id,
+                question_id=resolved[question_id],
+                is_correct=is_correct,
+                time_taken_seconds=time_taken,
+                attempted_at=now,
+            )
+            for question_id, is_correct, time_taken in items
+        ]
+        await self.store_attempts(attempts)
+        return attempts
 
+    async def resolve_question_uuids(self, question_ids: list[str]) -> dict[str, uuid.UUID]:
+        """
+        Map question IDs (string IDs like "GATE..." or UUIDs) to the UUIDs of
+        existing questions in one query. Unknown IDs, including well-formed
+        UUIDs of no question, are omitted.
+        """
+        return await self.repo.resolve_question_ids(question_ids)
 
+    async def find_question_uuid(self, question_id: str) -> Optional[uuid.UUID]:
+        """UUID of an existing question by UUID or string ID (cached), or None if it does not exist."""
+        question_uuid = question_id_cache.get(question_id)
+        if question_uuid is None:
+            question_uuid = await self.repo.find_question_uuid(question_id)
+            if question_uuid is not None:
+                question_id_cache.set(question_id, question_uuid)
+        return question_uuid
+
+    async def store_attempts(self, attempts: list[UserAttempt]) -> None:
+        """Insert attempts (any mix of users) and update their rollups in one commit."""
+        by_user: dict[int, list[UserAttempt]] = {}
+        for attempt in attempts:
+            by_user.setdefault(attempt.user_id, []).append(attempt)
+        # Rollups and leaderboards must see history before these attempts are inserted
+        scores: dict[int, list[tuple]] = {}
+        for user_id, user_attempts in by_user.items():
+            await self.progress.apply_attempts(user_id, user_attempts)
+            scores[user_id] = await self.leaderboards.on_attempts(user_id, user_attempts)
+        await self.stats.increment(attempts)
+        await self.attempts.insert_many(attempts)
+        # Practice queues are trimmed against history that includes these attempts
+        for user_id, user_attempts in by_user.items():
+            await self.practice.on_attempts(user_id, [a.question_id for a in user_attempts])
+        await self.repo.session.commit()
+        # In-memory boards only ever show committed scores
+        for user_id, user_scores in scores.items():
+            self.leaderboards.record_scores(user_id, user_scores)
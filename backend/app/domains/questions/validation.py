@@ -0,0 +1,122 @@
+"""
+Cached validators for question payloads.
+
+- Import paths validate through module-level TypeAdapters (built once), optionally
+  in strict mode for data from outside our pipeline.
+- Read paths build responses from our own DB rows in trusted mode, skipping
+  validation of the tier JSON we already validated on the way in. The stored
+  dicts are still reshaped to the tier models (unknown keys dropped, missing
+  defaults filled) so the output matches a validated read.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.domains.questions.models import Question
+from app.domains.questions.schemas import QuestionCreate, QuestionResponse, QuestionStatsSummary
+
+
+@lru_cache(maxsize=None)
+def get_adapter(tp: Any) -> TypeAdapter:
+    """Return a cached TypeAdapter; building one compiles the core schema, so reuse matters."""
+    return TypeAdapter(tp)
+
+
+def validate_question_create(data: dict, strict: bool = False) -> QuestionCreate:
+    """Validate a single import payload. Strict mode disables type coercion (e.g. "2019" -> 2019)."""
+    return get_adapter(QuestionCreate).validate_python(data, strict=strict)
+
+
+def validate_questions_json(content: Union[str, bytes], strict: bool = False) -> list[QuestionCreate]:
+    """
+    Validate an uploaded JSON document (one question or an array) straight from bytes,
+    skipping the intermediate json.loads dict tree.
+    """
+    adapter = get_adapter(Union[list[QuestionCreate], QuestionCreate])
+    parsed = adapter.validate_json(content, strict=strict)
+    return parsed if isinstance(parsed, list) else [parsed]
+
+
+# ============== Trusted construction ==============
+
+_RESPONSE_FIELDS = tuple(QuestionResponse.model_fields)
+
+Shaper = Callable[[Any], Any]
+
+
+@lru_cache(maxsize=None)
+def _shaper(tp: Any) -> Optional[Shaper]:
+    """
+    Compile a function that reshapes stored JSON to the type without validating
+    values: model dicts keep only declared fields and gain the defaults of missing
+    ones, recursing through Optional, lists and dict values. None if no reshaping is needed.
+    """
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        fields = [(name, field, _shaper(field.annotation)) for name, field in tp.model_fields.items()]
+
+        def shape_model(value: Any) -> Any:
+            if not isinstance(value, dict):
+                return value
+            shaped = {}
+            for name, field, inner in fields:
+                if name in value:
+                    item = value[name]
+                    shaped[name] = inner(item) if inner is not None and item is not None else item
+                elif not field.is_required():
+                    shaped[name] = field.get_default(call_default_factory=True)
+            return shaped
+        return shape_model
+
+    origin, args = get_origin(tp), get_args(tp)
+    if origin is Union:
+        shapers = {_shaper(arg) for arg in args if arg is not type(None)}
+        return shapers.pop() if len(shapers) == 1 else None
+    if origin is list and args:
+        inner = _shaper(args[0])
+        if inner is None:
+            return None
+        return lambda value: [inner(item) if item is not None else None for item in value] if isinstance(value, list) else value
+    if origin is dict and len(args) == 2:
+        inner = _shaper(args[1])
+        if inner is None:
+            return None
+        return lambda value: {k: inner(v) if v is not None else None for k, v in value.items()} if isinstance(value, dict) else value
+    return None
+
+
+_RESPONSE_SHAPERS = {name: _shaper(QuestionResponse.model_fields[name].annotation) for name in _RESPONSE_FIELDS}
+
+
+def question_response_from_row(
+    question: Question, trusted: bool = True, stats: Optional[QuestionStatsSummary] = None
+) -> QuestionResponse:
+    """
+    Build a QuestionResponse from a DB row, with optional joined attempt stats.
+    Trusted mode copies the columns without validation: tier JSON stays as plain
+    dicts rather than tier models, reshaped so that only declared keys are
+    kept and missing defaults are filled. Value types are not checked; rows must
+    come from validated imports.
+    """
+    if not trusted:
+        response = QuestionResponse.model_validate(question)
+        response.stats = stats
+        return response
+    values = {}
+    for name in _RESPONSE_FIELDS:
+        value = getattr(question, name, None)
+        shaper = _RESPONSE_SHAPERS[name]
+        values[name] = shaper(value) if shaper is not None and value is not None else value
+    values["stats"] = stats
+    return QuestionResponse.model_construct(**values)
+
+
+def dump_questions_json(questions: Union[QuestionResponse, list[QuestionResponse]]) -> bytes:
+    """
+    Serialize trusted responses with the cached adapter. Tier fields hold plain
+    dicts rather than tier models, so type-mismatch warnings are silenced.
+    """
+    if isinstance(questions, list):
+        return get_adapter(list[QuestionResponse]).dump_json(questions, warnings=False)
+    return get_adapter(QuestionResponse).dump_json(questions, warnings=False)
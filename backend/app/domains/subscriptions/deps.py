@@ -0,0 +1,35 @@
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_session, get_session
+from app.domains.auth.deps import get_current_user, get_optional_user
+from app.domains.auth.models import User
+from app.domains.subscriptions.service import SubscriptionService
+
+
+async def require_premium(
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session)
+) -> User:
+    """The current user, if they have an active trial or premium subscription (403 otherwise)."""
+    if not await SubscriptionService(session).is_premium(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Premium subscription required",
+        )
+    return current_user
+
+
+async def has_premium(
+    current_user: Optional[User] = Depends(get_optional_user),
+    session: AsyncSession = Depends(get_read_session)
+) -> bool:
+    """
+    Whether the caller (possibly anonymous) is entitled to premium content; never raises for anonymous.
+    For read-only GETs: shares the route's read session and never writes.
+    """
+    if current_user is None:
+        return False
+    return await SubscriptionService(session).is_premium(current_user.id, read_only=True)
@@ -4,6 +4,7 @@ from enum import Enum
 from typing import Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 
@@ -24,6 +25,14 @@ class SubscriptionStatus(str, Enum):
 class UserSubscription(SQLModel, table=True):
     """User subscription model."""
     __tablename__ = "user_subscriptions"
+    __table_args__ = (
+        # Expiry sweeps range-scan unexpired trials/premiums by end date; expiry
+        # flips the type to FREE, so expired rows drop out of these indexes
+        Index("ix_user_subscriptions_trial_end", "trial_end_date", "status",
+              postgresql_where=text("subscription_type = 'TRIAL'")),
+        Index("ix_user_subscriptions_premium_end", "premium_end_date", "status",
+              postgresql_where=text("subscription_type = 'PREMIUM'")),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
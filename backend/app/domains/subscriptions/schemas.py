@@ -11,7 +11,7 @@ from .models import SubscriptionType, SubscriptionStatus
 class SubscriptionResponse(BaseModel):
     """Subscription response schema."""
     id: UUID
-    user_id: UUID
+    user_id: int
     subscription_type: SubscriptionType
     status: SubscriptionStatus
     is_premium: bool
@@ -1,41 +1,178 @@
 """Subscription service."""
 from datetime import datetime
 from typing import Optional
-from uuid import UUID
 
+from sqlalchemy import Boolean, column, text
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+
 from .models import UserSubscription, SubscriptionType, SubscriptionStatus
 from .schemas import SubscriptionResponse
 
+# SubscriptionResponse by user id; entries never outlive the trial/premium end date
+entitlement_cache = TTLCache("entitlements", settings.entitlement_cache_size, settings.entitlement_cache_ttl_seconds)
+
+
+def invalidate_entitlement(user_id: int) -> None:
+    """Drop a user's cached entitlement (call after any subscription change)."""
+    entitlement_cache.pop(user_id)
+
+
+def _end_date(subscription: UserSubscription) -> Optional[datetime]:
+    if subscription.subscription_type == SubscriptionType.TRIAL:
+        return subscription.trial_end_date
+    if subscription.subscription_type == SubscriptionType.PREMIUM:
+        return subscription.premium_end_date
+    return None
+
 
 class SubscriptionService:
     """Service for managing user subscriptions."""
 
+    # Expires a lapsed trial/premium and returns the user's row in one round trip,
+    # flagged with whether this statement expired it. The main query sees the
+    # pre-update snapshot, so the unexpired row comes from the second branch only
+    # when the UPDATE matched nothing.
+    EXPIRE_SQL = text("""
+        WITH expired AS (
+            UPDATE user_subscriptions
+            SET status = 'EXPIRED', subscription_type = 'FREE', updated_at = :now
+            WHERE user_id = :user_id
+              AND ((subscription_type = 'TRIAL' AND trial_end_date < :now)
+                   OR (subscription_type = 'PREMIUM' AND premium_end_date < :now))
+            RETURNING *
+        )
+        SELECT expired.*, true AS was_expired FROM expired
+        UNION ALL
+        SELECT user_subscriptions.*, false FROM user_subscriptions
+        WHERE user_id = :user_id AND NOT EXISTS (SELECT 1 FROM expired)
+        LIMIT 1
+    """)
+
+    # One chunk of the batch sweep: lock up to :batch_size lapsed rows of one
+    # type, oldest first (skipping rows a request is expiring right now), and
+    # expire them. The ORDER BY keeps the planner on the partial end-date index;
+    # column stats still count expired rows' end dates and would pick a seq scan.
+    SWEEP_SQL = {
+        kind: text(f"""
+            WITH lapsed AS (
+                SELECT id FROM user_subscriptions
+                WHERE subscription_type = '{kind}' AND {end_column} < :now
+                ORDER BY {end_column}
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE user_subscriptions s
+            SET status = 'EXPIRED', subscription_type = 'FREE', updated_at = :now
+            FROM lapsed
+            WHERE s.id = lapsed.id
+            RETURNING s.user_id
+        """)
+        for kind, end_column in (("TRIAL", "trial_end_date"), ("PREMIUM", "premium_end_date"))
+    }
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_user_subscription(self, user_id: UUID) -> Optional[UserSubscription]:
+    async def get_user_subscription(self, user_id: int) -> Optional[UserSubscription]:
         """Get user's subscription."""
         statement = select(UserSubscription).where(UserSubscription.user_id == user_id)
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def create_trial_subscription(self, user_id: UUID, trial_days: int = 7) -> UserSubscription:
+    async def create_trial_subscription(self, user_id: int, trial_days: int = 7) -> UserSubscription:
         """Create a trial subscription for a new user."""
         subscription = UserSubscription.create_trial_subscription(user_id, trial_days)
         self.session.add(subscription)
         await self.session.commit()
         await self.session.refresh(subscription)
+        invalidate_entitlement(user_id)
+        return subscription
+
+    async def expire_and_get(self, user_id: int) -> Optional[UserSubscription]:
+        """The user's subscription, expired first if its trial/premium period has ended."""
+        row = (await self.session.execute(
+            select(UserSubscription, column("was_expired", Boolean))
+            .from_statement(self.EXPIRE_SQL)
+            .params(user_id=user_id, now=datetime.utcnow()),
+            execution_options={"populate_existing": True},
+        )).one_or_none()
+        if row is None:
+            return None
+        subscription, was_expired = row
+        if was_expired:
+            # Plain reads need no commit
+            await self.session.commit()
         return subscription
 
-    async def get_subscription_response(self, user_id: UUID) -> Optional[SubscriptionResponse]:
-        """Get subscription with computed fields for API response."""
-        subscription = await self.get_user_subscription(user_id)
+    async def get_subscription_response(
+        self, user_id: int, use_cache: bool = True, read_only: bool = False
+    ) -> Optional[SubscriptionResponse]:
+        """
+        Subscription with computed fields for API response, applying any
+        pending expiry first. Served from the entitlement cache when fresh.
+        With read_only (e.g. on a read session) the row is read as-is; a lapsed
+        period still reports is_premium=False, the expiry write is just left
+        to the next write path or the sweeper.
+        """
+        if use_cache:
+            cached = entitlement_cache.get(user_id)
+            if cached is not None:
+                return cached
+
+        if read_only:
+            subscription = await self.get_user_subscription(user_id)
+        else:
+            subscription = await self.expire_and_get(user_id)
         if not subscription:
             return None
+        response = self._to_response(subscription)
+
+        ttl = float(settings.entitlement_cache_ttl_seconds)
+        end_date = _end_date(subscription)
+        if end_date is not None:
+            ttl = min(ttl, (end_date - datetime.utcnow()).total_seconds())
+        if ttl > 0:
+            entitlement_cache.set(user_id, response, ttl_seconds=ttl)
+        return response
+
+    async def is_premium(self, user_id: int, read_only: bool = False) -> bool:
+        """Entitlement check for premium-gated features (cached)."""
+        response = await self.get_subscription_response(user_id, read_only=read_only)
+        return bool(response and response.is_premium)
 
+    async def expire_lapsed(self, batch_size: int = 1000) -> dict[str, int]:
+        """
+        Expire every lapsed trial and premium subscription in chunks of
+        batch_size, committing after each chunk so row locks stay short.
+        Safe alongside the request path and other sweepers (SKIP LOCKED; a
+        row's expiry is idempotent). Returns expired counts by type.
+        """
+        expired = {}
+        for kind, statement in self.SWEEP_SQL.items():
+            expired[kind.lower()] = 0
+            while True:
+                user_ids = (await self.session.execute(
+                    statement, {"now": datetime.utcnow(), "batch_size": batch_size}
+                )).scalars().all()
+                await self.session.commit()
+                for user_id in user_ids:
+                    invalidate_entitlement(user_id)
+                expired[kind.lower()] += len(user_ids)
+                if len(user_ids) < batch_size:
+                    break
+        return expired
+
+    async def check_and_expire_subscription(self, user_id: int) -> None:
+        """Check if subscription has expired and update status."""
+        await self.expire_and_get(user_id)
+        invalidate_entitlement(user_id)
+
+    @staticmethod
+    def _to_response(subscription: UserSubscription) -> SubscriptionResponse:
         # Compute is_premium and days_remaining
         is_premium = subscription.is_premium_active()
         trial_days = None
@@ -61,29 +198,3 @@ class SubscriptionService:
             created_at=subscription.created_at,
             updated_at=subscription.updated_at
         )
-
-    async def check_and_expire_subscription(self, user_id: UUID) -> None:
-        """Check if subscription has expired and update status."""
-        subscription = await self.get_user_subscription(user_id)
-        if not subscription:
-            return
-
-        now = datetime.utcnow()
-
-        # Check trial expiration
-        if subscription.subscription_type == SubscriptionType.TRIAL:
-            if subscription.trial_end_date and now > subscription.trial_end_date:
-                subscription.status = SubscriptionStatus.EXPIRED
-                subscription.subscription_type = SubscriptionType.FREE
-                subscription.updated_at = now
-                self.session.add(subscription)
-                await self.session.commit()
-
-        # Check premium expiration
-        elif subscription.subscription_type == SubscriptionType.PREMIUM:
-            if subscription.premium_end_date and now > subscription.premium_end_date:
-                subscription.status = SubscriptionStatus.EXPIRED
-                subscription.subscription_type = SubscriptionType.FREE
-                subscription.updated_at = now
-                self.session.add(subscription)
-                await self.session.commit()
@@ -2,14 +2,18 @@
 Aerogate API - GATE Aerospace Question Bank Backend
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from mangum import Mangum
 from contextlib import asynccontextmanager
 from loguru import logger
 
+from app.core.cache import cache_stats
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, async_session_maker, engine, read_engine
+from app.core.executors import ExecutorBusy, auth_executor
+from app.domains.questions import buffer
 from app.api.v1 import router as api_v1_router
 
 
@@ -24,17 +28,37 @@ async def lifespan(app: FastAPI):
     except OSError:
         logger.warning("Could not write to logs/app.log (likely running in Lambda/ReadOnly environment)")
     
-    # Initialize database tables
-    try:
-        await init_db()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.warning(f"Database initialization skipped: {e}")
+    # Initialize database tables (Lambda skips this DDL on cold start; see scripts/migrate.py)
+    if settings.init_db_on_startup:
+        try:
+            await init_db()
+            logger.info("Database initialized successfully")
+        except Exception as e:
+            logger.warning(f"Database initialization skipped: {e}")
+    
+    if settings.attempt_buffer_enabled:
+        buffer.attempt_buffer = buffer.AttemptBuffer(
+            async_session_maker,
+            max_size=settings.attempt_buffer_max_size,
+            flush_interval_ms=settings.attempt_buffer_flush_interval_ms,
+            flush_records=settings.attempt_buffer_flush_records,
+            spool_path=settings.attempt_buffer_spool_path or None,
+            max_retries=settings.attempt_buffer_max_retries,
+        )
+        await buffer.attempt_buffer.start()
+        logger.info("Write-behind attempt buffer started")
     
     yield
     
     # Shutdown
     logger.info("Shutting down Aerogate API...")
+    if buffer.attempt_buffer is not None:
+        await buffer.attempt_buffer.stop()
+        logger.info(f"Attempt buffer drained: {buffer.attempt_buffer.stats()}")
+        buffer.attempt_buffer = None
+    auth_executor.shutdown()
+    await engine.dispose()
+    await read_engine.dispose()
 
 
 # Create FastAPI app
@@ -56,6 +80,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(ExecutorBusy)
+async def executor_busy_handler(request: Request, exc: ExecutorBusy):
+    """A saturated worker pool (e.g. bcrypt during a signup burst) sheds load rather than queueing unboundedly."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Include API routes
 app.include_router(api_v1_router)
 
@@ -76,12 +111,17 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Detailed health check."""
-    return {
+    health = {
         "status": "healthy",
         "version": "1.0.0",
         "service": "aerogate-api",
         "database": "postgresql",
     }
+    if buffer.attempt_buffer is not None:
+        health["attempt_buffer"] = buffer.attempt_buffer.stats()
+    health["caches"] = cache_stats()
+    health["auth_executor"] = auth_executor.stats()
+    return health
 
 
 # Lambda Handler
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Per-request database latency for each db_pool_mode.
+
+Each simulated request opens a session, runs a primary-key lookup plus a
+small aggregate (a typical read handler) and commits, like get_session.
+Requests run --concurrency at a time against DATABASE_URL (or --url).
+
+"pgbouncer" mode only changes the client side (no pooling, no prepared
+statement cache); point --url at a real pgbouncer to measure the pooler.
+
+--read-only uses read engines (get_read_session): autocommit, no BEGIN/COMMIT.
+
+Usage: python scripts/bench_db_pool.py [--requests 300] [--concurrency 8] [--modes null,queue,pgbouncer]
+                                       [--read-only]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.database import build_engine
+
+LOOKUP_SQL = text("SELECT id, question_id FROM questions WHERE year = :year ORDER BY question_number LIMIT 1")
+COUNT_SQL = text("SELECT count(*) FROM questions WHERE year = :year")
+
+
+async def run_mode(url: str, mode: str, requests: int, concurrency: int, read_only: bool) -> None:
+    engine = build_engine(url, mode, read_only=read_only)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    latencies: list[float] = []
+
+    async def request():
+        started = time.perf_counter()
+        async with session_maker() as session:
+            await session.execute(LOOKUP_SQL, {"year": 2019})
+            await session.execute(COUNT_SQL, {"year": 2019})
+            if not read_only:
+                await session.commit()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    async def worker(n: int):
+        for _ in range(n):
+            await request()
+
+    # Warm-up (imports, first connections) is not counted
+    await asyncio.gather(*(request() for _ in range(concurrency)))
+    latencies.clear()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    latencies.sort()
+    p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+    print(f"  {mode:<10} p50 {statistics.median(latencies):6.2f} ms   p99 {p99:6.2f} ms   "
+          f"{len(latencies) / elapsed:7.0f} req/s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Per-request latency by connection pool mode")
+    parser.add_argument("--url", default=settings.database_url)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--modes", default="null,queue,pgbouncer")
+    parser.add_argument("--read-only", action="store_true", help="use read-only engines, as get_read_session does")
+    args = parser.parse_args()
+
+    print(f"⏱️  {args.requests} requests, {args.concurrency} concurrent, "
+          f"pool_size={settings.db_pool_size} max_overflow={settings.db_max_overflow}"
+          f"{' (read-only sessions)' if args.read_only else ''}")
+    for mode in args.modes.split(","):
+        await run_mode(args.url, mode.strip(), args.requests, args.concurrency, args.read_only)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
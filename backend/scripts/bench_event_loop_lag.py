@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Measure event-loop lag while password hashes are computed inline versus on
+the auth executor (app.core.executors).
+
+A ticker coroutine sleeps for --interval ms and records how late it wakes
+up; meanwhile --concurrency coroutines hash passwords in a loop. Inline
+bcrypt holds the loop for the whole hash, so every other request waits.
+
+Usage: python scripts/bench_event_loop_lag.py [--hashes 40] [--concurrency 8] [--interval 5]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.executors import auth_executor
+from app.domains.auth.services import get_password_hash, hash_password
+
+
+async def measure(label: str, hasher, hashes: int, concurrency: int, interval_ms: float) -> None:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        interval = interval_ms / 1000
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append((time.perf_counter() - started - interval) * 1000)
+
+    async def worker(n: int):
+        for _ in range(n):
+            await hasher("benchmark-password")
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    per_worker = max(hashes // concurrency, 1)
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+
+    lags.sort()
+    p99 = lags[min(int(len(lags) * 0.99), len(lags) - 1)]
+    print(f"  {label:<10} {per_worker * concurrency / elapsed:7.1f} hashes/s   "
+          f"lag p50 {statistics.median(lags):7.1f} ms   p99 {p99:7.1f} ms   max {lags[-1]:7.1f} ms")
+
+
+async def inline_hash(password: str) -> str:
+    return get_password_hash(password)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event-loop lag under bcrypt load")
+    parser.add_argument("--hashes", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--interval", type=float, default=5.0, help="ticker interval in ms")
+    args = parser.parse_args()
+
+    print(f"⏱️  {args.hashes} bcrypt hashes, {args.concurrency} concurrent, "
+          f"{auth_executor.max_workers} executor workers")
+    await measure("inline", inline_hash, args.hashes, args.concurrency, args.interval)
+    await measure("executor", hash_password, args.hashes, args.concurrency, args.interval)
+    auth_executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark question validation throughput (questions/sec) on tier-heavy documents.
+
+Compares the original per-call paths against the cached/trusted validators in
+app.domains.questions.validation, for both the import and the read side.
+
+Usage: python scripts/bench_validation.py [--count 2000] [--repeat 3]
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.domains.questions.schemas import QuestionCreate, QuestionResponse
+from app.domains.questions.validation import (
+    dump_questions_json,
+    get_adapter,
+    question_response_from_row,
+    validate_question_create,
+    validate_questions_json,
+)
+
+
+def make_document(i: int) -> dict:
+    """A question shaped like the pipeline output, with every tier populated."""
+    steps = [f"Step {s}: apply the relation for part {s} of Q{i}" for s in range(8)]
+    return {
+        "question_id": f"GATE_AE_2019_Q{i:04d}",
+        "exam_name": "GATE",
+        "subject": "Aerospace Engineering",
+        "year": 2019,
+        "question_number": i % 65 + 1,
+        "question_text": f"An aircraft of mass {1000 + i} kg flies at steady level flight. " * 4,
+        "question_text_latex": r"L = \frac{1}{2}\rho V^2 S C_L",
+        "question_type": "MCQ" if i % 3 else "NAT",
+        "marks": 2.0,
+        "negative_marks": 0.66,
+        "options": {"A": "10", "B": "20", "C": "30", "D": "40"},
+        "answer_key": "B",
+        "has_question_image": False,
+        "image_metadata": None,
+        "tier_0_classification": {
+            "content_type": "numerical", "media_type": "text", "difficulty_score": 6.5,
+            "complexity_flags": {
+                "requires_derivation": True, "multi_concept_integration": False,
+                "ambiguous_wording": False, "image_interpretation_complex": False,
+                "edge_case_scenario": False, "multi_step_reasoning": True, "approximation_needed": False,
+            },
+            "use_gpt51": False, "classification_confidence": 0.92,
+            "classification_reasoning": "Requires applying the lift equation", "combined_type": "numerical_text",
+            "weight_strategy": "balanced", "classification_method": "llm", "classifier_model": "classifier-v2",
+        },
+        "tier_1_core_research": {
+            "answer_validation": {"correct_answer": "B", "is_correct": True, "confidence": 0.9,
+                                  "confidence_type": "consensus", "reasoning": "All models agree"},
+            "explanation": {"question_nature": "Numerical", "step_by_step": steps,
+                            "formulas_used": ["L = W", "q = 0.5 rho V^2"], "estimated_time_minutes": 3},
+            "hierarchical_tags": {
+                "subject": {"name": "Aerodynamics", "code": "AE-2"},
+                "topic": {"name": "Lift and Drag"},
+                "concepts": [{"name": f"Concept {c}", "importance": "high", "consensus": "3/3"} for c in range(6)],
+            },
+            "prerequisites": {"essential": ["Bernoulli"], "helpful": ["Dimensional analysis"],
+                              "dependency_tree": {"lift": ["pressure", "velocity"]}},
+            "difficulty_analysis": {"overall": "Medium", "score": 6,
+                                    "complexity_breakdown": {"conceptual": 5.0, "computational": 6.0},
+                                    "estimated_solve_time_seconds": 180, "expected_accuracy_percent": 55,
+                                    "difficulty_factors": ["unit conversion", "multi-step"]},
+            "textbook_references": [{"book": "Fundamentals of Aerodynamics", "author": "Anderson",
+                                     "chapter_number": 4, "chapter_title": "Airfoils", "section": "4.3",
+                                     "page_range": "300-320", "relevance_score": 0.8} for _ in range(3)],
+            "video_references": [{"professor": "NPTEL", "video_url": "https://example.com/v",
+                                  "timestamp_start": "00:10", "timestamp_end": "05:00"} for _ in range(2)],
+            "step_by_step_solution": {"approach_type": "direct", "total_steps": 8, "solution_path": steps,
+                                      "key_insights": ["Lift equals weight in level flight"]},
+            "formulas_principles": [{"formula": "L = 0.5 rho V^2 S C_L", "name": "Lift equation",
+                                     "conditions": "steady", "type": "equation", "relevance": "core"}] * 3,
+            "real_world_applications": {"industry_examples": ["Airliner cruise"], "specific_systems": ["A320"],
+                                        "practical_relevance": "Cruise performance"},
+        },
+        "tier_2_student_learning": {
+            "common_mistakes": [{"mistake": "Forgetting density", "why_students_make_it": "Rushing",
+                                 "type": "conceptual", "severity": "high", "frequency": "common",
+                                 "how_to_avoid": "Write units", "consequence": "Wrong answer"}] * 4,
+            "mnemonics_memory_aids": [{"mnemonic": "Half Row Vee Squared", "concept": "dynamic pressure",
+                                       "effectiveness": "high", "context": "lift"}] * 2,
+            "flashcards": [{"card_type": "concept", "front": f"Front {c}", "back": f"Back {c}",
+                            "difficulty": "medium", "time_limit_seconds": 30} for c in range(6)],
+            "real_world_context": [{"application": "Cruise", "industry_example": "Airbus",
+                                    "why_it_matters": "Fuel burn"}] * 2,
+            "exam_strategy": {"priority": "high", "triage_tip": "Do early", "guessing_heuristic": "Eliminate",
+                              "time_management": "3 minutes"},
+        },
+        "tier_3_enhanced_learning": {
+            "search_keywords": ["lift", "drag", "level flight", "dynamic pressure"],
+            "alternative_methods": [{"name": "Energy method", "description": "Use energy balance",
+                                     "pros_cons": "Longer", "when_to_use": "Climbs"}] * 2,
+            "connections_to_other_subjects": {"Flight Mechanics": "Trim"},
+            "deeper_dive_topics": ["Thin airfoil theory"],
+        },
+        "tier_4_metadata": {
+            "model_meta": {"models_used": ["m1", "m2", "m3"], "model_count": 3, "weight_strategy": "balanced",
+                           "weights_applied": {"m1": 0.4, "m2": 0.3, "m3": 0.3}, "consensus_method": "vote",
+                           "debate_rounds": 2, "converged_fields_count": 40, "debated_fields_count": 5,
+                           "flagged_for_review": [], "gpt51_added_in_debate": False,
+                           "timestamp": "2025-01-01T00:00:00", "pipeline_version": "3.1"},
+            "quality_score": {"overall": 0.9, "band": "A", "metrics": {"accuracy": 0.95, "clarity": 0.88}},
+            "cost_breakdown": {"total_cost": 0.12, "currency": "USD", "per_model": {"m1": 0.05, "m2": 0.04},
+                               "classification_cost": 0.01, "image_consensus_cost": 0.0, "debate_cost": 0.02,
+                               "total_api_calls": 12},
+            "token_usage": {"total_input_tokens": 12000, "total_output_tokens": 4000, "total_tokens": 16000,
+                            "per_model": {"m1": {"input": 4000, "output": 1500, "total": 5500}}},
+            "processing_time": {"total_seconds": 42.0, "per_stage": {"generate": 30.0, "debate": 12.0},
+                                "bottleneck_stage": "generate", "parallel_generation_time": 30.0,
+                                "debate_time": 12.0},
+        },
+    }
+
+
+def as_row(doc: dict) -> SimpleNamespace:
+    """Mimic a Question row: attribute access, JSON tiers as plain dicts."""
+    now = datetime.utcnow()
+    return SimpleNamespace(**doc, id=uuid.uuid4(), created_at=now, updated_at=now)
+
+
+def bench(label: str, fn, items: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - started)
+    rate = len(items) / best
+    print(f"  {label:<46} {rate:>10,.0f} questions/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Question validation benchmark")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    docs = [make_document(i) for i in range(args.count)]
+    payloads = [json.dumps(d).encode() for d in docs]
+    rows = [as_row(d) for d in docs]
+    print(f"Documents: {args.count}, avg {sum(map(len, payloads)) // len(payloads)} bytes of JSON each\n")
+
+    print("Import path:")
+    before = bench("before: json.loads + QuestionCreate(**data)", lambda p: QuestionCreate(**json.loads(p)), payloads, args.repeat)
+    after = bench("after:  cached adapter validate_json (lax)", validate_questions_json, payloads, args.repeat)
+    bench("after:  cached adapter validate_json (strict)", lambda p: validate_questions_json(p, strict=True), payloads, args.repeat)
+    bench("after:  validate_question_create (dict input)", validate_question_create, docs, args.repeat)
+    print(f"  speedup: {after / before:.2f}x\n")
+
+    print("Read path (build response + serialize to JSON):")
+    adapter = get_adapter(QuestionResponse)
+    before = bench("before: model_validate(row) + dump_json", lambda r: adapter.dump_json(QuestionResponse.model_validate(r)), rows, args.repeat)
+    after = bench("after:  trusted construct + dump_questions_json", lambda r: dump_questions_json(question_response_from_row(r)), rows, args.repeat)
+    print(f"  speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Calibrate question difficulty/discrimination and user ability from attempts.
+
+Pulls first attempts per (user, question) from user_attempts as columnar
+arrays, fits a Rasch or 2PL model with NumPy (app.domains.questions.irt) and
+writes the parameters back to questions.irt_* and user_abilities.
+
+Usage: python scripts/calibrate_irt.py [--model 2pl|rasch] [--min-responses 20] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import async_session_maker, init_db
+from app.domains.questions.irt import fit_irt
+from app.domains.questions.repository import CalibrationRepository
+
+
+async def calibrate(model: str, min_responses: int, dry_run: bool):
+    await init_db()
+    async with async_session_maker() as session:
+        repo = CalibrationRepository(session)
+        started = time.perf_counter()
+        question_ids, user_ids, item_indexes, correct = await repo.load_responses(min_responses)
+        if not question_ids:
+            print(f"ℹ️  No question has {min_responses}+ responses yet. Nothing to calibrate.")
+            return
+        users, user_index = np.unique(np.asarray(user_ids, dtype=np.int64), return_inverse=True)
+        items = np.asarray(item_indexes, dtype=np.int64)
+        answers = np.asarray(correct, dtype=np.float64)
+        loaded = time.perf_counter()
+        print(f"📦 Loaded {len(answers)} responses: {len(users)} users x {len(question_ids)} questions "
+              f"({loaded - started:.2f}s)")
+
+        fit = fit_irt(user_index, items, answers, len(users), len(question_ids), model=model)
+        fitted = time.perf_counter()
+        status = "converged" if fit.converged else "NOT converged"
+        print(f"📈 {model.upper()} fit {status} after {fit.iterations} iterations ({fitted - loaded:.2f}s)")
+        print(f"  difficulty     mean {fit.difficulty.mean():+.2f}  range [{fit.difficulty.min():+.2f}, {fit.difficulty.max():+.2f}]")
+        print(f"  discrimination mean {fit.discrimination.mean():.2f}  range [{fit.discrimination.min():.2f}, {fit.discrimination.max():.2f}]")
+
+        if dry_run:
+            print("ℹ️  Dry run: nothing written.")
+            return
+
+        items_written = await repo.save_items(question_ids, fit.difficulty.tolist(), fit.discrimination.tolist())
+        responses = np.bincount(user_index, minlength=len(users))
+        users_written = await repo.save_abilities(users.tolist(), fit.ability.tolist(), responses.tolist())
+        await session.commit()
+        print(f"✅ Wrote {items_written} questions and {users_written} user abilities "
+              f"({time.perf_counter() - fitted:.2f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IRT calibration over user_attempts")
+    parser.add_argument("--model", choices=["2pl", "rasch"], default="2pl")
+    parser.add_argument("--min-responses", type=int, default=20, help="Minimum first attempts per question")
+    parser.add_argument("--dry-run", action="store_true", help="Fit and report without writing")
+    args = parser.parse_args()
+
+    asyncio.run(calibrate(args.model, args.min_responses, args.dry_run))
@@ -0,0 +1,53 @@
+"""
+Expire all lapsed trial and premium subscriptions.
+
+The request path only expires a subscription when its owner calls
+/subscriptions/me; run this from a scheduler (e.g. hourly) so reports and
+premium checks see up-to-date rows. Works in chunks and is safe to run
+while the API is serving and alongside another sweeper.
+
+Usage: python scripts/expire_subscriptions.py [--batch-size 1000] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import async_session_maker, init_db
+from app.domains.subscriptions.service import SubscriptionService
+
+LAPSED_SQL = text("""
+    SELECT
+        (SELECT count(*) FROM user_subscriptions WHERE subscription_type = 'TRIAL' AND trial_end_date < :now),
+        (SELECT count(*) FROM user_subscriptions WHERE subscription_type = 'PREMIUM' AND premium_end_date < :now)
+""")
+
+
+async def sweep(batch_size: int, dry_run: bool):
+    await init_db()
+    async with async_session_maker() as session:
+        if dry_run:
+            trials, premiums = (await session.execute(LAPSED_SQL, {"now": datetime.utcnow()})).one()
+            print(f"🔍 {trials} lapsed trials and {premiums} lapsed premium subscriptions would be expired")
+            return
+        started = time.perf_counter()
+        expired = await SubscriptionService(session).expire_lapsed(batch_size)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Expired {expired['trial']} trials and {expired['premium']} premium subscriptions "
+          f"in {elapsed:.2f}s (batch size {batch_size})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Expire lapsed subscriptions")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per update/commit")
+    parser.add_argument("--dry-run", action="store_true", help="only count lapsed subscriptions")
+    args = parser.parse_args()
+    asyncio.run(sweep(args.batch_size, args.dry_run))
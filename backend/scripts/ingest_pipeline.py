@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Direct-to-DB ingest pipeline for large backfills from frontend/output.
+
+Stages (connected by bounded queues so they overlap):
+  1. parse   - load + validate JSON with QuestionCreate and build the search soup (process pool)
+  2. embed   - generate embeddings for a batch of soups in one model call
+  3. write   - COPY each batch into a temp staging table, then INSERT ... ON CONFLICT DO NOTHING
+
+Usage: python scripts/ingest_pipeline.py <output_dir> [--workers N] [--batch-size N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.embedding import generate_embeddings
+from app.domains.questions.repository import build_search_content
+from app.domains.questions.schemas import QuestionCreate
+from uploader import chunked, find_all_json_files
+
+# Column order used for the COPY into the staging table
+COLUMNS = [
+    "id", "question_id", "exam_name", "subject", "year", "question_number",
+    "question_text", "question_text_latex", "question_type", "marks", "negative_marks",
+    "options", "answer_key", "has_question_image", "image_metadata",
+    "tier_0_classification", "tier_1_core_research", "tier_2_student_learning",
+    "tier_3_enhanced_learning", "tier_4_metadata",
+    "search_content", "embedding", "created_at", "updated_at",
+]
+JSON_COLUMNS = {
+    "options", "image_metadata", "tier_0_classification", "tier_1_core_research",
+    "tier_2_student_learning", "tier_3_enhanced_learning", "tier_4_metadata",
+}
+
+_DONE = object()  # Queue sentinel
+
+
+class StageTimer:
+    """Accumulates busy time and item counts for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.busy = 0.0
+        self.items = 0
+        self.batches = 0
+
+    def record(self, started: float, items: int) -> None:
+        self.busy += time.perf_counter() - started
+        self.items += items
+        self.batches += 1
+
+    def report(self) -> str:
+        rate = self.items / self.busy if self.busy else 0.0
+        return f"  {self.name:<7} {self.items:>7} items  {self.batches:>5} batches  {self.busy:>8.2f}s busy  {rate:>9.1f}/s"
+
+
+def _parse_files(paths: list) -> tuple[list, list]:
+    """
+    Process-pool worker: read, validate and flatten a chunk of files.
+    Returns (rows, errors); rows are plain dicts ready for the embed stage.
+    """
+    rows, errors = [], []
+    for path in paths:
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            items = data if isinstance(data, list) else [data]
+            for item in items:
+                question = QuestionCreate(**item).model_dump(mode="json")
+                question["search_content"] = build_search_content(question)
+                rows.append(question)
+        except (OSError, json.JSONDecodeError, ValidationError, AttributeError, TypeError) as e:
+            errors.append((str(path), str(e).splitlines()[0]))
+    return rows, errors
+
+
+def _to_record(row: dict, embedding: list, now: datetime) -> tuple:
+    """Turn a parsed row into a COPY record in COLUMNS order."""
+    values = dict(row, id=uuid.uuid4(), embedding=embedding, created_at=now, updated_at=now)
+    return tuple(
+        json.dumps(values[c]) if c in JSON_COLUMNS and values.get(c) is not None else values.get(c)
+        for c in COLUMNS
+    )
+
+
+async def parse_stage(files: list, workers: int, chunk_size: int, out: asyncio.Queue, timer: StageTimer, errors: list):
+    """Fan file chunks out to a process pool, feeding validated rows downstream in order of completion."""
+    loop = asyncio.get_running_loop()
+    in_flight = asyncio.Semaphore(workers * 2)
+
+    async def run(chunk):
+        async with in_flight:
+            started = time.perf_counter()
+            rows, chunk_errors = await loop.run_in_executor(pool, _parse_files, chunk)
+            timer.record(started, len(rows))
+            errors.extend(chunk_errors)
+            for row in rows:
+                await out.put(row)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        await asyncio.gather(*(run(chunk) for chunk in chunked(files, chunk_size)))
+    await out.put(_DONE)
+
+
+async def embed_stage(inp: asyncio.Queue, out: asyncio.Queue, batch_size: int, timer: StageTimer):
+    """Group rows into batches and embed each batch with a single model call off the event loop."""
+    done = False
+    while not done:
+        batch = []
+        while len(batch) < batch_size:
+            row = await inp.get()
+            if row is _DONE:
+                done = True
+                break
+            batch.append(row)
+        if not batch:
+            continue
+
+        started = time.perf_counter()
+        vectors = await asyncio.to_thread(generate_embeddings, [r["search_content"] for r in batch])
+        now = datetime.utcnow()
+        records = [_to_record(r, [float(x) for x in v], now) for r, v in zip(batch, vectors)]
+        timer.record(started, len(records))
+        await out.put(records)
+    await out.put(_DONE)
+
+
+async def write_stage(inp: asyncio.Queue, timer: StageTimer) -> int:
+    """COPY batches into a staging table and merge them, skipping question_ids already present."""
+    import asyncpg
+    from pgvector.asyncpg import register_vector
+
+    conn = await asyncpg.connect(settings.database_url.replace("+asyncpg", ""))
+    inserted = 0
+    try:
+        await register_vector(conn)
+        await conn.execute(
+            "CREATE TEMP TABLE questions_stage (LIKE questions INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        column_list = ", ".join(COLUMNS)
+        merge_sql = (
+            f"INSERT INTO questions ({column_list}) SELECT {column_list} FROM questions_stage "
+            "ON CONFLICT (question_id) DO NOTHING"
+        )
+        while True:
+            records = await inp.get()
+            if records is _DONE:
+                break
+            started = time.perf_counter()
+            async with conn.transaction():
+                await conn.copy_records_to_table("questions_stage", records=records, columns=COLUMNS)
+                status = await conn.execute(merge_sql)
+            inserted += int(status.split()[-1])
+            timer.record(started, len(records))
+    finally:
+        await conn.close()
+    return inserted
+
+
+async def run_pipeline(data_dir: Path, workers: int, batch_size: int, parse_chunk: int, queue_batches: int) -> None:
+    print(f"🔎 Scanning {data_dir}...")
+    files = sorted(find_all_json_files(data_dir))
+    print(f"📦 Found {len(files)} question files")
+    if not files:
+        return
+
+    timers = {name: StageTimer(name) for name in ("parse", "embed", "write")}
+    errors: list = []
+    # Bounded queues: rows waiting for embedding, and embedded batches waiting for the writer
+    parsed: asyncio.Queue = asyncio.Queue(maxsize=batch_size * queue_batches)
+    embedded: asyncio.Queue = asyncio.Queue(maxsize=queue_batches)
+
+    started = time.perf_counter()
+    _, _, inserted = await asyncio.gather(
+        parse_stage([str(f) for f in files], workers, parse_chunk, parsed, timers["parse"], errors),
+        embed_stage(parsed, embedded, batch_size, timers["embed"]),
+        write_stage(embedded, timers["write"]),
+    )
+    wall = time.perf_counter() - started
+
+    print(f"\n{'='*70}")
+    print(f"✅ Ingest complete in {wall:.2f}s ({timers['write'].items / wall:.1f} questions/s)")
+    print(f"  Inserted: {inserted}  Already present: {timers['write'].items - inserted}  Errors: {len(errors)}")
+    print("\nStage timings (busy time overlaps across stages):")
+    for timer in timers.values():
+        print(timer.report())
+
+    if errors:
+        print("\nFailed files:")
+        for path, error in errors[:20]:
+            print(f"  - {path}: {error[:120]}")
+        if len(errors) > 20:
+            print(f"  ... and {len(errors) - 20} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel direct-to-DB question ingest")
+    parser.add_argument("data_dir", type=Path, help="frontend/output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Parse processes")
+    parser.add_argument("--batch-size", type=int, default=256, help="Rows per embed/COPY batch")
+    parser.add_argument("--parse-chunk", type=int, default=64, help="Files per process-pool task")
+    parser.add_argument("--queue-batches", type=int, default=4, help="Batches buffered between stages")
+    args = parser.parse_args()
+
+    asyncio.run(run_pipeline(args.data_dir, args.workers, args.batch_size, args.parse_chunk, args.queue_batches))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,81 +1,182 @@
+"""
+Batched premium-tier ingest.
+
+Reads premium JSON files concurrently, groups their items into chunks and,
+per chunk, fetches tier hashes for all target rows with one IN query and
+applies only the changed tiers with one UPDATE ... FROM (VALUES ...).
+Each chunk commits on its own; finished files are recorded in a checkpoint
+so an interrupted run resumes where it stopped. As before batching, a tier
+key that is present but null clears the column; an absent key keeps it.
+
+Usage: python backend/scripts/ingest_premium_data.py <directory_path> [--chunk-size N] [--restart]
+"""
+import argparse
 import asyncio
+import hashlib
 import json
 import sys
-import os
 from pathlib import Path
-from typing import List
 
 # Add backend directory to path to allow imports
 sys.path.append(str(Path(__file__).parent.parent.parent / "backend"))
 
-from sqlmodel import select
+from sqlalchemy import select, func, cast, Text, text
 from app.core.database import get_session_context
 from app.domains.questions.models import Question
 
-async def ingest_file(session, file_path: Path):
-    """Reads a single JSON file and updates the matching question in the DB."""
+# Source key in the premium JSON -> column on questions.
+# Applied in order, so tier_4_metadata wins over tier_4_metadata_and_future.
+TIER_SOURCES = {
+    "tier_0_classification": "tier_0_classification",
+    "tier_1_core_research": "tier_1_core_research",
+    "tier_2_student_learning": "tier_2_student_learning",
+    "tier_3_enhanced_learning": "tier_3_enhanced_learning",
+    "tier_4_metadata_and_future": "tier_4_metadata",
+    "tier_4_metadata": "tier_4_metadata",
+}
+TIER_COLUMNS = list(dict.fromkeys(TIER_SOURCES.values()))
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_READERS = 16
+# asyncpg allows 32767 bind parameters per statement; each row binds its ID plus one per tier
+MAX_CHUNK_SIZE = 32767 // (1 + len(TIER_COLUMNS))
+CLEARED = "null"  # json.dumps(None): the tier is present in the file but null
+
+
+def tier_hash(json_text: str) -> str:
+    """Hash of a tier as stored; matches md5(column::text) for values written via json.dumps."""
+    return hashlib.md5(json_text.encode("utf-8")).hexdigest()
+
+
+def is_changed(json_text: str, current_hash) -> bool:
+    """Whether applying a tier changes the stored column (current_hash is None for NULL)."""
+    if json_text == CLEARED:
+        return current_hash is not None
+    return tier_hash(json_text) != current_hash
+
+
+def file_key(path: Path) -> str:
+    """Checkpoint key: a file is re-ingested if it is modified after being recorded."""
+    stat = path.stat()
+    return f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+class Checkpoint:
+    """Append-only list of files whose items have all been committed."""
+
+    def __init__(self, path: Path, restart: bool = False):
+        self.path = path
+        if restart and path.exists():
+            path.unlink()
+        self.done = set(path.read_text().splitlines()) if path.exists() else set()
+
+    def mark(self, keys: list) -> None:
+        with open(self.path, "a") as f:
+            f.writelines(k + "\n" for k in keys)
+        self.done.update(keys)
+
+
+def read_file(file_path: Path) -> list:
+    """Reads a single JSON file and returns its items (a file may hold one object or a list)."""
     try:
         with open(file_path, 'r') as f:
             data = json.load(f)
     except json.JSONDecodeError:
         print(f"Error decoding JSON: {file_path}")
-        return
+        return []
     except Exception as e:
         print(f"Error reading file {file_path}: {e}")
-        return
+        return []
+    return data if isinstance(data, list) else [data]
+
+
+async def read_files(paths: list, readers: int) -> list:
+    """Read files concurrently in worker threads, preserving input order."""
+    semaphore = asyncio.Semaphore(readers)
+
+    async def read(path):
+        async with semaphore:
+            return await asyncio.to_thread(read_file, path)
+
+    return await asyncio.gather(*(read(p) for p in paths))
+
 
-    # Handle if the file contains a list or a single object
-    if isinstance(data, list):
-        items = data
-    else:
-        items = [data]
-
-    for item in items:
-        q_id = item.get("question_id")
-        if not q_id:
-            continue
-
-        # Check if question exists
-        statement = select(Question).where(Question.question_id == q_id)
-        result = await session.execute(statement)
-        question = result.scalar_one_or_none()
-
-        if not question:
-            # Silent skip or verbose? Let's be verbose but concise
-            # print(f"  [SKIP] {q_id} not in DB.")
-            continue
-
-        updated = False
-        if "tier_0_classification" in item:
-            question.tier_0_classification = item["tier_0_classification"]
-            updated = True
-        
-        if "tier_1_core_research" in item:
-            question.tier_1_core_research = item["tier_1_core_research"]
-            updated = True
-        
-        if "tier_2_student_learning" in item:
-            question.tier_2_student_learning = item["tier_2_student_learning"]
-            updated = True
-            
-        if "tier_3_enhanced_learning" in item:
-            question.tier_3_enhanced_learning = item["tier_3_enhanced_learning"]
-            updated = True
-            
-        if "tier_4_metadata" in item:
-            question.tier_4_metadata = item["tier_4_metadata"]
-            updated = True
-        elif "tier_4_metadata_and_future" in item:
-             question.tier_4_metadata = item["tier_4_metadata_and_future"]
-             updated = True
-
-        if updated:
-            session.add(question)
-            print(f"  [OK] Updated {q_id}")
-
-async def traverse_and_ingest(root_dir: str):
+def collect_updates(paths: list, contents: list) -> tuple[dict, dict]:
     """
-    Recursively finds all .json files in root_dir and ingests them.
+    Flatten file contents into {question_id: {column: json_text}}.
+    Later files win for the same question, as they did when applied in sequence.
+    Also returns {question_id: [file keys]} for checkpoint accounting.
+    """
+    updates: dict = {}
+    sources: dict = {}
+    for key, items in zip(paths, contents):
+        for item in items:
+            q_id = item.get("question_id") if isinstance(item, dict) else None
+            if not q_id:
+                continue
+            tiers = updates.setdefault(q_id, {})
+            for source, column in TIER_SOURCES.items():
+                # Absent tiers are kept; a null tier clears the column
+                if source in item:
+                    tiers[column] = json.dumps(item[source])
+            sources.setdefault(q_id, []).append(key)
+    return updates, sources
+
+
+async def apply_chunk(chunk: dict) -> tuple[int, int, int]:
+    """
+    Apply one chunk of tier updates in its own transaction.
+    Returns (updated, unchanged, missing) question counts.
+    """
+    async with get_session_context() as session:
+        # One IN query for the hashes of every tier of every target row
+        hash_columns = [func.md5(cast(getattr(Question, c), Text)) for c in TIER_COLUMNS]
+        result = await session.execute(
+            select(Question.question_id, *hash_columns).where(Question.question_id.in_(list(chunk)))
+        )
+        existing = {row[0]: dict(zip(TIER_COLUMNS, row[1:])) for row in result.all()}
+
+        rows = []
+        for q_id, tiers in chunk.items():
+            current = existing.get(q_id)
+            if current is None:
+                continue
+            changed = {c: t for c, t in tiers.items() if is_changed(t, current[c])}
+            if changed:
+                rows.append((q_id, changed))
+
+        if rows:
+            params = {}
+            values = []
+            for i, (q_id, changed) in enumerate(rows):
+                params[f"q{i}"] = q_id
+                placeholders = [f":q{i}"]
+                for j, column in enumerate(TIER_COLUMNS):
+                    params[f"t{i}_{j}"] = changed.get(column)
+                    placeholders.append(f"CAST(:t{i}_{j} AS json)")
+                values.append(f"({', '.join(placeholders)})")
+
+            # Unchanged tiers are NULL in VALUES and fall back to the stored value; a JSON null clears the column
+            assignments = ", ".join(
+                f"{c} = CASE WHEN v.{c} IS NULL THEN q.{c} WHEN json_typeof(v.{c}) = 'null' THEN NULL ELSE v.{c} END"
+                for c in TIER_COLUMNS
+            )
+            await session.execute(
+                text(
+                    f"UPDATE questions AS q SET {assignments}, updated_at = now() at time zone 'utc' "
+                    f"FROM (VALUES {', '.join(values)}) AS v(question_id, {', '.join(TIER_COLUMNS)}) "
+                    "WHERE q.question_id = v.question_id"
+                ),
+                params,
+            )
+
+    missing = len(chunk) - len(existing)
+    return len(rows), len(existing) - len(rows), missing
+
+
+async def traverse_and_ingest(root_dir: str, chunk_size: int = DEFAULT_CHUNK_SIZE, readers: int = DEFAULT_READERS, restart: bool = False):
+    """
+    Recursively finds all .json files in root_dir and ingests them in chunks.
     """
     root_path = Path(root_dir)
     if not root_path.exists():
@@ -83,26 +184,58 @@ async def traverse_and_ingest(root_dir: str):
         return
 
     print(f"Scanning {root_dir}...")
-    json_files = list(root_path.rglob("*.json"))
-    print(f"Found {len(json_files)} JSON files to process.")
+    checkpoint = Checkpoint(root_path / ".premium_ingest_checkpoint", restart=restart)
+    json_files = sorted(root_path.rglob("*.json"))
+    keys = [file_key(p) for p in json_files]
+    pending = [(p, k) for p, k in zip(json_files, keys) if k not in checkpoint.done]
+    print(f"Found {len(json_files)} JSON files ({len(json_files) - len(pending)} already ingested).")
+    if not pending:
+        print("Nothing to do.")
+        return
+
+    contents = await read_files([p for p, _ in pending], readers)
+    updates, sources = collect_updates([k for _, k in pending], contents)
+    print(f"Read {len(updates)} questions from {len(pending)} files.")
+
+    # Files finish once every question they contributed to has been committed
+    outstanding = {k: 0 for _, k in pending}
+    for file_keys in sources.values():
+        for k in file_keys:
+            outstanding[k] += 1
+    checkpoint.mark([k for k, n in outstanding.items() if n == 0])
+
+    totals = {"updated": 0, "unchanged": 0, "missing": 0}
+    question_ids = list(updates)
+    for start in range(0, len(question_ids), chunk_size):
+        chunk_ids = question_ids[start:start + chunk_size]
+        updated, unchanged, missing = await apply_chunk({q: updates[q] for q in chunk_ids})
+        totals["updated"] += updated
+        totals["unchanged"] += unchanged
+        totals["missing"] += missing
+
+        finished = []
+        for q_id in chunk_ids:
+            for k in sources[q_id]:
+                outstanding[k] -= 1
+                if outstanding[k] == 0:
+                    finished.append(k)
+        checkpoint.mark(finished)
+        print(f"  [OK] Committed {min(start + chunk_size, len(question_ids))}/{len(question_ids)} "
+              f"(updated {updated}, unchanged {unchanged}, not in DB {missing})")
+
+    print(f"Ingestion complete. Updated {totals['updated']}, unchanged {totals['unchanged']}, "
+          f"not in DB {totals['missing']}.")
 
-    async with get_session_context() as session:
-        for i, file_path in enumerate(json_files):
-            # Print progress every 10 files
-            if i % 10 == 0:
-                print(f"Processing {i}/{len(json_files)}...")
-            
-            await ingest_file(session, file_path)
-        
-        print("Committing changes...")
-        await session.commit()
-    
-    print("Ingestion complete.")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python backend/scripts/ingest_premium_data.py <directory_path>")
-        sys.exit(1)
-    
-    dir_path = sys.argv[1]
-    asyncio.run(traverse_and_ingest(dir_path))
+    parser = argparse.ArgumentParser(description="Batched premium-tier ingest")
+    parser.add_argument("directory_path", help="Directory containing premium JSON files")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Questions per transaction (at most {MAX_CHUNK_SIZE})")
+    parser.add_argument("--readers", type=int, default=DEFAULT_READERS, help="Concurrent file reads")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and reprocess every file")
+    args = parser.parse_args()
+    if not 1 <= args.chunk_size <= MAX_CHUNK_SIZE:
+        parser.error(f"--chunk-size must be between 1 and {MAX_CHUNK_SIZE}")
+
+    asyncio.run(traverse_and_ingest(args.directory_path, args.chunk_size, args.readers, args.restart))
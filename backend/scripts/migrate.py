@@ -0,0 +1,33 @@
+"""
+Apply the database schema: create missing tables/indexes (create_all) and
+run the idempotent SCHEMA_UPGRADES.
+
+Deployments with INIT_DB_ON_STARTUP=false (Lambda) skip this DDL on cold
+start; run this once per deploy instead. Safe to re-run.
+
+Usage: python scripts/migrate.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlmodel import SQLModel
+
+from app.core.database import SCHEMA_UPGRADES, engine, init_db
+
+
+async def migrate():
+    print(f"🚀 Applying schema ({len(SQLModel.metadata.tables)} tables, {len(SCHEMA_UPGRADES)} upgrades)...")
+    started = time.perf_counter()
+    await init_db()
+    await engine.dispose()
+    print(f"✅ Schema up to date in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
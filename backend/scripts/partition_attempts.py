@@ -0,0 +1,117 @@
+"""
+Partition maintenance for user_attempts.
+
+Commands:
+  status                        show whether the table is partitioned and list partitions
+  convert                       one-off: rebuild user_attempts as monthly range partitions
+  ensure [--months-ahead N]     create upcoming monthly partitions (run from a monthly cron)
+  archive [--older-than N]      compact partitions older than N months into daily summaries
+          [--dry-run]           and per-question totals, and drop them
+
+What archiving keeps: per user and day, attempt/correct counts and study time
+(user_attempt_daily_summaries), so streaks and totals survive; per user and
+question, attempt/correct counts and the last correct attempt
+(user_archived_questions), so "attempted/solved before" checks, distinct
+question counts, topic accuracy and all-time leaderboards stay whole, and
+rebuild_progress.py / rebuild_leaderboards.py read both tables.
+
+What it loses: individual attempts. Rebuilds cannot recompute weekly
+leaderboards for archived weeks (their entries are kept as they were), and
+question_stats counts, solve-time percentiles and IRT calibration only cover
+unarchived months.
+
+Usage: python scripts/partition_attempts.py <command> [options]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import async_session_maker, init_db
+from app.domains.questions import partitions
+
+
+async def status():
+    async with async_session_maker() as session:
+        if not await partitions.is_partitioned(session):
+            print("ℹ️  user_attempts is not partitioned. Run 'convert' to migrate it.")
+            return
+        names = await partitions.list_partitions(session)
+        print(f"📦 user_attempts has {len(names)} monthly partitions (+ default):")
+        for name in names:
+            print(f"  - {name}")
+
+
+async def convert(months_ahead: int):
+    await init_db()
+    async with async_session_maker() as session:
+        if await partitions.is_partitioned(session):
+            print("✅ user_attempts is already partitioned.")
+            return
+        print("🚀 Converting user_attempts to monthly partitions (table is locked until done)...")
+        started = time.perf_counter()
+        copied = await partitions.convert_to_partitioned(session, months_ahead)
+        await session.commit()
+    print(f"✅ Copied {copied} attempts in {time.perf_counter() - started:.2f}s")
+
+
+async def ensure(months_ahead: int):
+    async with async_session_maker() as session:
+        if not await partitions.is_partitioned(session):
+            print("❌ user_attempts is not partitioned. Run 'convert' first.")
+            sys.exit(1)
+        created = await partitions.ensure_partitions(session, months_ahead)
+        await partitions.ensure_indexes(session)
+        await session.commit()
+    print(f"✅ Created {len(created)} partitions: {', '.join(created) or 'none needed'}")
+
+
+async def archive(older_than: int, dry_run: bool):
+    await init_db()  # Ensures the summary table exists
+    async with async_session_maker() as session:
+        if not await partitions.is_partitioned(session):
+            print("❌ user_attempts is not partitioned. Run 'convert' first.")
+            sys.exit(1)
+        targets = partitions.archivable(await partitions.list_partitions(session), older_than)
+
+    if not targets:
+        print(f"✅ No partitions older than {older_than} months.")
+        return
+    print(f"🗄️  {len(targets)} partitions older than {older_than} months: {', '.join(targets)}")
+    if dry_run:
+        return
+
+    # One transaction per partition, so an interruption never leaves a half-archived month
+    for name in targets:
+        started = time.perf_counter()
+        async with async_session_maker() as session:
+            summaries = await partitions.archive_partition(session, name)
+            await session.commit()
+        print(f"  [OK] {name}: {summaries} daily summaries ({time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="user_attempts partition maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status")
+    for name in ("convert", "ensure"):
+        sub = commands.add_parser(name)
+        sub.add_argument("--months-ahead", type=int, default=3, help="Future monthly partitions to keep ready")
+    sub = commands.add_parser("archive")
+    sub.add_argument("--older-than", type=int, default=12, help="Retention for raw attempts, in months")
+    sub.add_argument("--dry-run", action="store_true", help="List the partitions that would be archived")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        asyncio.run(status())
+    elif args.command == "convert":
+        asyncio.run(convert(args.months_ahead))
+    elif args.command == "ensure":
+        asyncio.run(ensure(args.months_ahead))
+    else:
+        asyncio.run(archive(args.older_than, args.dry_run))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the API (what a Lambda cold start pays before the
+first request), from `python -X importtime` in fresh interpreters.
+
+Reports the total, the heaviest top-level packages (self time summed over
+all their modules) and the heaviest single modules by cumulative time.
+With --budget-ms the exit code is 1 when the best total exceeds it, so the
+report can gate CI.
+
+Usage: python scripts/profile_imports.py [--module app.main] [--repeat 3] [--top 15] [--budget-ms 800]
+"""
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile(module: str) -> list[tuple[int, int, int, str]]:
+    """(self_us, cumulative_us, depth, name) per imported module, from one fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(f"❌ import {module} failed")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module import cost of the API")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh runs; the fastest is reported")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail when the total exceeds this")
+    args = parser.parse_args()
+
+    runs = [profile(args.module) for _ in range(args.repeat)]
+    rows = min(runs, key=lambda r: sum(self_us for self_us, _, _, _ in r))
+    total_ms = sum(self_us for self_us, _, _, _ in rows) / 1000
+
+    packages: dict[str, int] = defaultdict(int)
+    for self_us, _, _, name in rows:
+        packages[name.split(".")[0]] += self_us
+
+    print(f"⏱️  import {args.module}: {total_ms:.0f} ms over {len(rows)} modules (best of {args.repeat})\n")
+    print("Top-level packages (self time):")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {self_us / 10 / total_ms:5.1f}%  {name}")
+
+    print("\nModules (cumulative, incl. their imports):")
+    heaviest = sorted((row for row in rows if row[2] > 0), key=lambda row: -row[1])
+    for _, cumulative_us, depth, name in heaviest[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {'  ' * (depth - 1)}{name}")
+
+    if args.budget_ms is not None:
+        if total_ms > args.budget_ms:
+            print(f"\n❌ Over budget: {total_ms:.0f} ms > {args.budget_ms:.0f} ms")
+            sys.exit(1)
+        print(f"\n✅ Within budget: {total_ms:.0f} ms <= {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
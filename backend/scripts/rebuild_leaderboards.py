@@ -0,0 +1,34 @@
+"""
+Rebuild leaderboard entries (all-time and weekly) from user_attempts.
+
+Entries are maintained incrementally on every attempt write; run this once
+after deploying the table, or after fixing attempt data.
+Archived months (see partition_attempts.py) count toward all-time entries;
+weekly entries of archived weeks are left as they are.
+
+Usage: python scripts/rebuild_leaderboards.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import async_session_maker, init_db
+from app.domains.leaderboards.service import LeaderboardService
+
+
+async def rebuild():
+    await init_db()
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        written = await LeaderboardService(session).rebuild()
+        await session.commit()
+    print(f"✅ Rebuilt {written} leaderboard entries in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
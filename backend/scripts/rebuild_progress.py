@@ -0,0 +1,42 @@
+"""
+Rebuild progress rollups (user_progress / user_topic_progress) from user_attempts,
+plus the summaries of archived months (see partition_attempts.py).
+
+Run once after deploying the rollup tables to backfill existing history, or any
+time the rollups are suspected to have drifted.
+
+Usage: python scripts/rebuild_progress.py [--user-id N]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import async_session_maker, init_db
+from app.domains.progress.service import ProgressService
+
+
+async def rebuild(user_id=None):
+    await init_db()
+    scope = f"user {user_id}" if user_id is not None else "all users"
+    print(f"🚀 Rebuilding progress rollups for {scope}...")
+
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        written = await ProgressService(session).rebuild(user_id)
+        await session.commit()
+
+    print(f"✅ Rebuilt {written} user rollups in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild progress rollups from attempt history")
+    parser.add_argument("--user-id", type=int, help="Only rebuild this user's rollups")
+    args = parser.parse_args()
+
+    asyncio.run(rebuild(args.user_id))
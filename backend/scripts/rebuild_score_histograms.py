@@ -0,0 +1,58 @@
+"""
+Rebuild per-paper score histograms from stored submissions.
+
+Histograms are updated on every graded submission; run this after changing
+the bin layout, fixing an answer key, or on the first deploy of the table.
+
+Usage: python scripts/rebuild_score_histograms.py [--paper-id GATE_AE_2019]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import select
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import async_session_maker, init_db
+from app.domains.papers.models import PaperSubmission
+from app.domains.papers.service import PaperService
+
+
+async def rebuild(paper_id: Optional[str]):
+    await init_db()
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        if paper_id:
+            paper_ids = [paper_id]
+        else:
+            paper_ids = (await session.execute(select(PaperSubmission.paper_id).distinct())).scalars().all()
+        if not paper_ids:
+            print("ℹ️  No submissions yet. Nothing to rebuild.")
+            return
+
+        service = PaperService(session)
+        now = datetime.utcnow()
+        for pid in paper_ids:
+            key = await service.load_key(pid)
+            if key is None:
+                print(f"  [SKIP] {pid}: paper no longer exists")
+                continue
+            total = await service.histograms.rebuild(pid, key, now)
+            print(f"  [OK] {pid}: {total} submissions")
+        await session.commit()
+    print(f"✅ Rebuilt {len(paper_ids)} histograms in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild paper score histograms")
+    parser.add_argument("--paper-id", help="Only this paper (default: every paper with submissions)")
+    args = parser.parse_args()
+
+    asyncio.run(rebuild(args.paper_id))
@@ -0,0 +1,46 @@
+"""
+Refresh per-question attempt statistics.
+
+Attempt and correct counts are maintained on every recorded attempt; this job
+recomputes the p50/p90 solve-time percentiles from recent attempts. Run it
+periodically (e.g. hourly). --rebuild-counts resets the counters from
+user_attempts history, for the first deploy or after manual data fixes.
+
+Usage: python scripts/refresh_question_stats.py [--window-days 365] [--rebuild-counts]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.database import async_session_maker, init_db
+from app.domains.questions.repository import QuestionStatsRepository
+
+
+async def refresh(window_days: int, rebuild_counts: bool):
+    await init_db()
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        repo = QuestionStatsRepository(session)
+        if rebuild_counts:
+            rebuilt = await repo.rebuild_counts()
+            print(f"🔄 Rebuilt counters for {rebuilt} questions")
+        since = datetime.utcnow() - timedelta(days=window_days)
+        refreshed = await repo.refresh_percentiles(since)
+        await session.commit()
+    print(f"✅ Refreshed percentiles for {refreshed} questions in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh question attempt statistics")
+    parser.add_argument("--window-days", type=int, default=365, help="Attempts considered for percentiles")
+    parser.add_argument("--rebuild-counts", action="store_true", help="Reset counters from attempt history")
+    args = parser.parse_args()
+
+    asyncio.run(refresh(args.window_days, args.rebuild_counts))
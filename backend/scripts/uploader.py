@@ -0,0 +1,282 @@
+"""
+Shared uploader for pushing question JSON files to the bulk import endpoint.
+Groups files into batches and sends them over a pooled async HTTP client
+with bounded concurrency, retry/backoff and a local resume manifest.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import httpx
+
+DEFAULT_BATCH_SIZE = 25
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 120.0  # Embedding generation on the server can be slow
+
+# Statuses worth retrying: timeouts, rate limiting and transient server errors
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def find_all_json_files(base_dir: Path) -> list:
+    """Find all question JSON files in the output directory (year/ and year/question/ layout)."""
+    json_files = []
+    if not base_dir.exists():
+        print(f"Error: Data directory not found: {base_dir}")
+        return []
+
+    for year_dir in base_dir.iterdir():
+        if year_dir.is_dir() and year_dir.name.isdigit():
+            for item in year_dir.iterdir():
+                if item.is_file() and item.suffix == '.json':
+                    json_files.append(item)
+                elif item.is_dir():
+                    for subitem in item.iterdir():
+                        if subitem.is_file() and subitem.suffix == '.json':
+                            json_files.append(subitem)
+    return json_files
+
+
+def chunked(items: list, size: int) -> Iterable[list]:
+    """Yield successive fixed-size chunks from a list."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class UploadManifest:
+    """
+    Local record of files that the API has already accepted.
+    Entries are keyed by path and content hash, so edited files are re-sent.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.entries: dict[str, str] = {}
+        if path and path.exists():
+            try:
+                self.entries = json.loads(path.read_text()).get("files", {})
+            except (json.JSONDecodeError, OSError):
+                print(f"⚠️ Ignoring unreadable manifest: {path}")
+
+    def is_uploaded(self, key: str, digest: str) -> bool:
+        return self.entries.get(key) == digest
+
+    def mark_uploaded(self, uploaded: dict[str, str]) -> None:
+        self.entries.update(uploaded)
+        self.save()
+
+    def save(self) -> None:
+        """Write atomically so an interrupted run never leaves a truncated manifest."""
+        if not self.path:
+            return
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps({"files": self.entries}, indent=1, sort_keys=True))
+        os.replace(tmp_path, self.path)
+
+
+class _PendingFile:
+    """A parsed question file waiting to be uploaded."""
+
+    __slots__ = ("path", "key", "digest", "data")
+
+    def __init__(self, path: Path, key: str, digest: str, data):
+        self.path = path
+        self.key = key
+        self.digest = digest
+        self.data = data
+
+    @property
+    def question_id(self) -> str:
+        return self.path.stem
+
+
+def _load_pending(files: list, manifest: UploadManifest, base_dir: Optional[Path], results: dict) -> list:
+    """Read files, drop those already in the manifest and record unreadable ones as errors."""
+    pending = []
+    for path in sorted(files):
+        key = str(path.relative_to(base_dir)) if base_dir else str(path)
+        try:
+            raw = path.read_bytes()
+            data = json.loads(raw)
+        except (OSError, json.JSONDecodeError) as e:
+            results["error"] += 1
+            results["errors"].append({"question_id": path.stem, "error": f"Unreadable file: {e}"})
+            continue
+
+        digest = hashlib.sha1(raw).hexdigest()
+        if manifest.is_uploaded(key, digest):
+            results["skipped"] += 1
+            continue
+        pending.append(_PendingFile(path, key, digest, data))
+    return pending
+
+
+def _batch_payload(batch: list) -> bytes:
+    """Flatten a batch into the JSON array the bulk endpoint expects."""
+    questions = []
+    for item in batch:
+        if isinstance(item.data, list):
+            questions.extend(item.data)
+        else:
+            questions.append(item.data)
+    return json.dumps(questions).encode("utf-8")
+
+
+class Uploader:
+    """Uploads batches of question files to `/questions/import/bulk`."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        api_base: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ):
+        self.client = client
+        self.url = f"{api_base.rstrip('/')}/questions/import/bulk"
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.retries = retries
+        self.backoff = backoff
+
+    async def _post(self, batch: list) -> httpx.Response:
+        """POST a batch, retrying transient failures with exponential backoff and jitter."""
+        payload = _batch_payload(batch)
+        attempt = 0
+        while True:
+            try:
+                async with self.semaphore:
+                    response = await self.client.post(
+                        self.url,
+                        files={"file": ("batch.json", payload, "application/json")},
+                    )
+                if response.status_code not in RETRYABLE_STATUSES or attempt >= self.retries:
+                    return response
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    raise
+            attempt += 1
+            await asyncio.sleep(self.backoff * (2 ** (attempt - 1)) * (1 + random.random()))
+
+    async def upload(self, batch: list) -> dict:
+        """
+        Upload one batch. A rejected multi-file batch is bisected so a single
+        malformed question does not fail the files around it.
+        """
+        try:
+            response = await self._post(batch)
+        except httpx.TransportError as e:
+            return {"uploaded": [], "errors": [{"question_id": f.question_id, "error": str(e)} for f in batch]}
+
+        if response.status_code == 200:
+            return {"uploaded": batch, "errors": [], "imported": response.json().get("imported", 0)}
+
+        if len(batch) > 1 and response.status_code not in RETRYABLE_STATUSES:
+            mid = len(batch) // 2
+            left, right = await asyncio.gather(self.upload(batch[:mid]), self.upload(batch[mid:]))
+            return {
+                "uploaded": left["uploaded"] + right["uploaded"],
+                "errors": left["errors"] + right["errors"],
+                "imported": left.get("imported", 0) + right.get("imported", 0),
+            }
+
+        error = f"{response.status_code}: {response.text[:200]}"
+        return {"uploaded": [], "errors": [{"question_id": f.question_id, "error": error} for f in batch]}
+
+
+async def upload_files(
+    api_base: str,
+    files: list,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    manifest_path: Optional[Path] = None,
+    base_dir: Optional[Path] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    on_batch=None,
+) -> dict:
+    """
+    Upload question files in batches and return a summary.
+
+    `transport` lets tests target an in-process app; `on_batch` is called
+    with each batch result for progress reporting.
+    """
+    results = {"success": 0, "skipped": 0, "error": 0, "imported": 0, "errors": []}
+    manifest = UploadManifest(manifest_path)
+    pending = _load_pending(files, manifest, base_dir, results)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits, transport=transport) as client:
+        uploader = Uploader(client, api_base, concurrency, retries, backoff)
+        tasks = [asyncio.ensure_future(uploader.upload(batch)) for batch in chunked(pending, batch_size)]
+
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            if result["uploaded"]:
+                manifest.mark_uploaded({f.key: f.digest for f in result["uploaded"]})
+            results["success"] += len(result["uploaded"])
+            results["imported"] += result.get("imported", 0)
+            results["error"] += len(result["errors"])
+            results["errors"].extend(result["errors"])
+            if on_batch:
+                on_batch(result)
+
+    return results
+
+
+def add_upload_arguments(parser) -> None:
+    """Register the shared batching/retry options on an argparse parser."""
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Questions per request")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Requests in flight")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per batch on transient errors")
+    parser.add_argument("--manifest", type=Path, default=None, help="Resume manifest path (default: <data dir>/.upload_manifest.json)")
+    parser.add_argument("--no-manifest", action="store_true", help="Upload everything, ignoring any manifest")
+
+
+def run_upload(api_base: str, data_dir: Path, args) -> dict:
+    """Discover files under data_dir, upload them and print a summary."""
+    json_files = find_all_json_files(data_dir)
+    print(f"Found {len(json_files)} question files")
+    if not json_files:
+        return {"success": 0, "skipped": 0, "error": 0, "imported": 0, "errors": []}
+
+    manifest_path = None
+    if not args.no_manifest:
+        manifest_path = args.manifest or data_dir / ".upload_manifest.json"
+
+    done = 0
+
+    def progress(result):
+        nonlocal done
+        done += len(result["uploaded"]) + len(result["errors"])
+        for e in result["errors"]:
+            print(f"\n✗ Error {e['question_id']}: {e['error']}")
+        print(f"Uploaded {done} files...", end="\r")
+
+    start_time = time.time()
+    results = asyncio.run(upload_files(
+        api_base,
+        json_files,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        retries=args.retries,
+        manifest_path=manifest_path,
+        base_dir=data_dir,
+        on_batch=progress,
+    ))
+    duration = time.time() - start_time
+
+    print(f"\n\n{'='*50}")
+    print(f"Upload complete in {duration:.2f}s")
+    print(f"  ✅ Success:  {results['success']} ({results['imported']} new in DB)")
+    print(f"  ⏭️ Skipped:  {results['skipped']} (already in manifest)")
+    print(f"  ❌ Errors:   {results['error']}")
+    return results
@@ -6,6 +6,7 @@ from sqlmodel import SQLModel
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 from app.core.config import settings
+import app.core.database  # noqa: F401  (registers every table model for create_all)
 
 # Test database URL (use separate test database)
 TEST_DATABASE_URL = "postgresql+asyncpg://amitjatola@localhost:5432/aerogate_test"
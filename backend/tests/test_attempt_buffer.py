@@ -0,0 +1,119 @@
+"""Tests for the write-behind attempt buffer."""
+import asyncio
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domains.questions.buffer import AttemptBuffer
+from app.domains.questions.models import Question, UserAttempt
+from app.domains.questions.service import QuestionService, question_id_cache
+
+
+@pytest.fixture
+async def session_factory(test_engine):
+    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _count_attempts(session_factory, user_id: int) -> int:
+    async with session_factory() as session:
+        result = await session.execute(select(func.count()).where(UserAttempt.user_id == user_id))
+        return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_on_record_threshold_and_drains_on_stop(session_factory):
+    async with session_factory() as session:
+        session.add(Question(question_id="BUF_Q01", subject="Aerospace Engineering", year=2021, question_number=1,
+                             question_text="Buffered", question_type="MCQ", answer_key="A"))
+        await session.commit()
+
+    attempt_buffer = AttemptBuffer(session_factory, max_size=10, flush_interval_ms=60_000, flush_records=3)
+    assert attempt_buffer.submit(5201, "BUF_Q01", True, 5) is False  # not started yet
+    await attempt_buffer.start()
+
+    for _ in range(3):
+        assert attempt_buffer.submit(5201, "BUF_Q01", True, 5)
+    for _ in range(20):
+        if attempt_buffer.flushed == 3:
+            break
+        await asyncio.sleep(0.05)
+    assert await _count_attempts(session_factory, 5201) == 3
+
+    attempt_buffer.submit(5201, "BUF_Q01", False, 5)
+    attempt_buffer.submit(5201, "BUF_MISSING", False, 5)
+    await attempt_buffer.stop()
+
+    stats = attempt_buffer.stats()
+    assert stats["depth"] == 0
+    assert stats["flushed"] == 4
+    assert stats["invalid"] == 1
+    assert stats["dropped"] == 1
+    assert await _count_attempts(session_factory, 5201) == 4
+
+
+@pytest.mark.asyncio
+async def test_buffer_rejects_when_full_and_replays_spool(session_factory, tmp_path):
+    spool = tmp_path / "attempts.spool"
+    attempt_buffer = AttemptBuffer(session_factory, max_size=2, flush_interval_ms=60_000, flush_records=100,
+                                   spool_path=str(spool))
+    await attempt_buffer.start()
+    assert attempt_buffer.submit(5202, "BUF_SPOOL", True, 1)
+    assert attempt_buffer.submit(5202, "BUF_SPOOL", True, 1)
+    assert attempt_buffer.submit(5202, "BUF_SPOOL", True, 1) is False
+    assert len(spool.read_text().splitlines()) == 2
+
+    # Simulate a crash: abandon the buffer without draining, then start a new one
+    attempt_buffer._task.cancel()
+    replayed = AttemptBuffer(session_factory, flush_interval_ms=60_000, spool_path=str(spool))
+    await replayed.start()
+    assert replayed.depth == 2
+    await replayed.stop()
+    assert spool.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_poison_record_is_isolated_and_dead_lettered(session_factory, tmp_path):
+    async with session_factory() as session:
+        session.add(Question(question_id="BUF_POISON", subject="Aerospace Engineering", year=2021, question_number=3,
+                             question_text="Poison", question_type="MCQ", answer_key="A"))
+        await session.commit()
+
+    spool = tmp_path / "attempts.spool"
+    attempt_buffer = AttemptBuffer(session_factory, flush_interval_ms=60_000, flush_records=4, max_retries=2,
+                                   spool_path=str(spool))
+    await attempt_buffer.start()
+    for seconds in (1, 2, 2 ** 40, 3):  # The third overflows time_taken_seconds on every try
+        assert attempt_buffer.submit(5203, "BUF_POISON", True, seconds)
+
+    for _ in range(20):
+        if not attempt_buffer.depth:
+            break
+        try:
+            await attempt_buffer.flush()
+        except Exception:
+            pass
+    await attempt_buffer.stop()
+
+    stats = attempt_buffer.stats()
+    assert (stats["flushed"], stats["dead_lettered"], stats["batch_limit"]) == (3, 1, 4)
+    assert [r.time_taken_seconds for r in attempt_buffer.dead_letter] == [2 ** 40]
+    assert len(spool.with_suffix(".dead").read_text().splitlines()) == 1
+    assert spool.read_text() == ""
+    assert await _count_attempts(session_factory, 5203) == 3
+
+
+@pytest.mark.asyncio
+async def test_known_question_ids_are_cached_unknown_are_not(session):
+    question = Question(question_id="BUF_KNOWN", subject="Aerospace Engineering", year=2021, question_number=2,
+                        question_text="Known", question_type="MCQ", answer_key="A")
+    session.add(question)
+    await session.commit()
+
+    service = QuestionService(session)
+    assert await service.find_question_uuid("BUF_KNOWN") == question.id
+    assert await service.find_question_uuid(str(question.id)) == question.id
+    assert question_id_cache.get("BUF_KNOWN") == question.id
+
+    assert await service.find_question_uuid("BUF_UNKNOWN") is None
+    assert await service.find_question_uuid("00000000-0000-0000-0000-000000000000") is None
+    assert question_id_cache.get("BUF_UNKNOWN") is None
@@ -0,0 +1,129 @@
+"""Tests for batch attempt recording."""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domains.leaderboards.service import ALL_TIME, LeaderboardService, resolve_period
+from app.domains.questions.models import Question, UserArchivedQuestion, UserAttempt, UserAttemptDailySummary
+from app.domains.questions.service import QuestionService
+from app.domains.progress.service import ProgressService
+
+
+async def _make_questions(session, prefix: str, count: int) -> list[Question]:
+    questions = [
+        Question(
+            question_id=f"{prefix}_Q{i:02d}", subject="Aerospace Engineering", year=2020,
+            question_number=i, question_text=f"Question {i}", question_type="MCQ", answer_key="A",
+        )
+        for i in range(count)
+    ]
+    session.add_all(questions)
+    await session.commit()
+    return questions
+
+
+@pytest.mark.asyncio
+async def test_record_attempts_batch_updates_rollups_once(session):
+    questions = await _make_questions(session, "BATCH", 5)
+    service = QuestionService(session)
+
+    items = [(q.question_id, i % 2 == 0, 10) for i, q in enumerate(questions)]
+    items.append((str(questions[0].id), True, 5))  # UUIDs are accepted too
+    attempts = await service.record_attempts(user_id=4101, items=items)
+
+    assert len(attempts) == 6
+    progress, topics = await ProgressService(session).get_progress(4101)
+    assert progress.questions_attempted == 5
+    assert progress.total_seconds == 55
+    assert topics == {"General": (4, 6)}
+
+
+@pytest.mark.asyncio
+async def test_first_rollup_row_is_backfilled_from_history(session):
+    questions = await _make_questions(session, "BACKFILL", 3)
+    # History written before rollups existed: attempts with no user_progress row
+    session.add_all([
+        UserAttempt(user_id=4104, question_id=q.id, is_correct=True, time_taken_seconds=30,
+                    attempted_at=datetime.utcnow() - timedelta(days=3))
+        for q in questions[:2]
+    ])
+    await session.commit()
+
+    await QuestionService(session).record_attempts(user_id=4104, items=[(questions[2].question_id, False, 10)])
+
+    progress, topics = await ProgressService(session).get_progress(4104)
+    assert progress.questions_attempted == 3
+    assert progress.total_seconds == 70
+    assert progress.current_streak == 1
+    assert topics == {"General": (2, 3)}
+
+
+@pytest.mark.asyncio
+async def test_archived_questions_count_as_history(session):
+    questions = await _make_questions(session, "ARCHIVED", 1)
+    # A solve from a month whose partition was archived and dropped
+    solved_at = datetime.utcnow() - timedelta(days=400)
+    session.add_all([
+        UserArchivedQuestion(user_id=4105, question_id=questions[0].id, attempts=2, correct=1, last_correct_at=solved_at),
+        UserAttemptDailySummary(user_id=4105, day=solved_at.date(), attempts=2, correct=1, distinct_questions=1,
+                                total_seconds=40),
+    ])
+    await session.commit()
+
+    await QuestionService(session).record_attempts(user_id=4105, items=[(questions[0].question_id, True, 10)])
+
+    progress, topics = await ProgressService(session).get_progress(4105)
+    assert (progress.questions_attempted, progress.total_seconds) == (1, 50)
+    assert topics == {"General": (2, 3)}
+    leaderboards = LeaderboardService(session)
+    assert (await leaderboards.my_rank(4105, "solved", ALL_TIME)).score == 0  # Solved before, not again
+    assert (await leaderboards.my_rank(4105, "solved", resolve_period("week"))).score == 1
+
+    await ProgressService(session).rebuild(4105)
+    await leaderboards.rebuild()
+    await session.commit()
+    progress, topics = await ProgressService(session).get_progress(4105)
+    assert (progress.questions_attempted, progress.total_seconds) == (1, 50)
+    assert topics == {"General": (2, 3)}
+    assert (await leaderboards.my_rank(4105, "solved", ALL_TIME)).score == 1
+
+
+@pytest.mark.asyncio
+async def test_record_attempts_batch_rejects_unknown_ids(session):
+    questions = await _make_questions(session, "REJECT", 2)
+    service = QuestionService(session)
+    known = questions[0].question_id
+
+    phantom = "00000000-0000-0000-0000-00000000beef"
+    with pytest.raises(ValueError, match=phantom):
+        await service.record_attempts(user_id=4102, items=[(known, True, 1), (phantom, True, 1)])
+    await session.rollback()
+
+    with pytest.raises(ValueError, match="REJECT_MISSING"):
+        await service.record_attempts(
+            user_id=4102,
+            items=[(known, True, 1), ("REJECT_MISSING", True, 1)],
+        )
+    await session.rollback()
+
+    progress, _ = await ProgressService(session).get_progress(4102)
+    assert progress is None
+
+
+@pytest.mark.asyncio
+async def test_recorded_attempts_show_up_in_question_stats(session):
+    questions = await _make_questions(session, "STATS", 2)
+    service = QuestionService(session)
+    await service.record_attempts(user_id=4103, items=[
+        (questions[0].question_id, True, 20),
+        (questions[0].question_id, False, 40),
+    ])
+
+    stats = json.loads(await service.get_question_json(string_id=questions[0].question_id))["stats"]
+    assert stats["attempts"] == 2
+    assert stats["accuracy_percent"] == 50.0
+    assert stats["mean_seconds"] == 30.0
+
+    untouched = json.loads(await service.get_question_json(string_id=questions[1].question_id))
+    assert untouched["stats"] is None
@@ -81,3 +81,192 @@ async def test_duplicate_email_registration(session):
     # This should raise an exception (integrity error)
     with pytest.raises(Exception):
         await create_user(session, user_create2)
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_cached_and_dropped_on_deactivation(session):
+    """Resolved users are served from the principal cache until deactivated."""
+    from fastapi import HTTPException
+    from app.domains.auth.deps import get_current_user, principal_cache
+    from app.domains.auth.services import create_user_token, set_user_active
+
+    user = await create_user(session, UserCreate(email="cached@example.com", password="pw123456", full_name="Cached"))
+    token = create_user_token(user)
+
+    misses, hits = principal_cache.misses, principal_cache.hits
+    first = await get_current_user(token, session)
+    second = await get_current_user(token, session)
+    assert first.id == user.id and second is first
+    assert (principal_cache.misses - misses, principal_cache.hits - hits) == (1, 1)
+
+    # Old-style tokens (email subject only) still resolve
+    assert (await get_current_user(create_access_token({"sub": user.email}), session)).id == user.id
+
+    await set_user_active(session, user.id, False)
+    with pytest.raises(HTTPException):
+        await get_current_user(token, session)
+
+
+@pytest.mark.asyncio
+async def test_optional_user_falls_back_to_primary_on_replica_miss(session, test_engine, monkeypatch):
+    """A user the lagging replica does not show yet is found on the primary instead of getting a 401."""
+    from fastapi import HTTPException
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from app.core.database import build_engine
+    from app.domains.auth import deps
+    from app.domains.auth.models import User
+    from app.domains.auth.services import create_user_token
+    from tests.conftest import TEST_DATABASE_URL
+
+    user = await create_user(session, UserCreate(email="lagging@example.com", password="pw123456", full_name="Lag"))
+    token = create_user_token(user)
+    monkeypatch.setattr(deps, "async_session_maker",
+                        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False))
+
+    # An empty users table in a second database stands in for a replica that has not caught up
+    admin = build_engine(TEST_DATABASE_URL, "null")
+    async with admin.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if not (await conn.execute(text("SELECT 1 FROM pg_database WHERE datname = 'aerogate_test_replica'"))).first():
+            await conn.execute(text("CREATE DATABASE aerogate_test_replica"))
+    await admin.dispose()
+    replica = build_engine(TEST_DATABASE_URL.rsplit("/", 1)[0] + "/aerogate_test_replica", "null")
+    try:
+        async with replica.begin() as conn:
+            await conn.run_sync(lambda sync_conn: User.__table__.create(sync_conn, checkfirst=True))
+        async with async_sessionmaker(replica, class_=AsyncSession)() as read_session:
+            assert (await deps.get_optional_user(token, read_session)).id == user.id
+
+            stranger = create_access_token({"sub": "nobody@example.com", "uid": 987654})
+            with pytest.raises(HTTPException) as exc:
+                await deps.get_optional_user(stranger, read_session)
+            assert exc.value.status_code == 401
+    finally:
+        await replica.dispose()
+
+
+def _signing_material():
+    """An RSA signer plus the matching self-signed certificate in Google's v1 certs format."""
+    from datetime import datetime, timedelta, timezone
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+    from google.auth import crypt
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "stub-google")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1)).not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    signer = crypt.RSASigner.from_string(key_pem, key_id="stub-kid")
+    return signer, {"stub-kid": cert.public_bytes(serialization.Encoding.PEM).decode()}
+
+
+@pytest.mark.asyncio
+async def test_google_token_verified_off_loop_with_cached_certs(monkeypatch):
+    """Tokens verify against a local certs server, which is fetched once while its max-age holds."""
+    import json
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from google.auth import jwt
+    from app.core.config import settings
+    from app.domains.auth import services
+    from app.domains.auth.google_certs import google_request
+
+    signer, certs = _signing_material()
+    hits = []
+
+    class CertsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            body = json.dumps(certs).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", "public, max-age=300, must-revalidate")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CertsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(settings, "google_client_id", "test-client")
+    monkeypatch.setattr(settings, "google_certs_url", f"http://127.0.0.1:{server.server_port}/certs")
+    google_request.clear()
+
+    def token(**claims):
+        now = int(time.time())
+        payload = {"iss": "https://accounts.google.com", "aud": "test-client", "iat": now, "exp": now + 600,
+                   "email": "stub@example.com", "name": "Stub User", "email_verified": True}
+        payload.update(claims)
+        return jwt.encode(signer, payload).decode()
+
+    try:
+        for _ in range(3):
+            info = await services.verify_google_token(token())
+            assert info == {"email": "stub@example.com", "full_name": "Stub User", "email_verified": True}
+        assert len(hits) == 1
+
+        assert await services.verify_google_token(token(aud="someone-else")) is None
+        assert await services.verify_google_token(token(iss="https://evil.example.com")) is None
+        assert await services.verify_google_token("not-a-jwt") is None
+    finally:
+        server.shutdown()
+        google_request.clear()
+
+
+def test_cache_lifetime_headers():
+    from app.domains.auth.google_certs import cache_lifetime
+
+    assert cache_lifetime({"Cache-Control": "public, max-age=19599, must-revalidate"}) == 19599
+    assert cache_lifetime({"Cache-Control": "no-store"}) == 0
+    assert cache_lifetime({"Expires": "Thu, 01 Jan 1970 00:00:00 GMT"}) == 0
+    assert cache_lifetime({"Expires": "Fri, 01 Jan 2100 00:00:00 GMT"}) > 0
+    assert cache_lifetime({}) == 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_rejects_when_saturated():
+    import asyncio
+    import threading
+    from app.core.executors import BoundedExecutor, ExecutorBusy
+
+    executor = BoundedExecutor("test", max_workers=1, max_pending=2)
+    release = threading.Event()
+    try:
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorBusy):
+            await executor.run(release.wait)
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        assert executor.stats()["rejected"] == 1
+        assert executor.stats()["completed"] == 2
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_busy_is_a_503_on_every_route():
+    from app.core.executors import ExecutorBusy
+    from app.main import app, executor_busy_handler
+
+    assert app.exception_handlers[ExecutorBusy] is executor_busy_handler
+    response = await executor_busy_handler(None, ExecutorBusy("auth executor is saturated"))
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
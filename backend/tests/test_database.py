@@ -0,0 +1,83 @@
+"""Tests for engine construction per pool mode."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.core.database import build_engine
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode, pool_class", [
+    ("null", NullPool),
+    ("queue", AsyncAdaptedQueuePool),
+    ("pgbouncer", NullPool),
+])
+async def test_build_engine_modes(mode, pool_class):
+    engine = build_engine(TEST_DATABASE_URL, mode)
+    try:
+        assert isinstance(engine.pool, pool_class)
+        for _ in range(2):
+            async with engine.connect() as conn:
+                assert (await conn.execute(text("SELECT CAST(:n AS int) + 1"), {"n": 1})).scalar_one() == 2
+    finally:
+        await engine.dispose()
+
+
+def test_build_engine_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        build_engine(TEST_DATABASE_URL, "bogus")
+
+
+@pytest.mark.asyncio
+async def test_read_engine_rejects_writes_without_transactions():
+    engine = build_engine(TEST_DATABASE_URL, "null", read_only=True)
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SHOW transaction_read_only"))).scalar_one() == "on"
+            # No enclosing transaction: each statement gets its own now()
+            first = (await conn.execute(text("SELECT now()"))).scalar_one()
+            second = (await conn.execute(text("SELECT now() FROM pg_sleep(0.01)"))).scalar_one()
+            assert second > first
+            with pytest.raises(Exception, match="read-only"):
+                await conn.execute(text("CREATE TABLE read_only_probe (id int)"))
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pgbouncer_read_engine_sends_no_startup_settings():
+    """PgBouncer refuses unknown startup parameters, so read-only is left to the role/replica there."""
+    engine = build_engine(TEST_DATABASE_URL, "pgbouncer", read_only=True)
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SHOW transaction_read_only"))).scalar_one() == "off"
+            assert (await conn.execute(text("SELECT CAST(:n AS int) + 1"), {"n": 1})).scalar_one() == 2
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_session_routes_to_replica(monkeypatch):
+    """get_read_session is served by the read engine; a second local database stands in for the replica."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from app.core import database
+
+    admin = build_engine(TEST_DATABASE_URL, "null")
+    async with admin.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        exists = (await conn.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = 'aerogate_test_replica'")
+        )).first()
+        if not exists:
+            await conn.execute(text("CREATE DATABASE aerogate_test_replica"))
+    await admin.dispose()
+
+    replica = build_engine(TEST_DATABASE_URL.rsplit("/", 1)[0] + "/aerogate_test_replica", "null", read_only=True)
+    monkeypatch.setattr(database, "read_session_maker",
+                        async_sessionmaker(replica, class_=AsyncSession, expire_on_commit=False))
+    try:
+        async for session in database.get_read_session():
+            assert (await session.execute(text("SELECT current_database()"))).scalar_one() == "aerogate_test_replica"
+    finally:
+        await replica.dispose()
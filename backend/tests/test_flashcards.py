@@ -0,0 +1,91 @@
+"""Tests for the flashcard spaced-repetition scheduler."""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.flashcards import router
+from app.domains.auth.models import User
+from app.domains.flashcards.scheduler import MAX_EASE, MAX_INTERVAL_DAYS, MIN_EASE, CardState, review
+from app.domains.flashcards.schemas import FlashcardReviewItem
+from app.domains.flashcards.service import FlashcardService
+from app.domains.questions.models import Question
+from app.domains.subscriptions.deps import require_premium
+
+NOW = datetime(2026, 1, 1, 9, 0)
+
+
+def test_sm2_intervals_grow_and_lapses_reset():
+    state, due = review(None, 4, NOW)
+    assert (state.interval_days, state.repetitions, due) == (1, 1, NOW + timedelta(days=1))
+    state, _ = review(state, 4, NOW)
+    assert state.interval_days == 6
+    state, _ = review(state, 5, NOW)
+    assert state.interval_days == 15  # 6 * 2.5 (ease grew after the 5, but applies next time)
+
+    lapsed, due = review(state, 1, NOW)
+    assert (lapsed.interval_days, lapsed.repetitions, lapsed.lapses) == (1, 0, 1)
+    assert lapsed.ease < state.ease
+
+    floor = CardState(ease=MIN_EASE, interval_days=10, repetitions=3)
+    assert review(floor, 0, NOW)[0].ease == MIN_EASE
+
+
+def test_ease_is_capped_over_a_full_batch_of_easy_reviews():
+    state = None
+    for _ in range(500):  # FlashcardReviewRequest allows 500 items, all for the same card
+        state, _ = review(state, 5, NOW)
+    assert state.ease == MAX_EASE < 32767
+    assert state.interval_days == MAX_INTERVAL_DAYS
+    assert state.repetitions == 500
+
+
+@pytest.mark.asyncio
+async def test_enroll_due_and_batch_review(session):
+    question = Question(
+        question_id="FLASH_Q01", subject="Aerospace Engineering", year=2021, question_number=1,
+        question_text="Lift?", question_type="MCQ", answer_key="A",
+        tier_2_student_learning={"flashcards": [
+            {"card_type": "concept", "front": "Lift equation", "back": "L = 0.5 rho V^2 S CL"},
+            {"card_type": "formula", "front": "Drag polar", "back": "CD = CD0 + K CL^2"},
+        ]},
+    )
+    session.add(question)
+    await session.commit()
+
+    service = FlashcardService(session)
+    assert await service.enroll(6501, ["FLASH_Q01"]) == 2
+    assert await service.enroll(6501, ["FLASH_Q01"]) == 0  # Idempotent
+
+    due = await service.due(6501, limit=1)
+    assert due.has_more
+    assert (due.cards[0].card_index, due.cards[0].front) == (0, "Lift equation")
+
+    scheduled = await service.review(6501, [
+        FlashcardReviewItem(question_id=question.id, card_index=0, quality=4),
+        FlashcardReviewItem(question_id=question.id, card_index=1, quality=1),
+    ])
+    assert [s.interval_days for s in scheduled] == [1, 1]
+
+    assert (await service.due(6501)).cards == []
+    tomorrow = await service.due(6501, now=datetime.utcnow() + timedelta(days=1, minutes=1))
+    assert len(tomorrow.cards) == 2
+
+    # Out-of-range card indexes and other users' cards are rejected, not created
+    for user_id, card_index in [(6501, 7), (6503, 0)]:
+        with pytest.raises(ValueError, match="not in deck"):
+            await service.review(user_id, [FlashcardReviewItem(question_id=question.id, card_index=card_index, quality=5)])
+    later = datetime.utcnow() + timedelta(days=400)
+    assert len((await service.due(6501, now=later)).cards) == 2
+    assert (await service.due(6503, now=later)).cards == []
+
+
+@pytest.mark.asyncio
+async def test_flashcards_require_premium(session):
+    """Cards are tier-2 content: every flashcard route is gated, and a non-subscriber gets a 403."""
+    for route in router.routes:
+        assert require_premium in [d.call for d in route.dependant.dependencies], route.path
+
+    with pytest.raises(HTTPException) as exc:
+        await require_premium(current_user=User(id=6502, email="flash-free@test.com"), session=session)
+    assert exc.value.status_code == 403
@@ -0,0 +1,140 @@
+"""Tests for the vectorized paper grading engine."""
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.domains.papers.grading import (
+    CORRECT, UNANSWERED, WRONG, answer_keys, choice_mask, compile_key, encode_responses, grade, nat_range,
+)
+from app.domains.papers.histograms import Histogram, percentile_and_rank
+from app.domains.papers.schemas import PaperSubmissionRequest
+from app.domains.papers.service import PaperService
+from app.domains.questions.models import Question
+from app.domains.questions.service import invalidate_question_caches
+
+
+def q(question_id, question_type, answer_key, marks=1.0, negative_marks=0.33):
+    return SimpleNamespace(id=uuid.uuid4(), question_id=question_id, question_type=question_type,
+                           answer_key=answer_key, marks=marks, negative_marks=negative_marks)
+
+
+PAPER = [
+    q("Q1", "MCQ", "B"),
+    q("Q2", "MCQ", "C", marks=2.0, negative_marks=0.66),
+    q("Q3", "MSQ", "A;C", marks=2.0),
+    q("Q4", "NAT", "1.5 to 1.6", marks=2.0),
+    q("Q5", "NAT", "-3"),
+    q("Q6", "NAT", "see figure"),  # Unparseable key
+]
+
+
+def test_answer_key_parsing():
+    assert choice_mask("A;C") == choice_mask("c, a") == 0b101
+    assert choice_mask("a and c") == choice_mask("A AND C") == choice_mask("A & C") == 0b101
+    assert choice_mask("Z") == 0
+    assert nat_range("1.6 to 1.5") == (1.5, 1.6)
+    assert nat_range("-2.5:-2.4") == (-2.5, -2.4)
+    assert nat_range("0.25") == (0.25, 0.25)
+    assert nat_range("see figure") is None
+
+
+def test_grade_applies_marks_ranges_and_negative_marking():
+    key = compile_key(PAPER)
+    assert key.max_score == 8.0
+
+    masks, values = encode_responses(key, [{"Q1": "B", "Q2": "A", "Q3": "A", "Q4": 1.55, "Q5": "-3.0", "Q6": 4, "Q9": "A"}])
+    result = grade(key, masks[0], values[0])
+
+    assert result.status.tolist() == [CORRECT, WRONG, WRONG, CORRECT, CORRECT, UNANSWERED]
+    # Wrong MCQ loses negative marks; wrong MSQ does not
+    assert result.awarded.tolist() == pytest.approx([1.0, -0.66, 0.0, 2.0, 1.0, 0.0])
+    assert float(result.total) == pytest.approx(3.34)
+
+
+def test_batch_grading_is_vectorized():
+    rng = np.random.default_rng(0)
+    questions = [q(f"Q{i}", "NAT" if i % 4 == 0 else "MCQ", "2 to 3" if i % 4 == 0 else "ABCD"[i % 4]) for i in range(65)]
+    key = compile_key(questions)
+    n = 5000
+    masks = (1 << rng.integers(0, 4, (n, 65))).astype(np.uint8)
+    values = rng.uniform(0, 5, (n, 65))
+
+    started = time.perf_counter()
+    result = grade(key, masks, values)
+    elapsed = time.perf_counter() - started
+
+    assert result.total.shape == (n,)
+    single = grade(key, masks[17], values[17])
+    assert float(single.total) == pytest.approx(result.total[17])
+    assert elapsed < 1.0  # Thousands of submissions per second with ample headroom
+
+
+@pytest.mark.asyncio
+async def test_submit_grades_official_paper_and_records_attempts(session):
+    session.add_all([
+        Question(question_id="GATE_XE_1992_Q01", subject="Aerospace Engineering", year=1992, question_number=1,
+                 question_text="MCQ", question_type="MCQ", answer_key="B", marks=1.0, negative_marks=0.33),
+        Question(question_id="GATE_XE_1992_Q02", subject="Aerospace Engineering", year=1992, question_number=2,
+                 question_text="NAT", question_type="NAT", answer_key="9.7 to 9.9", marks=2.0, negative_marks=0.0),
+    ])
+    await session.commit()
+
+    service = PaperService(session)
+    graded = await service.submit(6301, "GATE_XE_1992", PaperSubmissionRequest(
+        answers={"GATE_XE_1992_Q01": "A", "GATE_XE_1992_Q02": 9.81}, time_taken_seconds=120,
+    ))
+    assert graded.score == pytest.approx(1.67)
+    assert graded.max_score == 3.0
+    assert (graded.correct, graded.wrong, graded.unanswered) == (1, 1, 0)
+
+    progress, _ = await service.questions.progress.get_progress(6301)
+    assert (progress.questions_attempted, progress.total_seconds) == (2, 120)
+    assert await service.submit(6301, "GATE_XE_1800", PaperSubmissionRequest(answers={})) is None
+
+
+def test_percentile_and_rank_from_histogram():
+    histogram = Histogram(low=0.0, bin_width=1.0, counts=[10, 20, 30, 40], total=100)
+    assert percentile_and_rank(histogram, 2.0) == (45.0, 41)
+    assert percentile_and_rank(histogram, 2.9) == (45.0, 41)
+    assert percentile_and_rank(histogram, 0.0) == (5.0, 91)
+    assert percentile_and_rank(histogram, 99) == (80.0, 1)
+    assert percentile_and_rank(Histogram(0.0, 1.0, [0, 0], 0), 1.0) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_histogram_tracks_submissions_and_rebuilds(session):
+    session.add_all([
+        Question(question_id=f"GATE_XE_1993_Q{i:02d}", subject="Aerospace Engineering", year=1993, question_number=i,
+                 question_text="MCQ", question_type="MCQ", answer_key="A", marks=1.0, negative_marks=0.33)
+        for i in range(1, 5)
+    ])
+    await session.commit()
+
+    service = PaperService(session)
+    ids = [f"GATE_XE_1993_Q{i:02d}" for i in range(1, 5)]
+    for user_id, right in zip(range(6401, 6405), range(4)):
+        graded = await service.submit(user_id, "GATE_XE_1993", PaperSubmissionRequest(
+            answers={qid: "A" for qid in ids[:right]},
+        ))
+    assert graded.rank == 1
+
+    predicted = await service.score_percentile("GATE_XE_1993", 2.0)
+    assert predicted.total_submissions == 4
+    assert (predicted.percentile, predicted.rank) == (62.5, 2)
+
+    key = await service.load_key("GATE_XE_1993")
+    before = await service.histograms.get("GATE_XE_1993")
+    assert await service.histograms.rebuild("GATE_XE_1993", key, datetime.utcnow()) == 4
+    assert await service.histograms.get("GATE_XE_1993") == before
+
+
+def test_question_invalidation_drops_answer_keys():
+    key = compile_key(PAPER)
+    answer_keys.set("GATE_ZZ_1990", (None, key))
+    assert answer_keys.get("GATE_ZZ_1990") == (None, key)
+    invalidate_question_caches()  # Registered by the papers domain; questions never imports it
+    assert answer_keys.get("GATE_ZZ_1990") is None
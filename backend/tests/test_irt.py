@@ -0,0 +1,48 @@
+"""Synthetic-data accuracy tests for the IRT calibration."""
+import time
+
+import numpy as np
+import pytest
+
+from app.domains.questions.irt import fit_irt
+
+
+def simulate(n_users=2000, n_items=150, per_user=60, seed=7):
+    rng = np.random.default_rng(seed)
+    ability = rng.normal(0.0, 1.0, n_users)
+    difficulty = rng.normal(0.0, 1.0, n_items)
+    discrimination = np.exp(rng.normal(0.0, 0.3, n_items))
+    users = np.repeat(np.arange(n_users), per_user)
+    items = np.concatenate([rng.choice(n_items, per_user, replace=False) for _ in range(n_users)])
+    p = 1.0 / (1.0 + np.exp(-discrimination[items] * (ability[users] - difficulty[items])))
+    correct = (rng.random(p.size) < p).astype(float)
+    return users, items, correct, ability, difficulty, discrimination
+
+
+def test_2pl_recovers_parameters():
+    users, items, correct, ability, difficulty, discrimination = simulate()
+    started = time.perf_counter()
+    fit = fit_irt(users, items, correct, len(ability), len(difficulty), model="2pl")
+    elapsed = time.perf_counter() - started
+
+    assert fit.converged
+    assert np.corrcoef(fit.difficulty, difficulty)[0, 1] > 0.98
+    assert np.corrcoef(fit.ability, ability)[0, 1] > 0.9
+    assert np.corrcoef(fit.discrimination, discrimination)[0, 1] > 0.7
+    assert np.abs(fit.difficulty - difficulty).mean() < 0.15
+    assert elapsed < 10  # 120k responses; generous bound for slow CI machines
+
+
+def test_rasch_orders_difficulty_and_centres_ability():
+    users, items, correct, ability, difficulty, _ = simulate(seed=11)
+    fit = fit_irt(users, items, correct, model="rasch")
+
+    assert fit.converged
+    assert np.allclose(fit.discrimination, 1.0)
+    assert abs(fit.ability.mean()) < 1e-9
+    assert np.corrcoef(fit.difficulty, difficulty)[0, 1] > 0.97
+
+
+def test_unknown_model_rejected():
+    with pytest.raises(ValueError):
+        fit_irt(np.array([0]), np.array([0]), np.array([1.0]), model="3pl")
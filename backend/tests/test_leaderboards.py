@@ -0,0 +1,132 @@
+"""Tests for incrementally maintained leaderboards."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domains.leaderboards import board
+from app.domains.leaderboards.board import TopN
+from app.domains.leaderboards.service import (
+    ALL_TIME,
+    WEEK_PERIOD,
+    LeaderboardService,
+    resolve_period,
+    week_period,
+    week_start,
+)
+from app.domains.questions.models import Question, UserAttempt
+from app.domains.progress.service import ProgressService
+from app.domains.questions.service import QuestionService
+
+
+def test_top_n_keeps_best_in_order():
+    top = TopN(3, [(1, 5), (2, 9), (3, 7), (4, 1)])
+    assert top.top(10) == [(2, 9), (3, 7), (1, 5)]
+
+    top.update(4, 8)  # Enters, evicting user 1
+    assert top.top(10) == [(2, 9), (4, 8), (3, 7)]
+    top.update(5, 2)  # Not good enough
+    assert top.top(10) == [(2, 9), (4, 8), (3, 7)]
+    assert not top.stale
+
+    top.update(2, 1)  # Leader drops to the edge; user 1 (score 5, off the board) is really ahead
+    assert top.stale
+
+    partial = TopN(5, [(1, 5), (2, 9)])
+    partial.update(2, 1)  # Not full: the board holds every scorer, so it stays exact
+    assert partial.top(10) == [(1, 5), (2, 1)]
+    assert not partial.stale
+
+
+def test_resolve_period_accepts_only_known_shapes():
+    assert resolve_period("all") == ALL_TIME
+    assert resolve_period("2026-W07") == "2026-W07"
+    assert WEEK_PERIOD.fullmatch(resolve_period("week"))
+    for bogus in ("random", "2026-W7", "2026-W07\n", ""):
+        with pytest.raises(ValueError):
+            resolve_period(bogus)
+
+
+def test_boards_are_held_in_a_bounded_cache():
+    board.clear()
+    for week in range(board._boards.max_size + 10):
+        board.set_board(f"2020-W{week:02d}", "solved", TopN(1))
+    assert len(board._boards) == board._boards.max_size
+
+
+@pytest.mark.asyncio
+async def test_attempts_update_boards_and_ranks(session):
+    questions = [
+        Question(question_id=f"BOARD_Q{i}", subject="Aerospace Engineering", year=2021, question_number=i,
+                 question_text="Q", question_type="MCQ", answer_key="A")
+        for i in range(3)
+    ]
+    session.add_all(questions)
+    await session.commit()
+    board.clear()
+
+    service = QuestionService(session)
+    leaderboards = LeaderboardService(session)
+    await service.record_attempts(6601, [(q.question_id, True, 5) for q in questions])
+    await service.record_attempts(6602, [("BOARD_Q0", True, 5), ("BOARD_Q1", False, 5)])
+
+    # Re-solving the same question is not counted again
+    await service.record_attempts(6602, [("BOARD_Q0", True, 5)])
+    rows = {row.user_id: row for row in (await leaderboards.top("solved", ALL_TIME)).rows}
+    assert rows[6601].score == 3 and rows[6602].score == 1
+    assert rows[6601].rank < rows[6602].rank
+
+    mine = await leaderboards.my_rank(6602, "solved", ALL_TIME)
+    leader = await leaderboards.my_rank(6601, "solved", ALL_TIME)
+    assert mine.score == 1 and leader.score == 3
+    assert mine.rank > leader.rank
+
+    weekly = await leaderboards.my_rank(6601, "solved", resolve_period("week"))
+    assert weekly.score == 3
+
+    # Uncommitted scores never reach the in-memory boards
+    before = board.get_board(ALL_TIME, "solved").top(10)
+    attempt = UserAttempt(user_id=6603, question_id=questions[2].id, is_correct=True,
+                          time_taken_seconds=5, attempted_at=datetime.utcnow())
+    assert await leaderboards.on_attempts(6603, [attempt])
+    assert board.get_board(ALL_TIME, "solved").top(10) == before
+    await session.rollback()
+
+    # Rebuilding from history gives the same entries
+    await leaderboards.rebuild()
+    await session.commit()
+    assert (await leaderboards.my_rank(6602, "solved", ALL_TIME)).score == 1
+    assert (await leaderboards.my_rank(6601, "solved", resolve_period("week"))).score == 3
+
+
+@pytest.mark.asyncio
+async def test_streaks_are_records_that_do_not_go_stale(session):
+    question = Question(question_id="STREAK_Q0", subject="Aerospace Engineering", year=2021, question_number=1,
+                        question_text="Q", question_type="MCQ", answer_key="A")
+    session.add(question)
+    # Monday to Wednesday three weeks ago, then nothing until today
+    monday = week_start(datetime.utcnow().date()) - timedelta(weeks=3)
+    session.add_all([
+        UserAttempt(user_id=6604, question_id=question.id, is_correct=False, time_taken_seconds=5,
+                    attempted_at=monday + timedelta(days=d, hours=9))
+        for d in range(3)
+    ])
+    await session.commit()
+    await ProgressService(session).rebuild(6604)
+    leaderboards = LeaderboardService(session)
+    await leaderboards.rebuild()
+    await session.commit()
+
+    old_week = week_period(monday.date())
+    assert (await leaderboards.my_rank(6604, "streak", ALL_TIME)).score == 3
+    assert (await leaderboards.my_rank(6604, "streak", old_week)).score == 3
+
+    # Coming back today restarts the current streak; the records stand
+    await QuestionService(session).record_attempts(6604, [("STREAK_Q0", True, 5)])
+    assert (await leaderboards.my_rank(6604, "streak", ALL_TIME)).score == 3
+    assert (await leaderboards.my_rank(6604, "streak", old_week)).score == 3
+    assert (await leaderboards.my_rank(6604, "streak", resolve_period("week"))).score == 1
+
+    await leaderboards.rebuild()
+    await session.commit()
+    assert (await leaderboards.my_rank(6604, "streak", ALL_TIME)).score == 3
+    assert (await leaderboards.my_rank(6604, "streak", resolve_period("week"))).score == 1
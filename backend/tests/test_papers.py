@@ -0,0 +1,103 @@
+"""Tests for the mock paper generator."""
+import random
+import uuid
+from collections import Counter
+
+import pytest
+
+from app.domains.papers.generator import (
+    DEFAULT_SECTION_WEIGHTS,
+    IndexedQuestion,
+    QuestionIndex,
+    SECTION_ORDER,
+    allocate,
+    syllabus_section,
+)
+from app.domains.papers.schemas import MockPaperRequest, PaperSubmissionRequest
+from app.domains.papers.service import PaperService
+from app.domains.questions.models import Question
+from app.domains.questions.service import invalidate_question_caches
+
+
+def make_index(per_bucket=6, years=range(2010, 2024)):
+    rng = random.Random(3)
+    questions = [
+        IndexedQuestion(uuid.uuid4(), rng.choice(list(years)), section, topic, band, qtype, rng.choice([1.0, 2.0]))
+        for section in SECTION_ORDER
+        for topic in ("A", "B")
+        for band in ("Easy", "Medium", "Hard")
+        for qtype in ("MCQ", "NAT")
+        for _ in range(per_bucket)
+    ]
+    return QuestionIndex(questions), questions
+
+
+def test_allocate_respects_weights_and_capacity():
+    assert allocate(10, {"a": 1, "b": 1}, {"a": 100, "b": 100}) == {"a": 5, "b": 5}
+    # Shortfall in "a" flows to "b"
+    assert allocate(10, {"a": 3, "b": 1}, {"a": 2, "b": 100}) == {"a": 2, "b": 8}
+    assert sum(allocate(7, {"a": 1, "b": 1, "c": 1}, {"a": 9, "b": 9, "c": 9}).values()) == 7
+    assert allocate(5, {"a": 1}, {"a": 0}) == {}
+
+
+def test_syllabus_section_normalizes_tags():
+    assert syllabus_section("Mathematics for Aerospace Engineers") == "Engineering Mathematics"
+    assert syllabus_section("Vibrations") == "Structures"
+    assert syllabus_section(None, "General Aptitude") == "General Aptitude"
+    assert syllabus_section("Orbital Mechanics") == "Space Dynamics"
+
+
+def test_sample_follows_gate_layout():
+    index, _ = make_index()
+    paper = index.sample(65, rng=random.Random(1))
+
+    assert len(paper) == 65
+    assert len({q.id for q in paper}) == 65
+    assert Counter(q.section for q in paper) == DEFAULT_SECTION_WEIGHTS
+    # Paper order: sections as in the real exam
+    positions = [SECTION_ORDER.index(q.section) for q in paper]
+    assert positions == sorted(positions)
+    bands = Counter(q.band for q in paper)
+    assert bands["Medium"] > bands["Hard"]
+
+
+def test_sample_filters_years_types_and_exclusions():
+    index, questions = make_index()
+    excluded = {q.id for q in questions[::2]}
+    paper = index.sample(40, year_from=2015, year_to=2018, question_types=["NAT"], exclude=excluded, rng=random.Random(2))
+
+    assert paper
+    assert all(2015 <= q.year <= 2018 and q.question_type == "NAT" and q.id not in excluded for q in paper)
+
+
+@pytest.mark.asyncio
+async def test_generate_skips_attempted_questions(session):
+    questions = [
+        Question(
+            question_id=f"PAPER_Q{i:02d}", subject="Aerospace Engineering", year=1991,
+            question_number=i, question_text=f"Question {i}", question_type="MCQ", answer_key="A",
+            tier_1_core_research={"hierarchical_tags": {"subject": {"name": "Aerodynamics"}, "topic": {"name": "Airfoils"}}},
+        )
+        for i in range(6)
+    ]
+    session.add_all(questions)
+    await session.commit()
+    invalidate_question_caches()
+
+    service = PaperService(session)
+    await service.questions.record_attempts(6201, [(q.question_id, True, 10) for q in questions[:4]])
+
+    paper = await service.generate(6201, MockPaperRequest(num_questions=65, year_from=1991, year_to=1991, seed=5))
+    assert {item.question_id for item in paper.questions} == {"PAPER_Q04", "PAPER_Q05"}
+    assert paper.composition == {"Aerodynamics": 2}
+    # Answers stay server-side until the paper is graded
+    assert not {"answer_key", "explanation"} & set(paper.model_dump()["questions"][0])
+
+    loaded = await service.get_paper(6201, paper.id)
+    assert [item.id for item in loaded.questions] == [item.id for item in paper.questions]
+
+    # Another user can neither load nor submit someone else's mock paper, cached or not
+    assert await service.load_key(str(paper.id), user_id=6202) is None
+    assert await service.load_key(str(paper.id), user_id=6201) is not None
+    assert await service.load_key(str(paper.id), user_id=6202) is None
+    assert await service.submit(6202, str(paper.id), PaperSubmissionRequest(answers={})) is None
@@ -0,0 +1,121 @@
+"""Tests for user_attempts partition naming, retention helpers and maintenance."""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import SQLModel
+
+from app.core.database import build_engine
+from app.domains.questions.models import UserArchivedQuestion, UserAttempt, UserAttemptDailySummary
+from app.domains.questions.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    archivable,
+    archive_partition,
+    convert_to_partitioned,
+    ensure_partitions,
+    list_partitions,
+    month_of,
+    partition_name,
+)
+from tests.conftest import TEST_DATABASE_URL
+
+# Converting rewrites user_attempts, so these run against a scratch database
+PARTITION_DB = "aerogate_test_partitions"
+
+
+def test_add_months_crosses_year_boundaries():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_partition_name_round_trip():
+    assert partition_name(date(2025, 3, 1)) == "user_attempts_p2025_03"
+    assert month_of("user_attempts_p2025_03") == date(2025, 3, 1)
+    assert month_of("user_attempts_default") is None
+
+
+def test_archivable_keeps_partitions_inside_retention():
+    names = [partition_name(date(2024, m, 1)) for m in range(1, 13)]
+    # 12 months before March 2025 is March 2024: January and February are fully older
+    assert archivable(names, older_than_months=12, today=date(2025, 3, 15)) == [
+        "user_attempts_p2024_01", "user_attempts_p2024_02",
+    ]
+
+
+
+@pytest.fixture
+async def partitioned_session():
+    """A session on a scratch database whose user_attempts has just been converted to partitions."""
+    admin = build_engine(TEST_DATABASE_URL, "null")
+    async with admin.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        exists = (await conn.execute(text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": PARTITION_DB})).first()
+        if not exists:
+            await conn.execute(text(f"CREATE DATABASE {PARTITION_DB}"))
+    await admin.dispose()
+
+    engine = build_engine(TEST_DATABASE_URL.rsplit("/", 1)[0] + f"/{PARTITION_DB}", "null")
+    tables = [UserAttempt.__table__, UserAttemptDailySummary.__table__, UserArchivedQuestion.__table__]
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "DROP TABLE IF EXISTS user_attempts, user_attempt_daily_summaries, user_archived_questions CASCADE"
+        ))
+        await conn.run_sync(lambda sync_conn: SQLModel.metadata.create_all(sync_conn, tables=tables))
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        await convert_to_partitioned(session, months_ahead=0)
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+async def _insert_attempts(session, user_id: int, times: list[datetime]) -> None:
+    await session.execute(text("""
+        INSERT INTO user_attempts (user_id, question_id, is_correct, time_taken_seconds, attempted_at)
+        SELECT :user_id, gen_random_uuid(), true, 10, t FROM unnest(CAST(:times AS timestamp[])) AS t
+    """), {"user_id": user_id, "times": times})
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_moves_rows_out_of_default(partitioned_session):
+    session = partitioned_session
+    future = add_months(date.today().replace(day=1), 2)
+    # Written before the partition existed: routed to the default partition
+    await _insert_attempts(session, 7001, [datetime(future.year, future.month, 5), datetime(future.year, future.month, 20)])
+
+    created = await ensure_partitions(session, months_ahead=3)
+    await session.commit()
+
+    assert partition_name(future) in created
+    assert partition_name(future) in await list_partitions(session)
+    moved = (await session.execute(text(f"SELECT count(*) FROM {partition_name(future)}"))).scalar_one()
+    left = (await session.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}"))).scalar_one()
+    assert (moved, left) == (2, 0)
+    assert await ensure_partitions(session, months_ahead=3) == []
+
+
+@pytest.mark.asyncio
+async def test_archive_partition_summarizes_and_drops(partitioned_session):
+    session = partitioned_session
+    old = add_months(date.today().replace(day=1), -14)
+    await ensure_partitions(session, months_ahead=0, today=old)
+    day = datetime(old.year, old.month, 3, 9)
+    await _insert_attempts(session, 7002, [day, day.replace(hour=10), day.replace(day=4)])
+    await session.commit()
+
+    names = archivable(await list_partitions(session), older_than_months=12)
+    assert names == [partition_name(old)]
+    assert await archive_partition(session, names[0]) == 2
+    await session.commit()
+
+    assert partition_name(old) not in await list_partitions(session)
+    summaries = (await session.execute(text(
+        "SELECT day, attempts, total_seconds FROM user_attempt_daily_summaries WHERE user_id = 7002 ORDER BY day"
+    ))).all()
+    assert [tuple(row) for row in summaries] == [(day.date(), 2, 20), (day.date().replace(day=4), 1, 10)]
+    # Each attempt had its own question: all three stay known as solved
+    solved = (await session.execute(text(
+        "SELECT count(*), max(last_correct_at) FROM user_archived_questions WHERE user_id = 7002 AND correct = 1"
+    ))).one()
+    assert tuple(solved) == (3, day.replace(day=4))
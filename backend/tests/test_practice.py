@@ -0,0 +1,102 @@
+"""Tests for the precomputed practice queue."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.domains.questions.models import Question
+from app.domains.questions.service import QuestionService
+from app.domains.practice.service import PracticeService, rebuild_in_background
+
+
+@pytest.mark.asyncio
+async def test_queue_prefers_weak_topics_and_skips_attempted(session):
+    questions = [
+        Question(
+            question_id=f"PRACTICE_Q{i:02d}", subject="Aerospace Engineering", year=2022,
+            question_number=i, question_text=f"Question {i}", question_type="MCQ", answer_key="A",
+            tier_0_classification={"difficulty_score": 5},
+            tier_1_core_research={"hierarchical_tags": {"topic": {"name": "Weak" if i % 2 else "Strong"}}},
+        )
+        for i in range(20)
+    ]
+    session.add_all(questions)
+    await session.commit()
+
+    practice = PracticeService(session)
+    await practice.next_question(6101)  # Builds the queue
+
+    # Wrong on every "Weak" question tried, right on every "Strong" one;
+    # REFRESH_EVERY attempts mark the queue for a re-rank with the new topic accuracy
+    service = QuestionService(session)
+    tried = questions[:PracticeService.REFRESH_EVERY]
+    await service.record_attempts(6101, [(q.question_id, q.question_number % 2 == 0, 10) for q in tried])
+
+    # Recording only trims; the ranking query waits for the next request
+    since_refresh = (await session.execute(text(
+        "SELECT attempts_since_refresh FROM user_practice_queues WHERE user_id = 6101"
+    ))).scalar_one()
+    assert since_refresh == PracticeService.REFRESH_EVERY
+
+    head, remaining = await practice.next_question(6101)
+    assert head not in {q.id for q in tried}
+    item = await service.get_list_item(head)
+    assert item.topic == "Weak"
+
+    skipped_to, _ = await practice.skip(6101)
+    assert skipped_to != head
+
+
+@pytest.mark.asyncio
+async def test_exhausted_queue_is_not_rebuilt_until_cooldown(session):
+    practice = PracticeService(session)
+    await practice.next_question(6102)
+    built_at = datetime.utcnow()
+    await session.execute(text(
+        "UPDATE user_practice_queues SET question_ids = '{}', refreshed_at = :at WHERE user_id = 6102"
+    ), {"at": built_at})
+
+    assert await practice.next_question(6102) == (None, 0)
+    assert await practice.skip(6102) == (None, 0)
+    refreshed_at = (await session.execute(text(
+        "SELECT refreshed_at FROM user_practice_queues WHERE user_id = 6102"
+    ))).scalar_one()
+    assert refreshed_at == built_at
+
+    await session.execute(text(
+        "UPDATE user_practice_queues SET refreshed_at = :at WHERE user_id = 6102"
+    ), {"at": built_at - PracticeService.REBUILD_COOLDOWN - timedelta(minutes=1)})
+    head, remaining = await practice.next_question(6102)
+    assert head is not None and remaining > 0
+
+
+@pytest.mark.asyncio
+async def test_stale_queue_is_served_while_rebuilt_in_background(session, test_engine):
+    questions = [
+        Question(
+            question_id=f"STALE_Q{i:02d}", subject="Aerospace Engineering", year=2023,
+            question_number=i, question_text=f"Question {i}", question_type="MCQ", answer_key="A",
+        )
+        for i in range(PracticeService.REFRESH_EVERY + 5)
+    ]
+    session.add_all(questions)
+    await session.commit()
+
+    scheduled = []
+    practice = PracticeService(session, schedule_rebuild=scheduled.append)
+    await practice.next_question(6103)  # A missing queue is built inline
+    assert scheduled == []
+
+    tried = questions[:PracticeService.REFRESH_EVERY]
+    await QuestionService(session).record_attempts(6103, [(q.question_id, True, 10) for q in tried])
+    head, remaining = await practice.next_question(6103)
+    assert scheduled == [6103]
+    assert head is not None and head not in {q.id for q in tried}
+    since_refresh = "SELECT attempts_since_refresh FROM user_practice_queues WHERE user_id = 6103"
+    assert (await session.execute(text(since_refresh))).scalar_one() == PracticeService.REFRESH_EVERY
+    await session.commit()
+
+    factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    assert await rebuild_in_background(factory, 6103)
+    assert (await session.execute(text(since_refresh))).scalar_one() == 0
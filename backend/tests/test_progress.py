@@ -0,0 +1,24 @@
+"""Tests for progress rollup helpers."""
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.domains.progress.service import ProgressService, _day_runs
+
+
+def test_day_runs_trailing_and_longest():
+    d = date(2025, 3, 10)
+    days = [d, d + timedelta(days=1), d + timedelta(days=2), d + timedelta(days=5), d + timedelta(days=6), d]
+    assert _day_runs(days) == (d + timedelta(days=6), 2, 3)
+
+
+def test_day_runs_single_day():
+    d = date(2025, 3, 10)
+    assert _day_runs([d, d]) == (d, 1, 1)
+
+
+def test_current_streak_expires_after_a_missed_day():
+    today = date(2025, 3, 10)
+    progress = SimpleNamespace(current_streak=4, last_activity_date=today - timedelta(days=1))
+    assert ProgressService.current_streak(progress, today) == 4
+    progress.last_activity_date = today - timedelta(days=2)
+    assert ProgressService.current_streak(progress, today) == 0
@@ -0,0 +1,18 @@
+"""Cold-start guards: heavy modules stay out of `import app.main`."""
+import subprocess
+import sys
+from pathlib import Path
+
+LAZY_MODULES = ("numpy", "jose", "google.oauth2", "google.auth.transport.requests", "requests")
+
+
+def test_heavy_modules_are_lazy():
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).parent.parent, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -129,3 +129,107 @@ async def test_get_subscription_response(session):
     assert response.trial_days_remaining is not None
     assert response.trial_days_remaining <= 7
     assert response.subscription_type == SubscriptionType.TRIAL
+
+
+@pytest.mark.asyncio
+async def test_expire_and_get_single_statement(session):
+    """A lapsed trial is expired and returned by one statement; a live one is returned untouched."""
+    from app.domains.subscriptions.service import entitlement_cache
+
+    user = await create_user(session, UserCreate(email="expiry-single@example.com", password="pw123456"))
+    service = SubscriptionService(session)
+
+    live = await service.expire_and_get(user.id)
+    assert live.subscription_type == SubscriptionType.TRIAL
+    assert live.status == SubscriptionStatus.ACTIVE
+
+    live.trial_end_date = datetime.utcnow() - timedelta(minutes=1)
+    await session.commit()
+    expired = await service.expire_and_get(user.id)
+    assert expired.status == SubscriptionStatus.EXPIRED
+    assert expired.subscription_type == SubscriptionType.FREE
+
+    # Committed, and a later read leaves the row alone
+    await session.rollback()
+    again = await service.get_user_subscription(user.id)
+    assert again.status == SubscriptionStatus.EXPIRED
+    entitlement_cache.pop(user.id)
+    assert await service.is_premium(user.id) is False
+
+
+@pytest.mark.asyncio
+async def test_has_premium_reads_without_expiring(session):
+    """The read-side premium check reports a lapsed trial as free but leaves the expiry write to the write path."""
+    from app.domains.subscriptions.deps import has_premium
+    from app.domains.subscriptions.service import invalidate_entitlement
+
+    user = await create_user(session, UserCreate(email="premium-read@example.com", password="pw123456"))
+    assert await has_premium(current_user=user, session=session) is True
+    assert await has_premium(current_user=None, session=session) is False
+
+    subscription = await SubscriptionService(session).get_user_subscription(user.id)
+    subscription.trial_end_date = datetime.utcnow() - timedelta(minutes=1)
+    await session.commit()
+    invalidate_entitlement(user.id)
+
+    assert await has_premium(current_user=user, session=session) is False
+    await session.refresh(subscription)
+    assert subscription.subscription_type == SubscriptionType.TRIAL  # Not expired by the read
+
+
+@pytest.mark.asyncio
+async def test_entitlement_cache_bounded_by_end_date(session):
+    """Entitlements are cached, but never past the moment the trial ends."""
+    from app.domains.subscriptions.service import entitlement_cache, invalidate_entitlement
+
+    user = await create_user(session, UserCreate(email="entitlement-cache@example.com", password="pw123456"))
+    service = SubscriptionService(session)
+
+    first = await service.get_subscription_response(user.id)
+    assert first.is_premium is True
+    assert await service.get_subscription_response(user.id) is first
+    assert await service.is_premium(user.id) is True
+
+    subscription = await service.get_user_subscription(user.id)
+    subscription.trial_end_date = datetime.utcnow() + timedelta(seconds=0.2)
+    await session.commit()
+    invalidate_entitlement(user.id)
+    assert (await service.get_subscription_response(user.id)).is_premium is True
+
+    import asyncio
+    await asyncio.sleep(0.3)
+    assert entitlement_cache.get(user.id) is None
+    assert await service.is_premium(user.id) is False
+
+
+@pytest.mark.asyncio
+async def test_expire_lapsed_sweeps_in_chunks(session):
+    """The sweeper expires every lapsed trial/premium across several chunks and leaves live ones alone."""
+    service = SubscriptionService(session)
+    past = datetime.utcnow() - timedelta(hours=1)
+    users = [
+        await create_user(session, UserCreate(email=f"sweep-{i}@example.com", password="pw123456"))
+        for i in range(6)
+    ]
+    for i, user in enumerate(users[:5]):
+        subscription = await service.get_user_subscription(user.id)
+        if i < 3:
+            subscription.trial_end_date = past
+        else:
+            subscription.subscription_type = SubscriptionType.PREMIUM
+            subscription.premium_end_date = past
+    await session.commit()
+
+    expired = await service.expire_lapsed(batch_size=2)
+    assert expired["trial"] >= 3
+    assert expired["premium"] >= 2
+
+    for user in users[:5]:
+        subscription = await service.get_user_subscription(user.id)
+        await session.refresh(subscription)
+        assert subscription.status == SubscriptionStatus.EXPIRED
+        assert subscription.subscription_type == SubscriptionType.FREE
+    live = await service.get_user_subscription(users[5].id)
+    assert live.subscription_type == SubscriptionType.TRIAL
+
+    assert await service.expire_lapsed(batch_size=2) == {"trial": 0, "premium": 0}
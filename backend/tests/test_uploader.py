@@ -0,0 +1,82 @@
+"""Tests for the batched question uploader used by the import scripts."""
+import json
+import pytest
+import httpx
+from fastapi import FastAPI, UploadFile, File
+from fastapi.responses import JSONResponse
+
+from scripts.uploader import find_all_json_files, upload_files
+
+
+def make_stub_api(fail_first: int = 0):
+    """Stand-in for the bulk import endpoint that records what it receives."""
+    app = FastAPI()
+    app.state.received = []
+    app.state.calls = 0
+
+    @app.post("/api/v1/questions/import/bulk")
+    async def bulk(file: UploadFile = File(...)):
+        app.state.calls += 1
+        if app.state.calls <= fail_first:
+            return JSONResponse(status_code=503, content={"detail": "warming up"})
+        questions = json.loads(await file.read())
+        if any(q.get("bad") for q in questions):
+            return JSONResponse(status_code=400, content={"detail": "invalid question"})
+        app.state.received.extend(q["question_id"] for q in questions)
+        return {"message": "Import complete", "imported": len(questions), "total_in_db": 0}
+
+    return app
+
+
+def write_questions(base_dir, count, bad=()):
+    """Lay files out like frontend/output: <year>/<question>/<question>.json."""
+    for i in range(count):
+        q_id = f"GATE_AE_2019_Q{i:02d}"
+        q_dir = base_dir / "2019" / q_id
+        q_dir.mkdir(parents=True)
+        payload = {"question_id": q_id}
+        if q_id in bad:
+            payload["bad"] = True
+        (q_dir / f"{q_id}.json").write_text(json.dumps(payload))
+
+
+@pytest.mark.asyncio
+async def test_upload_batches_and_resumes_from_manifest(tmp_path):
+    """Files are sent in batches, and a rerun skips everything already uploaded."""
+    write_questions(tmp_path, 10)
+    manifest = tmp_path / "manifest.json"
+    app = make_stub_api(fail_first=1)
+    files = find_all_json_files(tmp_path)
+
+    results = await upload_files(
+        "http://testserver/api/v1", files, batch_size=4, concurrency=2, backoff=0,
+        manifest_path=manifest, base_dir=tmp_path, transport=httpx.ASGITransport(app=app),
+    )
+
+    assert results["success"] == 10
+    assert results["error"] == 0
+    assert sorted(app.state.received) == sorted(f.stem for f in files)
+    # 3 batches plus one retried 503
+    assert app.state.calls == 4
+
+    rerun = await upload_files(
+        "http://testserver/api/v1", files, batch_size=4,
+        manifest_path=manifest, base_dir=tmp_path, transport=httpx.ASGITransport(app=app),
+    )
+    assert rerun["skipped"] == 10
+    assert app.state.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_is_bisected(tmp_path):
+    """A single bad question only fails itself, not the rest of its batch."""
+    write_questions(tmp_path, 8, bad={"GATE_AE_2019_Q05"})
+    app = make_stub_api()
+
+    results = await upload_files(
+        "http://testserver/api/v1", find_all_json_files(tmp_path), batch_size=8,
+        base_dir=tmp_path, transport=httpx.ASGITransport(app=app),
+    )
+
+    assert results["success"] == 7
+    assert [e["question_id"] for e in results["errors"]] == ["GATE_AE_2019_Q05"]
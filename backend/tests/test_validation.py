@@ -0,0 +1,162 @@
+"""Tests for cached and trusted question validators."""
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from app.domains.questions.schemas import QuestionResponse
+from app.domains.questions.validation import (
+    dump_questions_json,
+    question_response_from_row,
+    validate_question_create,
+    validate_questions_json,
+)
+
+
+def make_document(i: int) -> dict:
+    """A question shaped like the pipeline output, with every tier populated."""
+    return {
+        "question_id": f"GATE_AE_2019_Q{i:04d}", "exam_name": "GATE", "subject": "Aerospace Engineering",
+        "year": 2019, "question_number": i % 65 + 1, "question_text": f"Aircraft {i} in level flight: lift?",
+        "question_text_latex": r"L = \frac{1}{2}\rho V^2 S C_L", "question_type": "MCQ", "marks": 2.0,
+        "negative_marks": 0.66, "options": {"A": "10", "B": "20"}, "answer_key": "B",
+        "has_question_image": False, "image_metadata": None,
+        "tier_0_classification": {
+            "content_type": "numerical", "media_type": "text", "difficulty_score": 6.5,
+            "complexity_flags": {
+                "requires_derivation": True, "multi_concept_integration": False, "ambiguous_wording": False,
+                "image_interpretation_complex": False, "edge_case_scenario": False,
+                "multi_step_reasoning": True, "approximation_needed": False,
+            },
+            "use_gpt51": False, "classification_confidence": 0.92, "classification_reasoning": "Lift equation",
+            "combined_type": "numerical_text", "weight_strategy": "balanced", "classification_method": "llm",
+            "classifier_model": "classifier-v2",
+        },
+        "tier_1_core_research": {
+            "explanation": {"question_nature": "Numerical", "step_by_step": ["L = W", "Solve for V"]},
+            "hierarchical_tags": {"topic": {"name": "Lift and Drag"},
+                                  "concepts": [{"name": "Lift", "importance": "high"}]},
+        },
+        "tier_2_student_learning": {
+            "flashcards": [{"card_type": "concept", "front": "Lift equation", "back": "L = 0.5 rho V^2 S CL"}],
+            "exam_strategy": {"priority": "high", "triage_tip": "Do early"},
+        },
+        "tier_3_enhanced_learning": {"search_keywords": ["lift", "dynamic pressure"]},
+        "tier_4_metadata": {
+            "model_meta": {"models_used": ["m1", "m2"], "model_count": 2, "weight_strategy": "balanced",
+                           "weights_applied": {"m1": 0.5, "m2": 0.5}, "consensus_method": "vote",
+                           "debate_rounds": 1, "converged_fields_count": 40, "debated_fields_count": 2,
+                           "gpt51_added_in_debate": False, "timestamp": "2025-01-01T00:00:00",
+                           "pipeline_version": "3.1"},
+            "quality_score": {"overall": 0.9, "band": "A", "metrics": {"accuracy": 0.95}},
+            "cost_breakdown": {"total_cost": 0.12, "currency": "USD", "per_model": {"m1": 0.06},
+                               "classification_cost": 0.01, "image_consensus_cost": 0.0, "debate_cost": 0.02,
+                               "total_api_calls": 6},
+            "token_usage": {"total_input_tokens": 1200, "total_output_tokens": 400, "total_tokens": 1600,
+                            "per_model": {"m1": {"input": 600, "output": 200, "total": 800}}},
+            "processing_time": {"total_seconds": 42.0, "per_stage": {"generate": 30.0},
+                                "bottleneck_stage": "generate", "parallel_generation_time": 30.0,
+                                "debate_time": 12.0},
+        },
+    }
+
+
+def as_row(doc: dict) -> SimpleNamespace:
+    """Mimic a Question row: attribute access, JSON tiers as plain dicts."""
+    now = datetime.utcnow()
+    return SimpleNamespace(**doc, id=uuid.uuid4(), created_at=now, updated_at=now)
+
+
+def test_trusted_read_matches_validated_read():
+    """Rows stored from a validated import serialize identically with or without revalidation."""
+    stored = validate_question_create(make_document(1)).model_dump()
+    row = as_row(stored)
+
+    trusted = json.loads(dump_questions_json(question_response_from_row(row)))
+    validated = json.loads(QuestionResponse.model_validate(row).model_dump_json())
+
+    assert trusted == validated
+
+
+def test_trusted_read_drops_unknown_keys_and_fills_defaults():
+    """Stored tiers written outside the import path still come out in the response schema's shape."""
+    row = as_row(make_document(6))
+    row.tier_1_core_research = {
+        "explanation": {"question_nature": "Numerical", "internal_notes": "reviewer only"},
+        "hierarchical_tags": {"concepts": [{"name": "Lift", "source": "m2"}]},
+        "pipeline_debug": {"raw": "..."},
+    }
+
+    trusted = json.loads(dump_questions_json(question_response_from_row(row)))
+    validated = json.loads(QuestionResponse.model_validate(row).model_dump_json())
+
+    assert trusted == validated
+    assert "pipeline_debug" not in trusted["tier_1_core_research"]
+    assert trusted["tier_1_core_research"]["explanation"]["step_by_step"] == []
+
+
+def test_strict_mode_rejects_coercion():
+    """Strict mode is for external imports: string numbers are not coerced."""
+    doc = make_document(2)
+    doc["year"] = "2019"
+
+    assert validate_question_create(doc).year == 2019
+    with pytest.raises(ValidationError):
+        validate_question_create(doc, strict=True)
+
+
+def test_validate_questions_json_accepts_object_or_array():
+    """The bulk validator handles both upload shapes."""
+    doc = make_document(3)
+
+    assert len(validate_questions_json(json.dumps(doc))) == 1
+    assert len(validate_questions_json(json.dumps([doc, make_document(4)]))) == 2
+
+
+def test_spliced_fragments_match_full_response():
+    """Fragments spliced for a subscriber equal the full response; others get null premium tiers."""
+    from app.domains.questions.fragments import PREMIUM_TIERS, assemble, build_fragments
+
+    row = as_row(validate_question_create(make_document(5)).model_dump())
+    stats = {"attempts": 4, "correct": 3, "accuracy_percent": 75.0, "mean_seconds": 80.5,
+             "p50_seconds": 70, "p90_seconds": 120}
+    fragments = build_fragments(row)
+
+    full = json.loads(dump_questions_json(question_response_from_row(row)))
+    full["stats"] = stats
+    assert json.loads(assemble(fragments, True, stats)) == full
+
+    free = json.loads(assemble(fragments, False, None))
+    assert all(free[name] is None for name in PREMIUM_TIERS)
+    assert free["tier_1_core_research"] == full["tier_1_core_research"]
+    assert free["stats"] is None
+
+
+@pytest.mark.asyncio
+async def test_fragment_cache_follows_updated_at(session):
+    """A cached question is re-serialized once its row's updated_at moves."""
+    from datetime import datetime
+    from app.domains.questions.models import Question
+    from app.domains.questions.service import QuestionService
+
+    question = Question(
+        question_id="FRAG_Q01", subject="Aerospace Engineering", year=2022, question_number=1,
+        question_text="Thrust?", question_type="MCQ", answer_key="A",
+        tier_2_student_learning={"common_mistakes": ["first"]},
+    )
+    session.add(question)
+    await session.commit()
+    service = QuestionService(session)
+
+    first = json.loads(await service.get_question_json(string_id="FRAG_Q01", premium=True))
+    assert first["tier_2_student_learning"] == {"common_mistakes": ["first"]}
+    assert json.loads(await service.get_question_json(string_id="FRAG_Q01"))["tier_2_student_learning"] is None
+
+    question.tier_2_student_learning = {"common_mistakes": ["second"]}
+    question.updated_at = datetime.utcnow()
+    await session.commit()
+    again = json.loads(await service.get_question_json(question_id=question.id, premium=True))
+    assert again["tier_2_student_learning"] == {"common_mistakes": ["second"]}